@@ -0,0 +1,89 @@
+"""
+Measures the latency of aio.AsyncSolver under concurrent load.
+An in-process load generator runs several clients, each solving puzzles one after
+another, and records the latency of every request including the waiting for a worker.
+Meanwhile a ticker measures how long the event loop is blocked (loop lag).
+Solving by solver.solve directly in the event loop is measured as reference.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_aio [amount of requests]
+"""
+import asyncio
+import itertools
+import sys
+import time
+
+from sudokusolver import aio
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+
+CLIENTS = (1, 8, 32)
+TICK = 0.005
+
+
+def _percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+async def _tick(lags):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def _load(solve, puzzles, clients):
+    latencies = []
+    lags = [0.0]
+    requests = iter(puzzles)
+
+    async def client():
+        for puzzle in requests:
+            start = time.perf_counter()
+            await solve(puzzle)
+            latencies.append(time.perf_counter() - start)
+    ticker = asyncio.ensure_future(_tick(lags))
+    # the ticker is started and resumed once more afterwards to notice a blocked loop
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(2 * TICK)
+    ticker.cancel()
+    return latencies, elapsed, max(lags)
+
+
+async def _solve_blocking(puzzle):
+    return solver.solve(puzzle)
+
+
+async def _run(puzzles, clients, executor):
+    if executor is None:
+        return await _load(_solve_blocking, puzzles, clients)
+    async with aio.AsyncSolver(executor) as async_solver:
+        # the templates of the workers are built before
+        await async_solver.solve_many(puzzles[:async_solver.max_concurrency])
+        return await _load(async_solver.solve, puzzles, clients)
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 200
+    tiers = bench.TIERS['examples'] + bench.TIERS['seventeen']
+    puzzles = list(itertools.islice(itertools.cycle(importer.iter_puzzles(tiers)), amount))
+    solver.get_template()
+    print('{} requests'.format(amount))
+    print('{:<10} {:>8} {:>10} {:>10} {:>12} {:>12}'.format(
+        'executor', 'clients', 'p50 ms', 'p99 ms', 'requests/s', 'max lag ms'))
+    for executor in (None,) + aio.EXECUTORS:
+        for clients in CLIENTS:
+            latencies, elapsed, lag = asyncio.run(_run(puzzles, clients, executor))
+            print('{:<10} {:>8} {:>10.1f} {:>10.1f} {:>12.1f} {:>12.1f}'.format(
+                executor or 'blocking', clients, _percentile(latencies, 0.5) * 1000,
+                _percentile(latencies, 0.99) * 1000, amount / elapsed, lag * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
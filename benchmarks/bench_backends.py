@@ -0,0 +1,50 @@
+"""
+Compares the Algorithm-X (dlx) and the bitmask backend of the solver
+on the example puzzles and a set of hard puzzles.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_backends
+"""
+import glob
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+
+HARD_PUZZLES = 'benchmarks/resources/hard.txt'
+
+
+def read_puzzles(path):
+    """Reads puzzles written as one line of 81 characters (``.`` or ``0`` for empty cells)"""
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield '{}:{}'.format(path.split('/')[-1], number), tuple(
+                    'R{}C{}#{}'.format(cell // 9 + 1, cell % 9 + 1, value)
+                    for cell, value in enumerate(line) if value not in '.0')
+
+
+def main():
+    puzzles = [(path.split('/')[-1], importer.imp_candidates(path))
+               for path in sorted(glob.glob('tests/resources/example*.csv'))]
+    puzzles += list(read_puzzles(HARD_PUZZLES))
+    print('{:<22} {:>10} {:>12} {:>8}'.format('puzzle', 'dlx ms', 'bitmask ms', 'speedup'))
+    totals = dict.fromkeys(solver.BACKENDS, 0)
+    for name, fixed_candidates in puzzles:
+        times = {}
+        for backend in solver.BACKENDS:
+            times[backend] = bench.best_time(
+                lambda: solver.solve(fixed_candidates, backend=backend))
+            totals[backend] += times[backend]
+        print('{:<22} {:>10.2f} {:>12.2f} {:>7.1f}x'.format(
+            name, times['dlx'] * 1000, times['bitmask'] * 1000,
+            times['dlx'] / times['bitmask']))
+    print('{:<22} {:>10.2f} {:>12.2f} {:>7.1f}x'.format(
+        'total', totals['dlx'] * 1000, totals['bitmask'] * 1000,
+        totals['dlx'] / totals['bitmask']))
+
+
+if __name__ == '__main__':
+    main()
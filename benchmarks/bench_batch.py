@@ -0,0 +1,43 @@
+"""
+Compares solving a corpus of puzzles by solver.solve_batch against
+solving them one by one with solver.solve.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_batch [amount of puzzles]
+"""
+import glob
+import itertools
+import sys
+import time
+
+from sudokusolver import batch
+from sudokusolver import importer
+from sudokusolver import solver
+from benchmarks.bench_backends import HARD_PUZZLES, read_puzzles
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 2000
+    puzzles = [importer.imp_candidates(path)
+               for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+    puzzles += [candidates for _, candidates in read_puzzles(HARD_PUZZLES)]
+    corpus = list(itertools.islice(itertools.cycle(puzzles), amount))
+    grids = batch.from_candidates(corpus)
+
+    start = time.perf_counter()
+    solver.solve_batch(grids)
+    elapsed = time.perf_counter() - start
+    print('{:<24} {:>10.0f} puzzles/s'.format('solve_batch', amount / elapsed))
+
+    for backend in solver.BACKENDS:
+        start = time.perf_counter()
+        for candidates in corpus:
+            solver.solve(candidates, backend=backend)
+        elapsed = time.perf_counter() - start
+        print('{:<24} {:>10.0f} puzzles/s'.format('solve ({})'.format(backend),
+                                                   amount / elapsed))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
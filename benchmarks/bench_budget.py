@@ -0,0 +1,60 @@
+"""
+Measures the limits of solver.solve: the overhead of a timeout and a maximal amount
+of search nodes never reached, and how long the search overruns a short timeout
+on the slowest hard puzzle since the clock is read only every few nodes.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_budget
+"""
+import time
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+REPEAT = 3
+TIMEOUTS = (0.001, 0.01, 0.05)
+
+
+def _solve_all(puzzles, matrix_type, **limits):
+    return [solver.solve(puzzle, matrix_type=matrix_type, **limits) for puzzle in puzzles]
+
+
+def _stop(puzzle, matrix_type, timeout):
+    start = time.perf_counter()
+    try:
+        solver.solve(puzzle, matrix_type=matrix_type, timeout=timeout)
+    except solver.BudgetExceeded:
+        return time.perf_counter() - start
+    raise AssertionError('solved within the timeout')
+
+
+def main():
+    print('check interval: {} nodes'.format(solver.BUDGET_CHECK_INTERVAL))
+    print('{:<8} {:<22} {:>12} {:>12} {:>9}'.format(
+        'tier', 'matrix', 'no limit ms', 'limits ms', 'overhead'))
+    for tier in ('examples', 'hard'):
+        puzzles = list(importer.iter_puzzles(bench.TIERS[tier]))
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            solver.get_template(None, matrix_type)
+            unlimited = bench.best_time(lambda: _solve_all(puzzles, matrix_type), REPEAT)
+            limited = bench.best_time(lambda: _solve_all(
+                puzzles, matrix_type, timeout=3600, max_nodes=10 ** 9), REPEAT)
+            print('{:<8} {:<22} {:>12.1f} {:>12.1f} {:>8.0%}'.format(
+                tier, matrix_type.__name__, unlimited * 1000, limited * 1000,
+                limited / unlimited - 1))
+    print()
+    print('{:<22} {:>10} {:>12}'.format('matrix', 'timeout ms', 'stopped ms'))
+    slowest = list(importer.iter_puzzles(bench.TIERS['hard']))[-1]
+    for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+        for timeout in TIMEOUTS:
+            stopped = min(_stop(slowest, matrix_type, timeout) for _ in range(REPEAT))
+            print('{:<22} {:>10.1f} {:>12.1f}'.format(
+                matrix_type.__name__, timeout * 1000, stopped * 1000))
+
+
+if __name__ == '__main__':
+    main()
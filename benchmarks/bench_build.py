@@ -0,0 +1,59 @@
+"""
+Compares the time to build the sudoku matrix by appending
+each candidate with ConstraintMatrix.add against the linear
+ConstraintMatrix.from_incidence and against the matrix provided by the solver,
+which skips the fixed candidates and keeps the columns in the order of the template.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_build
+"""
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+PUZZLES = ('tests/resources/example-empty.csv',
+           'tests/resources/example-complete.csv',
+           'tests/resources/example1.csv')
+
+
+CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+
+def _build_by_add(fixed_candidates):
+    matrix = ConstraintMatrix()
+    fixed_candidates = [CODEC.encode(candidate) for candidate in fixed_candidates]
+    fixed_constraints = set(CODEC.ids.get_all_satisfied_constraints(*fixed_candidates))
+    for candidate, constraints in solver._get_incidence(fixed_candidates,
+                                                         fixed_constraints, CODEC.ids):
+        matrix.add(candidate, constraints)
+    return matrix
+
+
+def _build_from_incidence(fixed_candidates):
+    fixed_candidates = [CODEC.encode(candidate) for candidate in fixed_candidates]
+    return solver._create_matrix(fixed_candidates, CODEC.ids, ConstraintMatrix)
+
+
+def _cover_template(fixed_candidates):
+    with solver._use_puzzle(fixed_candidates, None, None):
+        pass
+
+
+def main():
+    print('{:<22} {:>10} {:>18} {:>8} {:>12}'.format(
+        'puzzle', 'add ms', 'from_incidence ms', 'speedup', 'template ms'))
+    for path in PUZZLES:
+        fixed_candidates = importer.imp_candidates(path)
+        by_add = bench.best_time(lambda: _build_by_add(fixed_candidates))
+        from_incidence = bench.best_time(lambda: _build_from_incidence(fixed_candidates))
+        template = bench.best_time(lambda: _cover_template(fixed_candidates))
+        print('{:<22} {:>10.2f} {:>18.2f} {:>7.1f}x {:>12.2f}'.format(
+            path.split('/')[-1], by_add * 1000, from_incidence * 1000,
+            by_add / from_incidence, template * 1000))
+
+
+if __name__ == '__main__':
+    main()
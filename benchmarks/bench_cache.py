@@ -0,0 +1,78 @@
+"""
+Measures the cost of the canonicalization per tier of puzzles and the
+cache.SolutionCache on a stream of puzzles generated from a few base puzzles by
+random symmetries, compared to solving each puzzle by solver.solve.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_cache [amount of requests]
+"""
+import random
+import sys
+import time
+
+from sudokusolver import bench
+from sudokusolver import canonical
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.cache import SolutionCache
+
+MAXSIZES = (4, 64)
+
+
+def _measure_canonicalize():
+    print('{:<10} {:>16} {:>12}'.format('tier', 'canonicalize ms', 'solve ms'))
+    for tier in bench.TIERS:
+        puzzles = list(importer.iter_puzzles(bench.TIERS[tier]))
+        start = time.perf_counter()
+        for puzzle in puzzles:
+            canonical.canonicalize(puzzle)
+        canonicalize_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for puzzle in puzzles:
+            solver.solve(puzzle)
+        solve_time = time.perf_counter() - start
+        print('{:<10} {:>16.1f} {:>12.1f}'.format(
+            tier, canonicalize_time / len(puzzles) * 1000, solve_time / len(puzzles) * 1000))
+
+
+def _measure_cache(name, bases, amount):
+    generator = random.Random(amount)
+    # half of the requests repeat an earlier request
+    requests = []
+    for _ in range(amount):
+        if requests and generator.random() < 0.5:
+            requests.append(generator.choice(requests))
+        else:
+            requests.append(canonical.random_transform(generator).apply(generator.choice(bases)))
+    start = time.perf_counter()
+    for puzzle in requests:
+        solver.solve(puzzle)
+    uncached = time.perf_counter() - start
+    for maxsize in MAXSIZES:
+        cache = SolutionCache(maxsize)
+        start = time.perf_counter()
+        for puzzle in requests:
+            cache.solve(puzzle)
+        cached = time.perf_counter() - start
+        print('{:<10} {:>8} {:>12.1f} {:>10.1f} {:>9.0%} {:>10} {:>16.1f}'.format(
+            name, maxsize, uncached * 1000, cached * 1000, cache.hit_rate, cache.evictions,
+            cache.canonicalize_time * 1000))
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 100
+    solver.get_template()
+    _measure_canonicalize()
+    print()
+    print('{} requests from the base puzzles by random symmetries, half repeated'.format(amount))
+    print('{:<10} {:>8} {:>12} {:>10} {:>9} {:>10} {:>16}'.format(
+        'bases', 'maxsize', 'uncached ms', 'cached ms', 'hit rate', 'evictions',
+        'canonicalize ms'))
+    _measure_cache('examples', list(importer.iter_puzzles(bench.TIERS['examples'])), amount)
+    _measure_cache('seventeen', list(importer.iter_puzzles(bench.TIERS['seventeen'])), amount)
+    _measure_cache('hard', list(importer.iter_puzzles(bench.TIERS['hard'][:3])), amount)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,61 @@
+"""
+Compares storing and reading a large set of puzzles as text lines of 81 characters
+with the binary corpus format (81 bytes per puzzle or 41 bytes if packed).
+The set consists of the hard puzzles repeated.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_corpus
+"""
+import os
+import random
+import tempfile
+
+from sudokusolver import bench
+from sudokusolver import corpus
+from sudokusolver import importer
+from benchmarks.bench_backends import HARD_PUZZLES
+
+PUZZLES = 100000
+
+
+def _read_lines(path):
+    with open(path) as f:
+        return sum(1 for _ in importer.imp_lines(f))
+
+
+def _read_corpus(path):
+    with importer.open_corpus(path) as puzzles:
+        return sum(1 for _ in puzzles)
+
+
+def _index_corpus(path, indices):
+    with importer.open_corpus(path) as puzzles:
+        return sum(puzzles[index][0] for index in indices)
+
+
+def main():
+    with open(HARD_PUZZLES) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    indices = random.Random(0).sample(range(PUZZLES), 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        text = os.path.join(directory, 'puzzles.txt')
+        with open(text, 'w') as f:
+            f.writelines(lines[number % len(lines)] + '\n' for number in range(PUZZLES))
+        print('{} puzzles'.format(PUZZLES))
+        print('{:<24} {:>10} {:>12} {:>14} {:>14}'.format(
+            'format', 'size KiB', 'convert ms', 'read all ms', '1000 random ms'))
+        print('{:<24} {:>10.0f} {:>12} {:>14.1f} {:>14}'.format(
+            'text lines (imp_lines)', os.path.getsize(text) / 1024, '-',
+            bench.best_time(lambda: _read_lines(text)) * 1000, '-'))
+        for packed in (False, True):
+            path = os.path.join(directory, 'puzzles.sdk')
+            convert = bench.best_time(lambda: corpus.convert_lines(text, path, packed))
+            print('{:<24} {:>10.0f} {:>12.1f} {:>14.1f} {:>14.2f}'.format(
+                'corpus packed' if packed else 'corpus', os.path.getsize(path) / 1024,
+                convert * 1000, bench.best_time(lambda: _read_corpus(path)) * 1000,
+                bench.best_time(lambda: _index_corpus(path, indices)) * 1000))
+
+
+if __name__ == '__main__':
+    main()
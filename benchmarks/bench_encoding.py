@@ -0,0 +1,55 @@
+"""
+Compares solving by string candidates and constraints with solving by
+their integer ids (rules.IntegerRules), passing the puzzles as strings,
+candidate ids or bytes.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_encoding
+"""
+import glob
+from types import SimpleNamespace
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+REPEAT = 5
+CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+# a rule description unknown to the solver is solved by its strings
+STRINGS = SimpleNamespace(get_all_candidates=rules.get_all_candidates,
+                          get_all_constraints=rules.get_all_constraints,
+                          get_all_satisfied_constraints=rules.get_all_satisfied_constraints)
+
+
+def main():
+    print('{:<22} {:>14} {:>14}'.format('template', 'strings ms', 'ids ms'))
+    for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+        print('{:<22} {:>14.1f} {:>14.1f}'.format(
+            matrix_type.__name__,
+            bench.best_time(lambda: solver._create_matrix((), STRINGS, matrix_type),
+                            REPEAT) * 1000,
+            bench.best_time(lambda: solver._create_matrix((), CODEC.ids, matrix_type),
+                            REPEAT) * 1000))
+    print()
+    puzzles = [importer.imp_candidates(path)
+               for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+    ids = [[CODEC.encode(candidate) for candidate in puzzle] for puzzle in puzzles]
+    grids = [CODEC.decode_grid(puzzle) for puzzle in ids]
+    print('{:<22} {:>14} {:>14} {:>14} {:>14}'.format(
+        'solve', 'strings ms', 'encoded ms', 'ids ms', 'bytes ms'))
+    for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+        times = [bench.best_time(lambda: [solver.solve(puzzle, description, matrix_type)
+                                          for puzzle in corpus], REPEAT, 3) / len(corpus)
+                 for description, corpus in ((STRINGS, puzzles), (None, puzzles),
+                                             (None, ids), (None, grids))]
+        print('{:<22} {:>14.2f} {:>14.2f} {:>14.2f} {:>14.2f}'.format(
+            matrix_type.__name__, *(time * 1000 for time in times)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the parsing rate of the importer: the candidate strings of imp_lines
+compared with the grids streamed by iter_puzzles from lines, compressed lines,
+CSV grids and grids of one row per line.
+The puzzles are the hard puzzles repeated.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_import
+"""
+import gzip
+import os
+import tempfile
+
+from sudokusolver import bench
+from sudokusolver import importer
+from benchmarks.bench_backends import HARD_PUZZLES
+
+PUZZLES = 50000
+
+
+def _count(puzzles):
+    return sum(1 for _ in puzzles)
+
+
+def _read_lines(path):
+    with open(path) as f:
+        return _count(importer.imp_lines(f))
+
+
+def _write_files(directory):
+    with open(HARD_PUZZLES) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    lines = [lines[number % len(lines)] for number in range(PUZZLES)]
+    rows = [[line[row * 9:row * 9 + 9] for row in range(9)] for line in lines]
+    contents = {
+        'lines': '\n'.join(lines),
+        'csv': '\n\n'.join('\n'.join(','.join(row.replace('.', '_')) for row in grid)
+                           for grid in rows),
+        'grid': '\n'.join('Grid {}\n{}'.format(number, '\n'.join(grid))
+                          for number, grid in enumerate(rows, start=1)),
+    }
+    paths = {}
+    for name, content in contents.items():
+        paths[name] = os.path.join(directory, name + '.txt')
+        with open(paths[name], 'w') as f:
+            f.write(content)
+    paths['lines.gz'] = os.path.join(directory, 'lines.gz')
+    with gzip.open(paths['lines.gz'], 'wt') as f:
+        f.write(contents['lines'])
+    return paths
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_files(directory)
+        measurements = [('imp_lines, strings', lambda: _read_lines(paths['lines']))]
+        measurements += [('iter_puzzles lines, {}'.format(form),
+                          lambda form=form: _count(importer.iter_puzzles(paths['lines'], form)))
+                         for form in importer.FORMS]
+        measurements += [('iter_puzzles {}, bytes'.format(name),
+                          lambda name=name: _count(importer.iter_puzzles(paths[name])))
+                         for name in ('lines.gz', 'csv', 'grid')]
+        print('{} puzzles'.format(PUZZLES))
+        print('{:<32} {:>10} {:>14}'.format('parser', 'time ms', 'puzzles/s'))
+        for name, function in measurements:
+            elapsed = bench.best_time(function)
+            print('{:<32} {:>10.1f} {:>14.0f}'.format(name, elapsed * 1000, PUZZLES / elapsed))
+
+
+if __name__ == '__main__':
+    main()
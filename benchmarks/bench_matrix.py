@@ -0,0 +1,57 @@
+"""
+Compares the Node based ConstraintMatrix with the ArrayConstraintMatrix
+on the example puzzles.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_matrix
+"""
+import glob
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+MATRIX_TYPES = (ConstraintMatrix, ArrayConstraintMatrix)
+CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+
+def _cover_uncover_time(matrix_type):
+    matrix = solver._create_matrix((), CODEC.ids, matrix_type)
+    candidates = matrix.get_next_constraints_candidates()
+
+    def cover_uncover():
+        for candidate in candidates:
+            matrix.cover(candidate)
+            matrix.uncover()
+    return bench.best_time(cover_uncover, number=20) / len(candidates)
+
+
+def main():
+    print('{:<22} {:<22} {:>10} {:>10} {:>12}'.format(
+        'puzzle', 'matrix', 'build ms', 'solve ms', 'memory KiB'))
+    for path in sorted(glob.glob('tests/resources/example*.csv')):
+        fixed_candidates = importer.imp_candidates(path)
+        for matrix_type in MATRIX_TYPES:
+            build = bench.best_time(lambda: solver._create_matrix(
+                [CODEC.encode(candidate) for candidate in fixed_candidates],
+                CODEC.ids, matrix_type))
+            solve = bench.best_time(lambda: solver.solve(
+                fixed_candidates, matrix_type=matrix_type))
+            memory = bench.peak_memory(lambda: solver._create_matrix(
+                [CODEC.encode(candidate) for candidate in fixed_candidates],
+                CODEC.ids, matrix_type))
+            print('{:<22} {:<22} {:>10.2f} {:>10.2f} {:>12.1f}'.format(
+                path.split('/')[-1], matrix_type.__name__,
+                build * 1000, solve * 1000, memory / 1024))
+    print()
+    for matrix_type in MATRIX_TYPES:
+        print('{:<22} cover+uncover: {:.1f} us'.format(
+            matrix_type.__name__, _cover_uncover_time(matrix_type) * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
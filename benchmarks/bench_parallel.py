@@ -0,0 +1,39 @@
+"""
+Measures how the throughput of solver.solve_many scales
+with the amount of worker processes.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_parallel [amount of puzzles]
+"""
+import glob
+import itertools
+import os
+import sys
+import time
+
+from sudokusolver import importer
+from sudokusolver import solver
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 400
+    puzzles = [importer.imp_candidates(path)
+               for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+    corpus = list(itertools.islice(itertools.cycle(puzzles), amount))
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, 32, cpus} - {w for w in (2, 4, 8, 16, 32) if w > cpus})
+    print('{} CPUs, {} puzzles'.format(cpus, amount))
+    print('{:>8} {:>14} {:>8}'.format('workers', 'puzzles/s', 'scaling'))
+    baseline = None
+    for count in workers:
+        start = time.perf_counter()
+        for _ in solver.solve_many(corpus, workers=count, chunksize=16):
+            pass
+        throughput = amount / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print('{:>8} {:>14.1f} {:>7.2f}x'.format(count, throughput, throughput / baseline))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
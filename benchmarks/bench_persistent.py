@@ -0,0 +1,75 @@
+"""
+Measures the cache.PersistentCache for repeated runs over the same puzzles,
+e.g. a nightly job: the first run solves and inserts all puzzles, the later runs
+look them up in batches. Solving by solver.solve_many without cache is the baseline.
+The puzzles are generated from the tiers by random symmetries, so that they are distinct.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_persistent [amount of puzzles] [workers]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sudokusolver import bench
+from sudokusolver import canonical
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.cache import PersistentCache
+
+TIERS = ('examples', 'seventeen')
+BACKENDS = ('dlx', 'bitmask')
+
+
+def _measure(puzzles, workers, backend, cache=None):
+    start = time.perf_counter()
+    for _ in solver.solve_many(puzzles, workers, backend=backend, cache=cache):
+        pass
+    return time.perf_counter() - start
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 500
+    workers = int(argv[2]) if len(argv) > 2 else 1
+    solver.get_template()
+    generator = random.Random(amount)
+    print('{} distinct puzzles per tier, {} workers'.format(amount, workers))
+    print('{:<10} {:>8} {:>12} {:>9} {:>9} {:>14} {:>9}'.format(
+        'tier', 'backend', 'uncached s', 'cold s', 'warm s', 'warm puzzles/s', 'file KiB'))
+    for tier in TIERS:
+        bases = list(importer.iter_puzzles(bench.TIERS[tier]))
+        puzzles = [canonical.random_transform(generator).apply(generator.choice(bases))
+                   for _ in range(amount)]
+        for backend in BACKENDS:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'solutions.sqlite')
+                uncached = _measure(puzzles, workers, backend)
+                with PersistentCache(path) as cache:
+                    cold = _measure(puzzles, workers, backend, cache)
+                    warm = _measure(puzzles, workers, backend, cache)
+                size = sum(os.path.getsize(os.path.join(directory, name))
+                           for name in os.listdir(directory))
+            print('{:<10} {:>8} {:>12.2f} {:>9.2f} {:>9.3f} {:>14.0f} {:>9.0f}'.format(
+                tier, backend, uncached, cold, warm, amount / warm, size / 1024))
+    # uniqueness answered by the stored counts
+    with tempfile.TemporaryDirectory() as directory:
+        with PersistentCache(os.path.join(directory, 'solutions.sqlite')) as cache:
+            cache.solve_many(puzzles)
+            start = time.perf_counter()
+            for puzzle in puzzles:
+                solver.is_unique(puzzle)
+            searched = time.perf_counter() - start
+            start = time.perf_counter()
+            for puzzle in puzzles:
+                cache.is_unique(puzzle)
+            cached = time.perf_counter() - start
+    print()
+    print('is_unique of {} puzzles: searched {:.2f} s, cached {:.2f} s'.format(
+        amount, searched, cached))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,72 @@
+"""
+Measures the search nodes and the wall time saved by the constraint propagation
+of solver.solve on the bundled examples and on the hard puzzles.
+The search nodes are the candidates covered by the search itself,
+the candidates forced by the propagation are not counted.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_propagation
+"""
+import glob
+import time
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.propagation import TECHNIQUES, Propagator
+from benchmarks.bench_backends import HARD_PUZZLES, read_puzzles
+from benchmarks.bench_search import count_nodes
+
+CONFIGURATIONS = (
+    ('none', None),
+    ('singles, root only', dict(techniques=('singles', ), at_each_node=False)),
+    ('all, root only', dict(techniques=TECHNIQUES, at_each_node=False)),
+    ('singles', dict(techniques=('singles', ))),
+    ('singles, locked', dict(techniques=('singles', 'locked'))),
+    ('singles, locked, pairs', dict(techniques=TECHNIQUES)),
+)
+
+
+def run(fixed_candidates, options):
+    """Returns the solution, the search nodes and the elapsed time of solving the puzzle"""
+    search = solver._get_search(Propagator(**options) if options is not None else None)
+    with solver._use_puzzle(fixed_candidates, None, None) as (matrix, decode):
+        start = time.perf_counter()
+        solution = decode(solver._solve(matrix, search))
+        elapsed = time.perf_counter() - start
+    propagator = Propagator(**options) if options is not None else None
+    with solver._use_puzzle(fixed_candidates, None, None) as (matrix, _):
+        search = solver._get_search(propagator)
+        nodes = count_nodes(lambda matrix: solver._solve(matrix, search), matrix)[1]
+    if propagator:
+        nodes -= propagator.hits['singles']
+    return solution, nodes, elapsed
+
+
+def main():
+    corpora = (
+        ('examples', [importer.imp_candidates(path)
+                      for path in sorted(glob.glob('tests/resources/example*.csv'))]),
+        ('hard', [candidates for _, candidates in read_puzzles(HARD_PUZZLES)]),
+    )
+    print('{:<10} {:<24} {:>10} {:>10} {:>9}'.format(
+        'corpus', 'propagation', 'nodes', 'time ms', 'speedup'))
+    for corpus, puzzles in corpora:
+        baseline = None
+        for name, options in CONFIGURATIONS:
+            total_nodes = total_time = 0
+            for fixed_candidates in puzzles:
+                solution, nodes, elapsed = run(fixed_candidates, options)
+                constraints = set(rules.get_all_satisfied_constraints(
+                    *(tuple(fixed_candidates) + solution)))
+                assert len(constraints) == 324, 'invalid solution'
+                total_nodes += nodes
+                total_time += elapsed
+            baseline = baseline or total_time
+            print('{:<10} {:<24} {:>10} {:>10.1f} {:>8.2f}x'.format(
+                corpus, name, total_nodes, total_time * 1000, baseline / total_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures the lookups of the rules module: the import time,
+the first call building the lookup tables and the calls afterwards.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_rules
+"""
+import subprocess
+import sys
+
+from sudokusolver import bench
+from sudokusolver import rules
+
+REPEAT = 5
+NUMBER = 200
+
+
+def _import_time():
+    # measured in a fresh interpreter since the module is imported already
+    code = ('import time; start = time.perf_counter(); import sudokusolver.rules; '
+            'print(time.perf_counter() - start)')
+    return min(float(subprocess.check_output([sys.executable, '-c', code]))
+               for _ in range(REPEAT))
+
+
+def main():
+    print('{:<48} {:>12}'.format('lookup', 'time us'))
+    print('{:<48} {:>12.1f}'.format('import', _import_time() * 10 ** 6))
+    for box_size in (3, 4, 5):
+        rule_description = rules.Rules(box_size)
+        ids = rule_description.ids
+        candidates = rule_description.get_all_candidates()
+        candidate_ids = list(ids.get_all_candidates())
+        size = '{0}x{0}'.format(box_size ** 2)
+        first = bench.best_time(
+            lambda: rules.Rules(box_size).ids.get_all_satisfied_constraints(0), REPEAT)
+        lookups = (
+            ('first call', first),
+            ('all satisfied constraints, ids',
+             bench.best_time(lambda: ids.get_all_satisfied_constraints(*candidate_ids),
+                             REPEAT, 3)),
+            ('all satisfied constraints, strings',
+             bench.best_time(lambda: rule_description.get_all_satisfied_constraints(*candidates),
+                             REPEAT, 3)),
+            ('satisfied constraints of one id',
+             bench.best_time(lambda: ids.get_all_satisfied_constraints(candidate_ids[-1]),
+                             REPEAT, NUMBER)),
+        )
+        if hasattr(ids, 'get_satisfying_candidates'):
+            lookups += (('satisfying candidates of one constraint id',
+                         bench.best_time(lambda: ids.get_satisfying_candidates(0),
+                                         REPEAT, NUMBER)), )
+        for name, elapsed in lookups:
+            print('{:<48} {:>12.1f}'.format('{} {}'.format(size, name), elapsed * 10 ** 6))
+
+
+if __name__ == '__main__':
+    main()
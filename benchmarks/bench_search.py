@@ -0,0 +1,77 @@
+"""
+Compares the search nodes per second of the iterative solver._solve
+against the former recursive implementation.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_search
+"""
+import glob
+import time
+
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+from benchmarks.bench_backends import HARD_PUZZLES, read_puzzles
+
+
+def solve_recursive(matrix, result_set=()):
+    """The former recursive implementation of solver._solve"""
+    if matrix.candidates_exist():
+        for candidate in matrix.get_next_constraints_candidates():
+            matrix.cover(candidate)
+            solution = solve_recursive(matrix, result_set + (candidate.candidate, ))
+            if matrix.has_satisfied_all_constraints():
+                return solution
+            matrix.uncover()
+    return result_set
+
+
+def count_nodes(search, matrix):
+    """Returns the amount of covered candidates (search nodes) of the search"""
+    nodes = 0
+    cover = matrix.cover
+
+    def counting_cover(candidate):
+        nonlocal nodes
+        nodes += 1
+        cover(candidate)
+    matrix.cover = counting_cover
+    try:
+        return search(matrix), nodes
+    finally:
+        del matrix.cover
+
+
+def run(search, matrix_type, puzzles):
+    total_nodes = total_time = 0
+    solutions = []
+    for fixed_candidates in puzzles:
+        with solver._use_puzzle(fixed_candidates, None, matrix_type) as (matrix, _):
+            start = time.perf_counter()
+            solutions.append(search(matrix))
+            total_time += time.perf_counter() - start
+        with solver._use_puzzle(fixed_candidates, None, matrix_type) as (matrix, _):
+            total_nodes += count_nodes(search, matrix)[1]
+    return solutions, total_nodes, total_time
+
+
+def main():
+    puzzles = [importer.imp_candidates(path)
+               for path in sorted(glob.glob('tests/resources/example*.csv'))]
+    puzzles += [candidates for _, candidates in read_puzzles(HARD_PUZZLES)]
+    print('{:<22} {:<10} {:>10} {:>10} {:>12}'.format(
+        'matrix', 'search', 'nodes', 'time s', 'nodes/s'))
+    for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+        results = []
+        for name, search in (('recursive', solve_recursive), ('iterative', solver._solve)):
+            solutions, nodes, elapsed = run(search, matrix_type, puzzles)
+            results.append(solutions)
+            print('{:<22} {:<10} {:>10} {:>10.2f} {:>12.0f}'.format(
+                matrix_type.__name__, name, nodes, elapsed, nodes / elapsed))
+        assert results[0] == results[1], 'iterative search found other solutions'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures the cost per search node of choosing the column with the fewest candidates.
+At every node of the search the chosen column is additionally chosen repeatedly by
+the matrix (choose_constraint) and by a linear scan over all columns left,
+the former selection of the ConstraintMatrix, so that both are timed on the same states.
+The time solving the puzzles by the untouched search is shown alongside.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_selection [repeat]
+"""
+import sys
+import time
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+TIERS = ('examples', 'seventeen', 'hard')
+
+
+def _scan(matrix):
+    return min(matrix.iter_constraints(), key=matrix.size_of)
+
+
+def _measure_selection(matrix, repeat):
+    # returns the amount of choices and the seconds of the repeated choices and scans
+    choose_constraint = matrix.choose_constraint
+    choices = 0
+    choose_time = scan_time = 0.0
+
+    def timing_choose_constraint():
+        nonlocal choices, choose_time, scan_time
+        start = time.perf_counter()
+        for _ in range(repeat):
+            choose_constraint()
+        choose_time += time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _scan(matrix)
+        scan_time += time.perf_counter() - start
+        choices += 1
+        return choose_constraint()
+    matrix.choose_constraint = timing_choose_constraint
+    try:
+        solver._solve(matrix)
+    finally:
+        del matrix.choose_constraint
+    return choices, choose_time, scan_time
+
+
+def main(argv=sys.argv):
+    repeat = int(argv[1]) if len(argv) > 1 else 20
+    print('{:<10} {:<22} {:>8} {:>10} {:>9} {:>10}'.format(
+        'tier', 'matrix', 'nodes', 'choose us', 'scan us', 'solve ms'))
+    for tier in TIERS:
+        puzzles = list(importer.iter_puzzles(bench.TIERS[tier]))
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            solver.get_template(None, matrix_type)
+            choices = 0
+            choose_time = scan_time = solve_time = 0.0
+            for puzzle in puzzles:
+                with solver._use_puzzle(puzzle, None, matrix_type) as (matrix, _):
+                    start = time.perf_counter()
+                    solver._solve(matrix)
+                    solve_time += time.perf_counter() - start
+                with solver._use_puzzle(puzzle, None, matrix_type) as (matrix, _):
+                    measured = _measure_selection(matrix, repeat)
+                choices += measured[0]
+                choose_time += measured[1]
+                scan_time += measured[2]
+            print('{:<10} {:<22} {:>8} {:>10.2f} {:>9.2f} {:>10.1f}'.format(
+                tier, matrix_type.__name__, choices, choose_time / choices / repeat * 1e6,
+                scan_time / choices / repeat * 1e6, solve_time / len(puzzles) * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
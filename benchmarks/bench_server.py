@@ -0,0 +1,81 @@
+"""
+Measures the throughput and latency of the HTTP server for several batch windows.
+Clients post one puzzle per request over kept-alive connections on localhost,
+so that the puzzles of concurrent requests are batched only by the server.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_server [amount of requests] [workers]
+"""
+import http.client
+import itertools
+import json
+import sys
+import threading
+import time
+
+from sudokusolver import bench
+from sudokusolver.server import SolverServer
+
+CLIENTS = 16
+WINDOWS = (0.0, 0.002, 0.01)
+
+
+def _percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+def _load(address, bodies):
+    latencies = []
+    rejected = 0
+    requests = iter(bodies)
+    lock = threading.Lock()
+
+    def client():
+        nonlocal rejected
+        connection = http.client.HTTPConnection(*address)
+        while True:
+            with lock:
+                body = next(requests, None)
+            if body is None:
+                break
+            start = time.perf_counter()
+            connection.request('POST', '/solve', body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                rejected += response.status == 429
+        connection.close()
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start, rejected
+
+
+def main(argv=sys.argv):
+    amount = int(argv[1]) if len(argv) > 1 else 2000
+    workers = int(argv[2]) if len(argv) > 2 else 1
+    puzzles = bench.TIERS['examples']
+    bodies = [json.dumps({'puzzle': puzzle}).encode()
+              for puzzle in itertools.islice(itertools.cycle(puzzles), amount)]
+    print('{} requests of one puzzle, {} clients, {} workers'.format(amount, CLIENTS, workers))
+    print('{:>10} {:>10} {:>10} {:>12} {:>11} {:>9}'.format(
+        'window ms', 'p50 ms', 'p99 ms', 'requests/s', 'mean batch', 'rejected'))
+    for window in WINDOWS:
+        with SolverServer(('127.0.0.1', 0), workers, batch_window=window) as server:
+            server.start()
+            latencies, elapsed, rejected = _load(server.server_address[:2], bodies)
+            batches = server.metrics.batches
+            print('{:>10.1f} {:>10.2f} {:>10.2f} {:>12.1f} {:>11.1f} {:>9}'.format(
+                window * 1000, _percentile(latencies, 0.5) * 1000,
+                _percentile(latencies, 0.99) * 1000, amount / elapsed,
+                server.metrics.puzzles / batches, rejected))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
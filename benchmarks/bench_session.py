@@ -0,0 +1,56 @@
+"""
+Compares the latency of editing one cell of a puzzle and solving it again
+by a SolverSession with solving the edited puzzle by solver.solve
+(covering the template) and by building a new matrix as formerly.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_session
+"""
+import glob
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+from sudokusolver.session import SolverSession
+from benchmarks.bench_backends import HARD_PUZZLES, read_puzzles
+
+REPEAT = 5
+
+
+def _solve_rebuilt(fixed_candidates, matrix_type):
+    matrix = solver._create_matrix(fixed_candidates, solver.rules, matrix_type)
+    return solver._solve(matrix)
+
+
+def main():
+    puzzles = [(path.split('/')[-1], importer.imp_candidates(path))
+               for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+    puzzles += list(read_puzzles(HARD_PUZZLES))
+    print('{:<22} {:<22} {:>11} {:>11} {:>11} {:>11} {:>9}'.format(
+        'puzzle', 'matrix', 'rebuild ms', 'solve ms', 'last ms', 'first ms', 'speedup'))
+    for name, fixed_candidates in puzzles:
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            session = SolverSession(fixed_candidates, matrix_type=matrix_type)
+            last, first = fixed_candidates[-1], fixed_candidates[0]
+
+            def edit(candidate):
+                # the user clears a cell and fills it in again
+                session.remove(candidate)
+                session.place(candidate)
+                return session.solve()
+            rebuilt = bench.best_time(lambda: _solve_rebuilt(fixed_candidates, matrix_type),
+                                      REPEAT)
+            cold = bench.best_time(
+                lambda: solver.solve(fixed_candidates, matrix_type=matrix_type), REPEAT)
+            edit_last = bench.best_time(lambda: edit(last), REPEAT)
+            edit_first = bench.best_time(lambda: edit(first), REPEAT)
+            print('{:<22} {:<22} {:>11.2f} {:>11.2f} {:>11.2f} {:>11.2f} {:>8.1f}x'.format(
+                name, matrix_type.__name__, rebuilt * 1000, cold * 1000,
+                edit_last * 1000, edit_first * 1000, cold / edit_last))
+
+
+if __name__ == '__main__':
+    main()
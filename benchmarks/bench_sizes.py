@@ -0,0 +1,62 @@
+"""
+Measures generating the rules, building the matrix template and solving
+puzzles of the sizes 9x9, 16x16 and 25x25 described by rules.for_size.
+The puzzles are derived from a valid grid by emptying a share of its cells at random.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_sizes
+"""
+import random
+import time
+
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+BOX_SIZES = (3, 4, 5)
+EMPTY_SHARES = (0.4, 0.5)
+PUZZLES = 3
+
+
+def create_puzzle(box_size, empty_share, seed):
+    """Returns the fixed candidates of a puzzle with the given share of empty cells"""
+    size = box_size * box_size
+    cells = [(row, column) for row in range(size) for column in range(size)]
+    random.Random(seed).shuffle(cells)
+    return tuple('R{}C{}#{}'.format(row + 1, column + 1,
+                                    (box_size * (row % box_size) + row // box_size + column)
+                                    % size + 1)
+                 for row, column in sorted(cells[int(empty_share * len(cells)):]))
+
+
+def main():
+    print('{:>5} {:<22} {:>10} {:>10} {:>10} {:>12}'.format(
+        'size', 'matrix', 'rules ms', 'build ms', 'empty', 'solve ms'))
+    for box_size in BOX_SIZES:
+        rule_description = rules.Rules(box_size)
+        start = time.perf_counter()
+        candidates = rule_description.get_all_candidates()
+        rule_description.get_all_constraints()
+        rule_description.get_all_satisfied_constraints(*candidates)
+        generation = time.perf_counter() - start
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            start = time.perf_counter()
+            solver.get_template(rule_description, matrix_type)
+            build = time.perf_counter() - start
+            for empty_share in EMPTY_SHARES:
+                elapsed = 0
+                for seed in range(PUZZLES):
+                    fixed_candidates = create_puzzle(box_size, empty_share, seed)
+                    start = time.perf_counter()
+                    solution = solver.solve(fixed_candidates, rule_description, matrix_type)
+                    elapsed += time.perf_counter() - start
+                    assert len(fixed_candidates) + len(solution) == box_size ** 4
+                print('{:>5} {:<22} {:>10.1f} {:>10.1f} {:>9.0%} {:>12.1f}'.format(
+                    '{0}x{0}'.format(box_size ** 2), matrix_type.__name__, generation * 1000,
+                    build * 1000, empty_share, elapsed / PUZZLES * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures the overhead of tracing the search: solving without hooks compared with
+solving with a hook overriding all events, with the SolveStats and with the
+FlameGraphHook. Optionally writes the collapsed stacks of the hard puzzles.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_tracing [folded_stacks_directory]
+"""
+import os
+import sys
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+from sudokusolver.stats import SolveStats
+from sudokusolver.tracing import EVENTS, FlameGraphHook, SearchHook
+
+CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+
+class NoOpHook(SearchHook):
+    pass
+
+
+# overrides all events by doing nothing
+for _event in EVENTS:
+    setattr(NoOpHook, _event, lambda self, *args: None)
+
+CONFIGURATIONS = (
+    ('no hooks', lambda: {}),
+    ('all events, no-op', lambda: {'hooks': [NoOpHook()]}),
+    ('SolveStats', lambda: {'stats': SolveStats()}),
+    ('FlameGraphHook', lambda: {'hooks': [FlameGraphHook(label=CODEC.decode)]}),
+)
+
+
+def _solve_all(puzzles, matrix_type, options):
+    return [solver.solve(puzzle, matrix_type=matrix_type, **options()) for puzzle in puzzles]
+
+
+def write_stacks(directory, puzzles):
+    """Writes the collapsed stacks of the search of each puzzle"""
+    for number, puzzle in enumerate(puzzles, start=1):
+        hook = FlameGraphHook(label=CODEC.decode)
+        solver.solve(puzzle, hooks=[hook])
+        with open(os.path.join(directory, 'hard{}.folded'.format(number)), 'w') as f:
+            hook.write(f)
+
+
+def main(argv=sys.argv):
+    tiers = [(tier, list(importer.iter_puzzles(bench.TIERS[tier])))
+             for tier in ('examples', 'hard')]
+    print('{:<8} {:<22} {:<20} {:>10} {:>9}'.format(
+        'tier', 'matrix', 'tracing', 'time ms', 'overhead'))
+    for tier, puzzles in tiers:
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            solver.get_template(None, matrix_type)
+            baseline = None
+            for name, options in CONFIGURATIONS:
+                elapsed = bench.best_time(lambda: _solve_all(puzzles, matrix_type, options))
+                baseline = baseline or elapsed
+                print('{:<8} {:<22} {:<20} {:>10.1f} {:>8.0%}'.format(
+                    tier, matrix_type.__name__, name, elapsed * 1000, elapsed / baseline - 1))
+    if len(argv) > 1:
+        write_stacks(argv[1], dict(tiers)['hard'])
+
+
+if __name__ == '__main__':
+    main()
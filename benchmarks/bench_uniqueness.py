@@ -0,0 +1,32 @@
+"""
+Compares the cost of checking the uniqueness of a puzzle by solver.is_unique
+with solving it once by solver.solve.
+
+Run from the project root::
+
+    python3 -m benchmarks.bench_uniqueness
+"""
+import glob
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+from benchmarks.bench_backends import HARD_PUZZLES, read_puzzles
+
+
+def main():
+    puzzles = [(path.split('/')[-1], importer.imp_candidates(path))
+               for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+    puzzles += list(read_puzzles(HARD_PUZZLES))
+    print('{:<22} {:>10} {:>14} {:>7} {:>7}'.format(
+        'puzzle', 'solve ms', 'is_unique ms', 'ratio', 'unique'))
+    for name, fixed_candidates in puzzles:
+        solve = bench.best_time(lambda: solver.solve(fixed_candidates))
+        unique = bench.best_time(lambda: solver.is_unique(fixed_candidates))
+        print('{:<22} {:>10.2f} {:>14.2f} {:>6.1f}x {:>7}'.format(
+            name, solve * 1000, unique * 1000, unique / solve,
+            str(solver.is_unique(fixed_candidates))))
+
+
+if __name__ == '__main__':
+    main()
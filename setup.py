@@ -16,7 +16,10 @@ config = {
     },
     'test_suite': 'tests',
     # 'install_requires': ['nose'],
-    'packages': ['sudokusolver'],
+    'extras_require': {
+        'numpy': ['numpy']
+    },
+    'packages': ['sudokusolver', 'sudokusolver.model'],
     'scripts': [],
     'name': 'sudokusolver'
 }
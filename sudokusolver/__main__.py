@@ -1,25 +1,207 @@
 #!/usr/bin/env python3
 # encoding: utf-8
+"""
+Command line interface of the sudokusolver::
+
+    python3 -m sudokusolver sudoku_puzzle.csv [--stats]
+    python3 -m sudokusolver batch [puzzles.txt] [-o solutions.txt]
+    python3 -m sudokusolver serve [--port 8080]
+
+The batch mode reads puzzles written one per line (81 characters, ``.`` or ``0``
+for empty cells) from a file or the standard input and writes
+the solution of each puzzle in the same format line by line.
+With ``--stats`` the statistics of solving the puzzle are printed (see stats.SolveStats).
+The puzzles of a binary corpus file (see the corpus module) are solved
+into a corpus file of the solutions.
+With ``--cache solutions.sqlite`` the solutions are kept in a database shared
+by the workers and later runs (see cache.PersistentCache).
+The serve mode answers puzzles sent by HTTP (see the server module).
+"""
+import argparse
+import itertools
 import os
 import sys
+import time
+
+from sudokusolver import solver, importer, visualizer, rules, corpus
+from sudokusolver.stats import SolveStats
 
-from sudokusolver import solver, importer, visualizer
+UNSOLVABLE_MARKER = 'x' * 81
+BUFFER_SIZE = 1 << 16
 
 
 def main(argv=sys.argv):
-    if len(argv) is not 2:
+    if len(argv) > 1 and argv[1] == 'batch':
+        return batch(argv[2:])
+    if len(argv) > 1 and argv[1] == 'serve':
+        return serve(argv[2:])
+    arguments = [argument for argument in argv[1:] if argument != '--stats']
+    stats = SolveStats() if len(arguments) < len(argv) - 1 else None
+    if len(arguments) != 1:
         exit('Aborted. Wrong amount of arguments.')
-    file_path = argv[1]
+    file_path = arguments[0]
     if not os.path.exists(file_path):
         exit('File does not exists')
 
     fixed_candidates = importer.imp_candidates(file_path)
-    solution = solver.solve(fixed_candidates)
+    solution = solver.solve(fixed_candidates, stats=stats)
     if solution:
         visualizer.visualize(fixed_candidates + solution)
-    else:
+    if stats:
+        _print_stats(stats)
+    if not solution:
         exit('There is no solution')
 
 
+def _print_stats(stats):
+    for name, value in stats.as_dict().items():
+        if name.endswith('_time'):
+            value = '{:.2f} ms'.format(value * 1000)
+        elif name == 'column_sizes':
+            # the mean amount of alternatives per depth
+            value = ' '.join('{:.1f}'.format(sum(sizes) / len(sizes)) for sizes in value)
+        print('{:<14} {}'.format(name, value), file=sys.stderr)
+
+
+def batch(argv):
+    """Solves the puzzles of a file (or the standard input) line by line.
+    See ``python3 -m sudokusolver batch --help``."""
+    parser = argparse.ArgumentParser(
+        prog='sudokusolver batch',
+        description='Solves sudoku puzzles written one per line as 81 characters '
+                    '("." or "0" for empty cells).')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='file containing the puzzles, standard input if omitted or -')
+    parser.add_argument('-o', '--output', default='-',
+                        help='file to write the solutions to, standard output if omitted or -')
+    parser.add_argument('--backend', choices=solver.BACKENDS, default='bitmask',
+                        help='solver backend (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='amount of worker processes, 0 for one per CPU (default: %(default)s)')
+    parser.add_argument('--marker', default=UNSOLVABLE_MARKER,
+                        help='line written for puzzles without solution '
+                             '(default: %(default)s)')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='sqlite database caching the solutions across runs '
+                             '(see cache.PersistentCache)')
+    args = parser.parse_args(argv)
+    solution_cache = None
+    if args.cache:
+        # imported here since only the cache needs sqlite
+        from sudokusolver import cache
+        solution_cache = cache.PersistentCache(args.cache)
+
+    try:
+        in_corpus = args.input != '-' and corpus.is_corpus(args.input)
+    except OSError as e:
+        parser.error("can't open '{}': {}".format(args.input, e.strerror))
+    if in_corpus:
+        if args.output == '-':
+            parser.error('the solutions of a corpus file require an output file')
+        start = time.perf_counter()
+        with importer.open_corpus(args.input) as puzzles:
+            solved, unsolved = corpus.solve_corpus(puzzles, args.output, args.jobs, args.backend,
+                                                   cache=solution_cache)
+        _print_summary(solved, unsolved, time.perf_counter() - start)
+        return
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    try:
+        target = sys.stdout if args.output == '-' \
+            else open(args.output, 'w', buffering=BUFFER_SIZE)
+    except OSError as e:
+        source.close()
+        parser.error("can't open '{}': {}".format(args.output, e.strerror))
+    start = time.perf_counter()
+    try:
+        solved, unsolved = _solve_lines(source, target, args.backend, args.marker, args.jobs,
+                                        solution_cache)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+    _print_summary(solved, unsolved, time.perf_counter() - start)
+
+
+def serve(argv):
+    """Serves puzzles sent by HTTP until interrupted.
+    See ``python3 -m sudokusolver serve --help``."""
+    # imported here since only the server needs the HTTP modules
+    from sudokusolver import server
+    parser = argparse.ArgumentParser(
+        prog='sudokusolver serve',
+        description='Solves sudoku puzzles posted as JSON or lines of 81 characters '
+                    'to /solve and reports metrics at /metrics.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=server.DEFAULT_PORT,
+                        help='port to listen on, 0 for any free port (default: %(default)s)')
+    parser.add_argument('--backend', choices=solver.BACKENDS, default='bitmask',
+                        help='solver backend (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='amount of worker processes, 0 for one per CPU (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=server.DEFAULT_BATCH_SIZE,
+                        help='maximal amount of puzzles solved by a worker at once '
+                             '(default: %(default)s)')
+    parser.add_argument('--batch-window', type=float, default=server.DEFAULT_BATCH_WINDOW * 1000,
+                        help='milliseconds a puzzle waits for further puzzles to be batched with '
+                             '(default: %(default)s)')
+    parser.add_argument('--max-queue', type=int, default=server.DEFAULT_MAX_QUEUE,
+                        help='maximal amount of queued puzzles before requests are rejected '
+                             'by 429 (default: %(default)s)')
+    args = parser.parse_args(argv)
+    server.serve(args.host, args.port, workers=args.jobs, backend=args.backend,
+                 batch_size=args.batch_size, batch_window=args.batch_window / 1000,
+                 max_queue=args.max_queue)
+
+
+def _print_summary(solved, unsolved, elapsed):
+    total = solved + unsolved
+    print('Solved {} of {} puzzles in {:.2f}s ({:.1f} puzzles/s)'.format(
+        solved, total, elapsed, total / elapsed if elapsed else 0.0), file=sys.stderr)
+
+
+def _solve_lines(lines, target, backend, marker, jobs=1, cache=None):
+    solved = unsolved = 0
+    # the parsed puzzles are needed again to write the solutions,
+    # tee buffers only those dispatched but not yet solved
+    puzzles, fixed = itertools.tee(_parse_lines(lines))
+    solutions = solver.solve_many(puzzles, workers=jobs, backend=backend, cache=cache)
+    for fixed_candidates, solution in zip(fixed, solutions):
+        if fixed_candidates is not None and (solution or _is_complete(fixed_candidates)):
+            target.write(visualizer.to_line(fixed_candidates + tuple(solution)) + '\n')
+            solved += 1
+        else:
+            target.write(marker + '\n')
+            unsolved += 1
+    return solved, unsolved
+
+
+def _parse_lines(lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            # the lines are solved by the rules of the standard sudoku only
+            if importer.get_box_size(len(line)) != rules.STANDARD_BOX_SIZE:
+                raise ValueError('Expected 81 cells but got {}'.format(len(line)))
+            yield importer.imp_line(line)
+        except ValueError:
+            yield None
+
+
+def _is_complete(fixed_candidates):
+    # a completely filled in puzzle has nothing left to solve
+    try:
+        constraints = set(rules.get_all_satisfied_constraints(*fixed_candidates))
+    except ValueError:
+        return False
+    return len(constraints) == len(fixed_candidates) * 4 == 324
+
+
 if __name__ == '__main__':
     main(sys.argv)
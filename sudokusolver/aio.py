@@ -0,0 +1,239 @@
+"""
+Solves sudoku puzzles from asyncio applications without blocking the event loop::
+
+    solution = await aio.solve(fixed_candidates)
+    solutions = await aio.solve_many(puzzles)
+
+The puzzles are solved by an AsyncSolver which runs solver.solve on a pool of
+threads or processes. Each worker builds the matrix template once when started
+and reuses it for all puzzles it solves. A semaphore limits the amount of puzzles
+handed to the workers at once, further calls wait until a worker is free.
+
+Cancelling the awaiting task also stops the search of the worker:
+the worker checks a flag of the call at each search node and gives up once it is set.
+The call returns only after the worker has stopped, so that a cancelled search
+never keeps a worker busy beyond the concurrency limit.
+"""
+import asyncio
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from sudokusolver import solver
+from sudokusolver import tracing
+
+EXECUTORS = ('thread', 'process')
+
+
+class AsyncSolver(object):
+    """
+    Solves puzzles by a pool of workers, to be used by one event loop.
+
+    Threads keep the event loop responsive but solve one puzzle at a time
+    because of the GIL, processes solve as many puzzles in parallel as there are CPUs.
+
+    Args:
+        executor: ``thread`` or ``process``, the kind of the workers
+        workers: amount of workers, by default one per CPU
+        max_concurrency: maximal amount of puzzles being solved or waiting for a worker,
+            by default the amount of workers
+        rule_description: lookup for candidates and constraints (see solver.solve),
+            must be a module or picklable for processes
+        backend: ``dlx`` or ``bitmask`` (see solver.solve),
+            a search of the ``bitmask`` backend can't be stopped by a cancellation
+
+    Raises:
+        ValueError: if the executor or the backend is unknown
+    """
+
+    def __init__(self, executor='thread', workers=None, max_concurrency=None,
+                 rule_description=None, backend='dlx'):
+        if executor not in EXECUTORS:
+            raise ValueError('Unknown executor {}'.format(executor))
+        if backend not in solver.BACKENDS:
+            raise ValueError('Unknown backend {}'.format(backend))
+        workers = workers if workers else os.cpu_count() or 1
+        self.max_concurrency = max_concurrency if max_concurrency else workers
+        self.__rule_description = rule_description
+        self.__backend = backend
+        # one cancellation flag per slot, a call occupies a slot until its worker is done
+        self.__slots = list(range(self.max_concurrency))
+        self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        if executor == 'process':
+            # the flags are shared with the processes when they are started
+            self.__flags = multiprocessing.RawArray('b', self.max_concurrency)
+            self.__executor = ProcessPoolExecutor(
+                workers, initializer=_init_process,
+                initargs=(self.__flags, solver._get_picklable_rule_description(rule_description),
+                          backend))
+            self.__shared = False
+        else:
+            self.__flags = bytearray(self.max_concurrency)
+            self.__executor = ThreadPoolExecutor(
+                workers, initializer=_init_thread, initargs=(rule_description, backend))
+            self.__shared = True
+
+    async def solve(self, fixed_candidates, timeout=None, max_nodes=None):
+        """
+        Solves a puzzle by a worker (see solver.solve).
+
+        Args:
+            fixed_candidates: the puzzle in any form accepted by solver.solve
+            timeout: seconds after which the search is stopped (see solver.solve)
+            max_nodes: amount of search nodes after which the search is stopped
+
+        Returns:
+            the solution in the same form as returned by solver.solve
+
+        Raises:
+            solver.BudgetExceeded: if the timeout or the maximal amount
+                of search nodes is exceeded
+        """
+        if isinstance(fixed_candidates, memoryview) and not self.__shared:
+            # memoryviews can't be passed to worker processes
+            fixed_candidates = bytes(fixed_candidates)
+        async with self.__semaphore:
+            slot = self.__slots.pop()
+            self.__flags[slot] = 0
+            # the worker processes have received the rule description when started
+            options = (self.__rule_description if self.__shared else None,
+                       self.__backend, timeout, max_nodes)
+            future = self.__executor.submit(
+                _solve, fixed_candidates, slot, self.__flags if self.__shared else None, options)
+            result = asyncio.wrap_future(future)
+            try:
+                return await asyncio.shield(result)
+            except asyncio.CancelledError:
+                if not future.cancel():
+                    self.__flags[slot] = 1
+                    await _wait_stopped(result)
+                raise
+            finally:
+                self.__slots.append(slot)
+
+    async def solve_many(self, puzzles, timeout=None, max_nodes=None) -> list:
+        """
+        Solves puzzles concurrently, limited by the maximal concurrency.
+
+        Args:
+            puzzles: iterable of puzzles (see solve)
+            timeout: seconds after which the search of each puzzle is stopped
+            max_nodes: amount of search nodes after which the search of each puzzle is stopped
+
+        Returns:
+            list of the solutions in the order of the puzzles
+        """
+        return await asyncio.gather(*(self.solve(puzzle, timeout, max_nodes)
+                                      for puzzle in puzzles))
+
+    def close(self):
+        """Stops the searches still running and shuts the workers down"""
+        for slot in range(self.max_concurrency):
+            self.__flags[slot] = 1
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+_default_solvers = weakref.WeakKeyDictionary()
+
+
+def get_default_solver() -> AsyncSolver:
+    """
+    Returns the AsyncSolver of threads used by solve and solve_many,
+    created on the first call of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _default_solvers:
+        _default_solvers[loop] = AsyncSolver()
+    return _default_solvers[loop]
+
+
+async def solve(fixed_candidates, timeout=None, max_nodes=None, async_solver=None):
+    """
+    Solves a puzzle without blocking the event loop (see AsyncSolver.solve).
+
+    Args:
+        fixed_candidates: the puzzle in any form accepted by solver.solve
+        timeout: seconds after which the search is stopped (see solver.solve)
+        max_nodes: amount of search nodes after which the search is stopped
+        async_solver: the AsyncSolver to be used, by default the one of get_default_solver
+    """
+    async_solver = async_solver or get_default_solver()
+    return await async_solver.solve(fixed_candidates, timeout, max_nodes)
+
+
+async def solve_many(puzzles, timeout=None, max_nodes=None, async_solver=None) -> list:
+    """
+    Solves puzzles without blocking the event loop (see AsyncSolver.solve_many).
+
+    Args:
+        puzzles: iterable of puzzles in any form accepted by solver.solve
+        timeout: seconds after which the search of each puzzle is stopped
+        max_nodes: amount of search nodes after which the search of each puzzle is stopped
+        async_solver: the AsyncSolver to be used, by default the one of get_default_solver
+    """
+    async_solver = async_solver or get_default_solver()
+    return await async_solver.solve_many(puzzles, timeout, max_nodes)
+
+
+async def _wait_stopped(result):
+    # waits for the worker even if the task is cancelled again meanwhile
+    while not result.done():
+        try:
+            await asyncio.wait([result])
+        except asyncio.CancelledError:
+            pass
+    if not result.cancelled():
+        # the worker has raised _Cancelled, retrieved to not be logged as unhandled
+        result.exception()
+
+
+class _Cancelled(Exception):
+    # raised in a worker to stop the search of a cancelled call
+    pass
+
+
+class _Cancellation(tracing.SearchHook):
+
+    def __init__(self, flags, slot):
+        self.flags = flags
+        self.slot = slot
+
+    def on_node(self, candidate, depth):
+        if self.flags[self.slot]:
+            raise _Cancelled()
+
+
+_process_flags = None
+
+
+def _init_thread(rule_description, backend):
+    # the templates are kept per thread
+    if backend == 'dlx':
+        solver.get_template(rule_description)
+
+
+def _init_process(flags, rule_description, backend):
+    global _process_flags
+    _process_flags = flags
+    solver._init_worker(rule_description, backend)
+
+
+def _solve(fixed_candidates, slot, flags, options):
+    if flags is None:
+        flags = _process_flags
+        rule_description = solver._worker_options['rule_description']
+    else:
+        rule_description = options[0]
+    backend, timeout, max_nodes = options[1:]
+    if flags[slot]:
+        raise _Cancelled()
+    hooks = [_Cancellation(flags, slot)] if backend == 'dlx' else []
+    return solver.solve(fixed_candidates, rule_description, backend=backend, hooks=hooks,
+                        timeout=timeout, max_nodes=max_nodes)
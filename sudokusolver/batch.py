@@ -0,0 +1,189 @@
+"""
+Provides a solver for large batches of standard 9x9 sudoku puzzles.
+
+The candidates of all puzzles are kept in one boolean tensor of shape
+(puzzles, rows, columns, numbers). The constraints are propagated for all
+puzzles at once by vectorized operations (naked and hidden singles)
+and only the puzzles which are still unsolved afterwards are handed over
+to the search of the bitmask backend.
+
+Puzzles and solutions are passed as integer arrays of shape (puzzles, 9, 9)
+whereas empty cells are 0.
+
+Note:
+
+    This module requires NumPy which can be installed as extra
+    ``pip install sudokusolver[numpy]``.
+"""
+from sudokusolver import bitmask
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SIZE = 9
+BLOCK_SIZE = 3
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('The batch solver requires NumPy, '
+                          'install it by pip install sudokusolver[numpy]')
+
+
+def solve_batch(puzzles, chunksize=10000):
+    """
+    Solves a batch of sudoku puzzles.
+
+    Args:
+        puzzles: integer array-like of shape (puzzles, 9, 9) or (puzzles, 81)
+            whereas empty cells are 0
+        chunksize: amount of puzzles propagated at once, limits the memory usage
+
+    Returns:
+        integer array of shape (puzzles, 9, 9) containing the solutions.
+        Puzzles without solution are filled with 0.
+    """
+    _require_numpy()
+    grids = numpy.asarray(puzzles).reshape(-1, SIZE, SIZE)
+    # checked before narrowing the numbers, which would wrap e.g. 256 to 0
+    if ((grids < 0) | (grids > SIZE)).any():
+        raise ValueError('Numbers must be between 0 and {}'.format(SIZE))
+    grids = grids.astype(numpy.int8)
+    solutions = numpy.zeros_like(grids)
+    for start in range(0, len(grids), chunksize):
+        solutions[start:start + chunksize] = _solve_chunk(grids[start:start + chunksize])
+    return solutions
+
+
+def _solve_chunk(grids):
+    candidates, failed = propagate(to_candidate_tensor(grids))
+    counts = candidates.sum(axis=3)
+    solutions = numpy.where(counts == 1, candidates.argmax(axis=3) + 1, 0).astype(numpy.int8)
+    solutions[failed] = 0
+    # only puzzles still containing empty cells need to be searched
+    for index in numpy.flatnonzero(~failed & (counts != 1).any(axis=(1, 2))):
+        solution = bitmask.solve_grid(solutions[index].ravel().tolist())
+        solutions[index] = numpy.reshape(solution, (SIZE, SIZE)) if solution else 0
+    return solutions
+
+
+def to_candidate_tensor(grids):
+    """
+    Converts puzzles to a boolean tensor of shape (puzzles, rows, columns, numbers)
+    which is True for each number still possible in a cell.
+
+    Args:
+        grids: integer array of shape (puzzles, 9, 9)
+
+    Returns:
+        boolean array of shape (puzzles, 9, 9, 9)
+    """
+    _require_numpy()
+    grids = numpy.asarray(grids).reshape(-1, SIZE, SIZE)
+    numbers = numpy.arange(1, SIZE + 1)
+    return (grids[..., None] == 0) | (grids[..., None] == numbers)
+
+
+def propagate(candidates):
+    """
+    Removes the candidates excluded by naked and hidden singles until
+    no more candidates can be removed.
+
+    Args:
+        candidates: boolean array of shape (puzzles, 9, 9, 9)
+
+    Returns:
+        tuple of the remaining candidates and a boolean array of shape (puzzles, )
+        which is True for each puzzle found to have no solution
+    """
+    _require_numpy()
+    candidates = candidates.copy()
+    while True:
+        previous = candidates
+        placed = candidates & (candidates.sum(axis=3, keepdims=True) == 1)
+        # naked singles: remove placed numbers from the other cells of the same unit
+        candidates = candidates & (placed | ~_any_in_units(placed))
+        # hidden singles: a number possible in only one cell of a unit must be placed there
+        for unit in ('row', 'column', 'block'):
+            hidden = _hidden_singles(candidates, unit)
+            candidates = numpy.where(hidden.any(axis=3, keepdims=True), hidden, candidates)
+        if numpy.array_equal(previous, candidates):
+            break
+    return candidates, _find_contradictions(candidates)
+
+
+def _any_in_units(placed):
+    n = len(placed)
+    in_row = placed.any(axis=2, keepdims=True)
+    in_column = placed.any(axis=1, keepdims=True)
+    blocks = placed.reshape(n, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, SIZE)
+    in_block = blocks.any(axis=(2, 4), keepdims=True)
+    in_block = numpy.broadcast_to(in_block, blocks.shape).reshape(placed.shape)
+    return in_row | in_column | in_block
+
+
+def _hidden_singles(candidates, unit):
+    if unit == 'row':
+        return candidates & (candidates.sum(axis=2, keepdims=True) == 1)
+    if unit == 'column':
+        return candidates & (candidates.sum(axis=1, keepdims=True) == 1)
+    blocks = candidates.reshape(len(candidates), BLOCK_SIZE, BLOCK_SIZE,
+                                BLOCK_SIZE, BLOCK_SIZE, SIZE)
+    unique = blocks.sum(axis=(2, 4), keepdims=True) == 1
+    return (blocks & unique).reshape(candidates.shape)
+
+
+def _find_contradictions(candidates):
+    n = len(candidates)
+    placed = candidates & (candidates.sum(axis=3, keepdims=True) == 1)
+    blocks = placed.reshape(n, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE, SIZE)
+    possible = candidates.reshape(blocks.shape)
+    # an empty cell or a number which can't be or is placed twice in a unit
+    return ((candidates.sum(axis=3) == 0).any(axis=(1, 2))
+            | (candidates.sum(axis=2) == 0).any(axis=(1, 2))
+            | (candidates.sum(axis=1) == 0).any(axis=(1, 2))
+            | (possible.sum(axis=(2, 4)) == 0).any(axis=(1, 2, 3))
+            | (placed.sum(axis=2) > 1).any(axis=(1, 2))
+            | (placed.sum(axis=1) > 1).any(axis=(1, 2))
+            | (blocks.sum(axis=(2, 4)) > 1).any(axis=(1, 2, 3)))
+
+
+def from_candidates(puzzles):
+    """
+    Converts puzzles given as sequences of candidates (e.g. ``R1C1#1``) as
+    provided by the importer to an integer array.
+
+    Args:
+        puzzles: sequence of candidate sequences
+
+    Returns:
+        integer array of shape (puzzles, 9, 9)
+    """
+    _require_numpy()
+    grids = numpy.zeros((len(puzzles), SIZE, SIZE), dtype=numpy.int8)
+    for index, candidates in enumerate(puzzles):
+        grid = bitmask.to_grid(candidates)
+        if grid is None:
+            raise ValueError('Puzzle {} contains two numbers in the same cell'.format(index))
+        grids[index] = numpy.reshape(grid, (SIZE, SIZE))
+    return grids
+
+
+def to_candidates(grids) -> list:
+    """
+    Converts puzzles or solutions given as integer array to sequences
+    of candidates (e.g. ``R1C1#1``) as used by the visualizer.
+
+    Args:
+        grids: integer array-like of shape (puzzles, 9, 9) or (puzzles, 81)
+
+    Returns:
+        list of tuples of candidates, one tuple for each puzzle
+    """
+    _require_numpy()
+    grids = numpy.asarray(grids).reshape(-1, SIZE * SIZE)
+    return [tuple('R{}C{}#{}'.format(cell // SIZE + 1, cell % SIZE + 1, number)
+                  for cell, number in enumerate(grid.tolist()) if number)
+            for grid in grids]
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+"""
+Benchmark suite of the solver, e.g. to gate changes of the matrices and the search::
+
+    python3 -m sudokusolver.bench -o baseline.json
+    ... change the code ...
+    python3 -m sudokusolver.bench --baseline baseline.json --threshold 0.1
+
+The puzzles are grouped in tiers (see TIERS) which are solved by each matrix type.
+Per tier and matrix type the suite measures:
+
+- ``build_ms``: building the matrix of all candidates (the template)
+- ``build_peak_kib``: peak of the memory allocated while building the template
+- ``solve_ms``: mean time solving a puzzle of the tier
+- ``nodes``: mean amount of search nodes (covered candidates) per puzzle
+- ``solve_peak_kib``: peak of the memory allocated while solving the puzzles
+
+Additionally ``parse_us`` is the mean time parsing a puzzle line by importer.iter_puzzles.
+The memory is traced by tracemalloc, the times are the best of several runs.
+All metrics are lower for faster solving, so that a metric exceeding its value
+in the baseline by more than the threshold is reported as regression
+and the command exits with status 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.1
+MATRIX_TYPES = (ConstraintMatrix, ArrayConstraintMatrix)
+METRICS = ('build_ms', 'build_peak_kib', 'solve_ms', 'nodes', 'solve_peak_kib', 'parse_us')
+# amount of times the puzzles of all tiers are parsed to measure the parsing
+PARSE_ROUNDS = 100
+
+# the puzzles of each tier written as one line of 81 characters
+TIERS = {
+    # the examples of the documentation and tests, mostly easy
+    'examples': (
+        '89.1.6....3......8..2..49..314869..7..62.13..7..543861..16..4..6......8....4.2.36',
+        '..49.36..5.62..13.1..85..948..162.474.....56....7....3...62.3.9.....1.....2.3.4..',
+        '82715439.965327148341689752593468271472513689618972435.8.2359..1547968232398415..',
+        '..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..',
+        '82715439.965327148341689752593.682714725136896189724357862359141547968232398415..',
+        '8271543969653271483416897525934682714725136896189724357.6235.1..54.96823.3.841...',
+    ),
+    # no fixed candidates at all
+    'empty': (
+        '.' * 81,
+    ),
+    # the minimal amount of fixed candidates of puzzles with a unique solution
+    'seventeen': (
+        '.......1.4.........2...........5.4.7..8...3....1.9....3..4..2...5.1........8.6...',
+        '.......1.4.........2...........5.6.4..8...3....1.9....3..4..2...5.1........8.7...',
+        '.......12....35......6...7.7.....3.....4..8..1...........12.....8.....4..5....6..',
+        '.......12..36..........7...41..2.......5..3..7.....6..28.....4....3..5...........',
+        '.......12..8.3...........4.12.5..........47...6.......5.7...3.....62.......1.....',
+        '.......12.4..5.........9....7.6..4.....1............5.....875..6.1...3..2........',
+        '.......12.5.4............3.7..6..4....1..........8....92....8.....51.7.......3...',
+        '.......123......6.....4....9.....5.......1.7..2..........35.4....14..8...6.......',
+        '.......124...9...........5..7.2.....6.....4.....1.8....18..........3.7..5.2......',
+        '.......125....8......7.....6..12....7.....45.....3.....3....8.....5..7...2.......',
+    ),
+    # puzzles known to be hard for humans and backtracking solvers
+    'hard': (
+        '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+        '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1',
+        '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+        '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+        '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+        '.2.4.37.........32........4.4.2...7.8...5.........1...5.....9...3.9....7..1..86..',
+    ),
+}
+
+
+def run(tiers=None, repeat=DEFAULT_REPEAT) -> dict:
+    """
+    Runs the benchmarks.
+
+    Args:
+        tiers: names of the tiers to be measured, all if None
+        repeat: amount of runs of which the best time is taken
+
+    Returns:
+        dict of the metrics by ``{tier}/{matrix type}`` and ``parse``
+
+    Raises:
+        ValueError: if a tier is unknown
+    """
+    tiers = list(TIERS) if tiers is None else tiers
+    for tier in tiers:
+        if tier not in TIERS:
+            raise ValueError('Unknown tier {}'.format(tier))
+    results = {}
+    for matrix_type in MATRIX_TYPES:
+        build = _measure_build(matrix_type, repeat)
+        for tier in tiers:
+            puzzles = list(importer.iter_puzzles(TIERS[tier]))
+            metrics = dict(build)
+            metrics.update(_measure_solve(puzzles, matrix_type, repeat))
+            results['{}/{}'.format(tier, matrix_type.__name__)] = metrics
+    lines = [line for tier in tiers for line in TIERS[tier]] * PARSE_ROUNDS
+    results['parse'] = {'parse_us': best_time(
+        lambda: sum(1 for _ in importer.iter_puzzles(lines)), repeat) / len(lines) * 10 ** 6}
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold=DEFAULT_THRESHOLD) -> list:
+    """
+    Compares results with the results of a baseline.
+
+    Args:
+        results: the results of run
+        baseline: earlier results of run
+        threshold: share by which a metric may exceed its baseline, e.g. 0.1 for 10%
+
+    Returns:
+        list of tuples of the benchmark, metric, baseline value, value and
+        their ratio for each metric exceeding the threshold
+    """
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            base = baseline.get(name, {}).get(metric)
+            if base and value > base * (1 + threshold):
+                regressions.append((name, metric, base, value, value / base))
+    return regressions
+
+
+def best_time(function, repeat=DEFAULT_REPEAT, number=1) -> float:
+    """
+    Measures the fastest of several runs, shared by the scripts of the benchmarks.
+
+    Args:
+        function: callable without arguments
+        repeat: amount of runs
+        number: calls of the function per run
+
+    Returns:
+        the seconds of one call in the fastest run
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append(time.perf_counter() - start)
+    return min(times) / number
+
+
+def peak_memory(function) -> int:
+    """Returns the peak of the memory in bytes allocated by calling the function"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure_build(matrix_type, repeat):
+    rule_description = rules.for_size(rules.STANDARD_BOX_SIZE).ids
+    build_time = best_time(lambda: solver._create_matrix((), rule_description, matrix_type),
+                           repeat)
+    peak = peak_memory(lambda: solver._create_matrix((), rule_description, matrix_type))
+    return {'build_ms': build_time * 1000, 'build_peak_kib': peak / 1024}
+
+
+def _measure_solve(puzzles, matrix_type, repeat):
+    # the template is built before and not part of the measurements
+    solver.get_template(None, matrix_type)
+    solve_time = best_time(
+        lambda: [solver.solve(puzzle, matrix_type=matrix_type) for puzzle in puzzles], repeat)
+    nodes = 0
+
+    def count_nodes():
+        nonlocal nodes
+        for puzzle in puzzles:
+            with solver._use_puzzle(puzzle, None, matrix_type) as (matrix, _):
+                nodes += _count_nodes(matrix)
+    peak = peak_memory(count_nodes)
+    return {'solve_ms': solve_time / len(puzzles) * 1000,
+            'nodes': nodes / len(puzzles),
+            'solve_peak_kib': peak / 1024}
+
+
+def _count_nodes(matrix):
+    # the covers of the search, counted by overriding the method for this instance
+    nodes = 0
+    cover = matrix.cover
+
+    def counting_cover(candidate):
+        nonlocal nodes
+        nodes += 1
+        cover(candidate)
+    matrix.cover = counting_cover
+    try:
+        solver._solve(matrix)
+    finally:
+        del matrix.cover
+    return nodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python3 -m sudokusolver.bench',
+        description='Measures building the matrices and solving tiers of puzzles.')
+    parser.add_argument('-o', '--output',
+                        help='file to write the results to as JSON, e.g. to be used as baseline')
+    parser.add_argument('--baseline',
+                        help='JSON file of earlier results to compare the results with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='share by which a metric may exceed the baseline '
+                             '(default: %(default)s)')
+    parser.add_argument('--tiers', nargs='+', choices=list(TIERS), default=list(TIERS),
+                        help='tiers of puzzles to be solved (default: all)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='amount of runs of which the best time is taken '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run(args.tiers, args.repeat)
+    _print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'version': RESULTS_VERSION,
+                       'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'results': results}, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, base, value, ratio in regressions:
+            print('Regression of {} {}: {:.2f} -> {:.2f} ({:+.0%})'.format(
+                name, metric, base, value, ratio - 1))
+        if regressions:
+            return 1
+        print('No regressions above {:.0%}'.format(args.threshold))
+    return 0
+
+
+def _print_results(results):
+    print('{:<34}'.format('benchmark') + ''.join('{:>15}'.format(metric) for metric in METRICS))
+    for name, metrics in results.items():
+        print('{:<34}'.format(name) + ''.join(
+            '{:>15.2f}'.format(metrics[metric]) if metric in metrics else '{:>15}'.format('-')
+            for metric in METRICS))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Provides a solver specialized on standard 9x9 sudoku puzzles.
+
+Instead of an exact cover matrix, the numbers used in each row, column and block
+are kept as 9-bit masks. The search always continues with the empty cell
+having the fewest numbers left (most constrained cell first).
+"""
+import re
+
+SIZE = 9
+ALL_NUMBERS = (1 << SIZE) - 1
+CELLS = SIZE * SIZE
+
+_ROW_OF = tuple(cell // SIZE for cell in range(CELLS))
+_COLUMN_OF = tuple(cell % SIZE for cell in range(CELLS))
+_BLOCK_OF = tuple(3 * (cell // 27) + (cell % SIZE) // 3 for cell in range(CELLS))
+_BIT_COUNT = tuple(bin(mask).count('1') for mask in range(ALL_NUMBERS + 1))
+_NUMBERS_OF = tuple(tuple(number for number in range(1, SIZE + 1) if mask & (1 << (number - 1)))
+                    for mask in range(ALL_NUMBERS + 1))
+_CANDIDATE_PATTERN = re.compile(r'R(\d+)C(\d+)#(\d+)$')
+
+
+def solve(fixed_candidates) -> tuple:
+    """
+    Solves a standard 9x9 sudoku puzzle.
+    The puzzle is described as sequence of strings describing the *fixed candidates*::
+
+        R{rowNumber}C{columnNumber}#{number}
+
+    Args:
+        fixed_candidates: list of strings describing the filled in cells with their numbers
+
+    Returns:
+        tuple of strings describing the candidates solving the sudoku puzzle
+        or an empty list if the puzzle has no solution
+    """
+    grid = to_grid(fixed_candidates)
+    if grid is None:
+        return []
+    solution = solve_grid(grid)
+    if solution is None:
+        return []
+    return tuple('R{}C{}#{}'.format(_ROW_OF[cell] + 1, _COLUMN_OF[cell] + 1, solution[cell])
+                 for cell in range(CELLS) if not grid[cell])
+
+
+def to_grid(candidates) -> list:
+    """
+    Converts candidates to a list of 81 numbers (row by row) whereas empty cells are 0.
+
+    Args:
+        candidates: sequence of strings in form of ``R{rowNumber}C{columnNumber}#{number}``
+
+    Returns:
+        list of numbers or None if two candidates are placed in the same cell
+    """
+    grid = [0] * CELLS
+    for candidate in candidates:
+        matches = _CANDIDATE_PATTERN.match(candidate)
+        if not matches:
+            raise ValueError('Invalid candidate {}'.format(candidate))
+        row, column, number = (int(group) for group in matches.groups())
+        if not (1 <= row <= SIZE and 1 <= column <= SIZE and 1 <= number <= SIZE):
+            raise ValueError('Invalid candidate {}'.format(candidate))
+        cell = (row - 1) * SIZE + column - 1
+        if grid[cell]:
+            return None
+        grid[cell] = number
+    return grid
+
+
+def solve_grid(grid) -> list:
+    """
+    Solves a sudoku puzzle given as sequence of 81 numbers (row by row)
+    whereas empty cells are 0.
+
+    Args:
+        grid: sequence of 81 numbers
+
+    Returns:
+        list of the 81 numbers of the solution or None if there is no solution
+    """
+    cells = list(grid)
+    rows, columns, blocks = [0] * SIZE, [0] * SIZE, [0] * SIZE
+    empty = []
+    for cell, number in enumerate(cells):
+        if not number:
+            empty.append(cell)
+            continue
+        bit = 1 << (number - 1)
+        row, column, block = _ROW_OF[cell], _COLUMN_OF[cell], _BLOCK_OF[cell]
+        if (rows[row] | columns[column] | blocks[block]) & bit:
+            return None
+        rows[row] |= bit
+        columns[column] |= bit
+        blocks[block] |= bit
+    if _search(cells, empty, rows, columns, blocks):
+        return cells
+    return None
+
+
+def _search(cells, empty, rows, columns, blocks):
+    if not empty:
+        return True
+    # most constrained cell first
+    best_index, best_mask, best_count = 0, 0, SIZE + 1
+    for index, cell in enumerate(empty):
+        mask = ALL_NUMBERS & ~(rows[_ROW_OF[cell]] | columns[_COLUMN_OF[cell]]
+                               | blocks[_BLOCK_OF[cell]])
+        count = _BIT_COUNT[mask]
+        if count < best_count:
+            best_index, best_mask, best_count = index, mask, count
+            if count <= 1:
+                break
+    if not best_count:
+        return False
+
+    cell = empty[best_index]
+    empty[best_index] = empty[-1]
+    empty.pop()
+    row, column, block = _ROW_OF[cell], _COLUMN_OF[cell], _BLOCK_OF[cell]
+    for number in _NUMBERS_OF[best_mask]:
+        bit = 1 << (number - 1)
+        rows[row] |= bit
+        columns[column] |= bit
+        blocks[block] |= bit
+        if _search(cells, empty, rows, columns, blocks):
+            cells[cell] = number
+            return True
+        rows[row] &= ~bit
+        columns[column] &= ~bit
+        blocks[block] &= ~bit
+    empty.append(cell)
+    empty[best_index], empty[-1] = empty[-1], empty[best_index]
+    return False
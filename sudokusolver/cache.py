@@ -0,0 +1,505 @@
+"""
+Caches the solutions of standard 9x9 sudoku puzzles by their canonical form
+(see canonical), so that a puzzle is solved only once for all puzzles
+differing only by a symmetry of sudoku, e.g. relabelled numbers or swapped bands::
+
+    cache = SolutionCache(maxsize=10000)
+    solution = cache.solve(fixed_candidates)
+    print(cache.hit_rate, cache.evictions, cache.canonicalize_time)
+
+The solution of the canonical form is mapped back by the inverse transformation.
+Puzzles having several solutions may therefore be answered by another solution
+than solver.solve would return.
+
+The PersistentCache keeps the solutions of the puzzles themselves in a sqlite
+database, so that they survive the process and are shared by concurrent processes,
+e.g. the workers of solver.solve_many or repeated runs of a nightly job::
+
+    with PersistentCache('solutions.sqlite', maxsize=10 ** 6) as cache:
+        solutions = list(solver.solve_many(puzzles, workers=4, cache=cache))
+        unique = cache.is_unique(puzzle)
+"""
+import contextlib
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from sudokusolver import canonical
+from sudokusolver import corpus
+from sudokusolver import rules
+from sudokusolver import solver
+
+_CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+# solution count stored for puzzles having more than one solution
+MANY = 2
+# maximal amount of puzzles looked up by one statement
+_MAX_PARAMETERS = 500
+# amount of looked up puzzles whose recent use is written at once,
+# unless it's written before by inserting puzzles or closing the cache
+USED_BATCH = 1000
+# the size of the cache is kept up to date by triggers, since counting the rows scans them
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    puzzle BLOB PRIMARY KEY,
+    solution BLOB NOT NULL,
+    count INTEGER,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS solutions_by_use ON solutions (used);
+CREATE TABLE IF NOT EXISTS size (entries INTEGER NOT NULL);
+INSERT INTO size SELECT COUNT(*) FROM solutions WHERE NOT EXISTS (SELECT * FROM size);
+CREATE TRIGGER IF NOT EXISTS solution_inserted AFTER INSERT ON solutions
+    BEGIN UPDATE size SET entries = entries + 1; END;
+CREATE TRIGGER IF NOT EXISTS solution_deleted AFTER DELETE ON solutions
+    BEGIN UPDATE size SET entries = entries - 1; END;
+"""
+
+
+class SolutionCache(object):
+    """
+    Least recently used cache in front of solver.solve.
+
+    Puzzles which aren't standard 9x9 sudokus or contain contradicting numbers
+    are solved by solver.solve without caching. Besides the solutions, the transformations
+    of the latest puzzles are kept, so that repeated puzzles skip the canonicalization.
+
+    Args:
+        maxsize: maximal amount of cached solutions, the least recently used one is evicted
+        **options: options of solver.solve used to solve the canonical forms,
+            e.g. ``backend='bitmask'``
+
+    Attributes:
+        hits: puzzles answered from the cache
+        misses: puzzles whose canonical form has been solved
+        bypasses: puzzles solved without caching
+        evictions: solutions evicted from the cache
+        canonicalizations: puzzles canonicalized
+        canonicalize_time: seconds spent canonicalizing
+        solve_time: seconds spent solving the canonical forms
+    """
+
+    def __init__(self, maxsize=1024, **options):
+        if maxsize < 1:
+            raise ValueError('Invalid maximal size {}'.format(maxsize))
+        _check_rules(options.get('rule_description'))
+        self.maxsize = maxsize
+        self.options = options
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.canonicalizations = 0
+        self.canonicalize_time = 0.0
+        self.solve_time = 0.0
+        # the canonical solutions by the canonical forms
+        # and the canonical forms with their transformations by the puzzles
+        self.__solutions = OrderedDict()
+        self.__transforms = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the cached puzzles answered from the cache"""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def as_dict(self) -> dict:
+        """Returns the statistics of the cache by their names"""
+        return {'size': len(self), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'bypasses': self.bypasses, 'hit_rate': self.hit_rate,
+                'evictions': self.evictions, 'canonicalizations': self.canonicalizations,
+                'canonicalize_time': self.canonicalize_time, 'solve_time': self.solve_time}
+
+    def solve(self, fixed_candidates):
+        """
+        Solves a puzzle or answers its solution from the cache.
+
+        Args:
+            fixed_candidates: the puzzle in any form accepted by solver.solve
+
+        Returns:
+            the solution in the same form as returned by solver.solve
+        """
+        grid = _get_grid(fixed_candidates)
+        if grid is None:
+            with self.__lock:
+                self.bypasses += 1
+            return solver.solve(fixed_candidates, **self.options)
+        with self.__lock:
+            canonical_form = self.__transforms.get(grid)
+            if canonical_form is not None:
+                self.__transforms.move_to_end(grid)
+        if canonical_form is None:
+            start = time.perf_counter()
+            try:
+                canonical_form = canonical.canonicalize(grid)
+            except ValueError:
+                # contradicting numbers have no solution
+                canonical_form = None
+            elapsed = time.perf_counter() - start
+            with self.__lock:
+                self.canonicalizations += 1
+                self.canonicalize_time += elapsed
+                if canonical_form is None:
+                    self.bypasses += 1
+                else:
+                    self.__put(self.__transforms, grid, canonical_form)
+            if canonical_form is None:
+                return solver.solve(fixed_candidates, **self.options)
+        canonical_grid, transform = canonical_form
+        with self.__lock:
+            solution = self.__solutions.get(canonical_grid)
+            if solution is not None:
+                self.__solutions.move_to_end(canonical_grid)
+                self.hits += 1
+        if solution is None:
+            start = time.perf_counter()
+            solution = solver.solve(canonical_grid, **self.options)
+            elapsed = time.perf_counter() - start
+            with self.__lock:
+                self.misses += 1
+                self.solve_time += elapsed
+                self.evictions += self.__put(self.__solutions, canonical_grid, solution)
+        return _get_solution(fixed_candidates, grid,
+                             transform.invert(solution) if solution else None)
+
+    def clear(self):
+        """Removes all solutions, the statistics are kept"""
+        with self.__lock:
+            self.__solutions.clear()
+            self.__transforms.clear()
+
+    def __len__(self):
+        return len(self.__solutions)
+
+    def __put(self, entries, key, value):
+        # returns the amount of evicted entries
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            return 1
+        return 0
+
+
+class PersistentCache(object):
+    """
+    Cache of the solutions of standard 9x9 sudoku puzzles in a sqlite database,
+    which may be used by several threads and processes at once.
+
+    Puzzles are stored packed (see corpus) together with their solution and
+    the amount of their solutions (0, 1 or MANY), so that uniqueness is answered
+    without searching. Puzzles are looked up and inserted in batches by solve_many.
+    When the cache exceeds its maximal size, the least recently used puzzles are evicted.
+    Lookups only read the database, the recent use of the found puzzles is written
+    along with the next insert, on closing or once USED_BATCH puzzles have been found.
+    Puzzles which aren't standard 9x9 sudokus are solved by solver.solve without caching.
+
+    The cache can be pickled, e.g. to be passed to worker processes, which then open
+    their own connections to the database.
+
+    Args:
+        path: path of the database file, created if it doesn't exist
+        maxsize: maximal amount of cached puzzles
+        timeout: seconds to wait for other processes writing to the database
+
+    Attributes:
+        hits: puzzles answered from the cache by this instance
+        misses: puzzles solved and inserted into the cache by this instance
+        bypasses: puzzles solved without caching
+        evictions: puzzles evicted from the cache by this instance
+    """
+
+    def __init__(self, path, maxsize=10 ** 6, timeout=30.0):
+        if maxsize < 1:
+            raise ValueError('Invalid maximal size {}'.format(maxsize))
+        self.path = os.fspath(path)
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        # the times the found puzzles have been looked up by their packed puzzles
+        self.__used = {}
+        # creates the database right away to fail early
+        self.__connect()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the cached puzzles answered from the cache"""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def as_dict(self) -> dict:
+        """Returns the statistics of the cache by their names"""
+        return {'size': len(self), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'bypasses': self.bypasses, 'hit_rate': self.hit_rate,
+                'evictions': self.evictions}
+
+    def get_many(self, grids) -> list:
+        """
+        Looks up puzzles and marks the found ones as recently used,
+        which is written to the database later on.
+
+        Args:
+            grids: sequence of puzzles as bytes-like of 81 numbers (see importer.iter_puzzles)
+
+        Returns:
+            list of a tuple of the solution grid (b'' if unsolvable) and the amount
+            of solutions (None if unknown) for each puzzle, None for puzzles not cached
+        """
+        keys = [corpus._pack(grid) for grid in grids]
+        connection = self.__connect()
+        found = {}
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            chunk = list(set(keys[start:start + _MAX_PARAMETERS]))
+            found.update((puzzle, (solution, count)) for puzzle, solution, count in
+                         connection.execute('SELECT puzzle, solution, count FROM solutions '
+                                            'WHERE puzzle IN ({})'.format(_get_markers(chunk)),
+                                            chunk))
+        if found:
+            used = time.time()
+            with self.__lock:
+                self.__used.update(dict.fromkeys(found, used))
+                pending = len(self.__used)
+            if pending >= USED_BATCH:
+                with _transaction(connection):
+                    self.__write_used(connection)
+        entries = []
+        for key in keys:
+            entry = found.get(key)
+            if entry is not None:
+                solution, count = entry
+                entry = (corpus._unpack(solution, canonical.CELLS) if solution else b'', count)
+            entries.append(entry)
+        return entries
+
+    def put_many(self, entries):
+        """
+        Inserts or replaces puzzles and evicts the least recently used ones
+        if the cache exceeds its maximal size.
+
+        Args:
+            entries: iterable of tuples of a puzzle, its solution grid (b'' if unsolvable)
+                and the amount of its solutions (at most MANY, None if unknown)
+        """
+        used = time.time()
+        rows = [(corpus._pack(grid), corpus._pack(solution) if solution else b'',
+                 None if count is None else min(count, MANY), used)
+                for grid, solution, count in entries]
+        if not rows:
+            return
+        connection = self.__connect()
+        with _transaction(connection):
+            # the puzzles found since are kept from being evicted
+            self.__write_used(connection)
+            connection.executemany(
+                'INSERT INTO solutions VALUES (?, ?, ?, ?) ON CONFLICT (puzzle) DO UPDATE '
+                'SET solution = excluded.solution, count = excluded.count, used = excluded.used',
+                rows)
+            size, = connection.execute('SELECT entries FROM size').fetchone()
+            evicted = max(size - self.maxsize, 0)
+            if evicted:
+                connection.execute('DELETE FROM solutions WHERE puzzle IN '
+                                   '(SELECT puzzle FROM solutions ORDER BY used LIMIT ?)',
+                                   (evicted,))
+        with self.__lock:
+            self.evictions += evicted
+
+    def solve(self, fixed_candidates, backend='dlx'):
+        """
+        Solves a puzzle or answers its solution from the cache (see solve_many).
+
+        Returns:
+            the solution in the same form as returned by solver.solve
+        """
+        return self.solve_many([fixed_candidates], backend)[0]
+
+    def solve_many(self, puzzles, backend='dlx') -> list:
+        """
+        Solves puzzles by one batched lookup, solving only those not cached
+        and inserting them by one batch.
+
+        Args:
+            puzzles: sequence of puzzles in any form accepted by solver.solve,
+                None is answered by an empty solution
+            backend: ``dlx`` or ``bitmask`` (see solver.solve). The solutions found by
+                ``dlx`` are counted, the count of those found by ``bitmask`` is left unknown.
+
+        Returns:
+            list of the solutions in the same form as returned by solver.solve
+        """
+        grids = [None if fixed_candidates is None else _get_grid(fixed_candidates)
+                 for fixed_candidates in puzzles]
+        cacheable = [grid for grid in grids if grid is not None]
+        cached = dict(zip(cacheable, self.get_many(cacheable)))
+        solved = {grid: _solve_counting(grid, backend)
+                  for grid, entry in cached.items() if entry is None}
+        self.put_many((grid, solution, count) for grid, (solution, count) in solved.items())
+        solutions = []
+        bypasses = 0
+        for fixed_candidates, grid in zip(puzzles, grids):
+            if fixed_candidates is None:
+                solutions.append([])
+            elif grid is None:
+                bypasses += 1
+                solutions.append(solver.solve(fixed_candidates, backend=backend))
+            else:
+                solution, _ = cached[grid] or solved[grid]
+                solutions.append(_get_solution(fixed_candidates, grid, solution or None))
+        with self.__lock:
+            self.hits += len(cacheable) - len(solved)
+            self.misses += len(solved)
+            self.bypasses += bypasses
+        return solutions
+
+    def count_solutions(self, fixed_candidates) -> int:
+        """
+        Returns the amount of solutions of a puzzle, but at most MANY,
+        by the cache or by searching and caching them.
+
+        Args:
+            fixed_candidates: the puzzle in any form accepted by solver.solve
+        """
+        grid = _get_grid(fixed_candidates)
+        if grid is None:
+            with self.__lock:
+                self.bypasses += 1
+            return solver.count_solutions(fixed_candidates, limit=MANY)
+        entry, = self.get_many([grid])
+        if entry is not None and entry[1] is not None:
+            with self.__lock:
+                self.hits += 1
+            return entry[1]
+        solution, count = _solve_counting(grid, 'dlx')
+        self.put_many([(grid, solution, count)])
+        with self.__lock:
+            self.misses += 1
+        return count
+
+    def is_unique(self, fixed_candidates) -> bool:
+        """Returns True if the puzzle has exactly one solution (see count_solutions)"""
+        return self.count_solutions(fixed_candidates) == 1
+
+    def clear(self):
+        """Removes all puzzles, the statistics are kept"""
+        connection = self.__connect()
+        with _transaction(connection):
+            connection.execute('DELETE FROM solutions')
+
+    def close(self):
+        """
+        Writes the recent use of the found puzzles and closes the connection
+        of the calling thread, it's reopened when used again.
+        """
+        connection = getattr(self.__local, 'connection', None)
+        if connection is not None and self.__local.pid == os.getpid():
+            if self.__used:
+                with _transaction(connection):
+                    self.__write_used(connection)
+            connection.close()
+        self.__local.connection = None
+
+    def __len__(self):
+        size, = self.__connect().execute('SELECT entries FROM size').fetchone()
+        return size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __reduce__(self):
+        return PersistentCache, (self.path, self.maxsize, self.timeout)
+
+    def __write_used(self, connection):
+        # within a transaction of the caller
+        with self.__lock:
+            used, self.__used = self.__used, {}
+        connection.executemany('UPDATE solutions SET used = ? WHERE puzzle = ?',
+                               [(used_at, puzzle) for puzzle, used_at in used.items()])
+
+    def __connect(self):
+        # connections can be used neither by other threads nor by forked processes
+        local = self.__local
+        if getattr(local, 'connection', None) is None or local.pid != os.getpid():
+            local.connection = sqlite3.connect(self.path, self.timeout, isolation_level=None)
+            local.pid = os.getpid()
+            # readers don't block the writer and vice versa by the write ahead log
+            local.connection.execute('PRAGMA journal_mode = WAL')
+            local.connection.execute('PRAGMA synchronous = NORMAL')
+            with _transaction(local.connection):
+                for statement in _SCHEMA.split(';\n'):
+                    local.connection.execute(statement)
+        return local.connection
+
+
+@contextlib.contextmanager
+def _transaction(connection):
+    # takes the write lock at once, waiting for other writers up to the timeout
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+def _get_markers(values):
+    return ', '.join('?' * len(values))
+
+
+def _solve_counting(grid, backend):
+    # returns the solution (b'' if unsolvable) and the amount of solutions up to MANY
+    if backend != 'dlx':
+        solution = solver.solve(grid, backend=backend)
+        return solution, None if solution else 0
+    solutions = list(itertools.islice(solver.solve_iter(grid), MANY))
+    return (solutions[0] if solutions else b''), len(solutions)
+
+
+def _check_rules(rule_description):
+    if rule_description not in (None, rules, _CODEC):
+        raise ValueError('Only the solutions of standard sudokus can be cached')
+
+
+def _get_grid(fixed_candidates):
+    # the puzzle as one number per cell or None if it can't be cached
+    if isinstance(fixed_candidates, solver.GRID_TYPES):
+        grid = bytes(fixed_candidates)
+        if len(grid) != canonical.CELLS or max(grid) > canonical.SIZE:
+            return None
+        return grid
+    try:
+        if solver._is_labels(fixed_candidates):
+            ids = [_CODEC.encode(candidate) for candidate in fixed_candidates]
+        else:
+            ids = [int(candidate) for candidate in fixed_candidates]
+    except (TypeError, ValueError):
+        return None
+    cells = set(candidate // canonical.SIZE for candidate in ids)
+    if len(cells) != len(ids) or not all(0 <= cell < canonical.CELLS for cell in cells):
+        # several numbers in the same cell
+        return None
+    return _CODEC.decode_grid(ids)
+
+
+def _get_solution(fixed_candidates, grid, solution):
+    # converts the solved grid (or None) to the form of the solutions of solver.solve
+    if isinstance(fixed_candidates, solver.GRID_TYPES):
+        return solution or b''
+    if not solution:
+        return []
+    candidates = [candidate for candidate in _CODEC.encode_grid(solution)
+                  if not grid[candidate // canonical.SIZE]]
+    if solver._is_labels(fixed_candidates):
+        return tuple(map(_CODEC.decode, candidates))
+    return tuple(candidates)
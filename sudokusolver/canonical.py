@@ -0,0 +1,226 @@
+"""
+Maps standard 9x9 sudoku puzzles to a canonical form, so that puzzles differing only
+by a symmetry of sudoku have the same canonical form::
+
+    canonical_grid, transform = canonicalize(grid)
+    assert transform.apply(grid) == canonical_grid
+    assert transform.invert(canonical_grid) == grid
+
+The symmetries are the relabelling of the numbers, permutations of the rows within
+a band (three rows of boxes), of the bands, of the columns within a stack
+(three columns of boxes) and of the stacks, and the transposition of the grid.
+Those map solutions of a puzzle to solutions of the transformed puzzle.
+
+The canonical form is the lexicographically smallest grid (one number per cell
+row by row, 0 for empty cells) among all transformations of the puzzle.
+It is searched row by row keeping only the transformations whose rows are
+the smallest so far. Transformations leaving the same remaining rows
+to be chosen are followed only once, so that symmetric puzzles are canonicalized fast too.
+"""
+import itertools
+import operator
+import random
+
+SIZE = 9
+CELLS = SIZE * SIZE
+BOX_SIZE = 3
+BANDS = tuple(tuple(range(band * BOX_SIZE, band * BOX_SIZE + BOX_SIZE))
+              for band in range(BOX_SIZE))
+
+# the columns in the order of each permutation of the stacks and the columns within them
+_COLUMN_ORDERS = tuple(
+    tuple(column for stack, within in zip(stacks, withins) for column in within)
+    for stacks in itertools.permutations(BANDS)
+    for withins in itertools.product(*(
+        [tuple(itertools.permutations(stack)) for stack in stacks])))
+_COLUMN_GETTERS = tuple(operator.itemgetter(*order) for order in _COLUMN_ORDERS)
+# the cells of each row, column and box
+_UNITS = tuple(tuple(range(row * SIZE, row * SIZE + SIZE)) for row in range(SIZE)) + \
+    tuple(tuple(range(column, CELLS, SIZE)) for column in range(SIZE)) + \
+    tuple(tuple((band + row) * SIZE + stack + column
+                for row in range(BOX_SIZE) for column in range(BOX_SIZE))
+          for band in range(0, SIZE, BOX_SIZE) for stack in range(0, SIZE, BOX_SIZE))
+# translation table of the numbers before any has been assigned a canonical number
+_UNASSIGNED = b'\xff'
+_UNASSIGNED_NUMBERS = b'\0' + _UNASSIGNED * SIZE + bytes(range(SIZE + 1, 256))
+
+
+class Transform(object):
+    """
+    Transformation of a puzzle into its canonical form.
+
+    Attributes:
+        transposed: True if the grid is transposed first
+        rows: for each row of the canonical grid the row taken from the (transposed) grid
+        columns: for each column of the canonical grid the column taken likewise
+        numbers: bytes mapping each number (and 0 for empty cells) to its canonical number
+    """
+
+    def __init__(self, transposed, rows, columns, numbers):
+        self.transposed = transposed
+        self.rows = tuple(rows)
+        self.columns = tuple(columns)
+        self.numbers = bytes(numbers)
+        # translation tables of the numbers and back, padded to all byte values
+        inverse = bytearray(range(256))
+        for number, canonical in enumerate(self.numbers):
+            inverse[canonical] = number
+        self.__table = self.numbers + bytes(range(len(self.numbers), 256))
+        self.__inverse = bytes(inverse)
+        self.__cells = tuple(column * SIZE + row if transposed else row * SIZE + column
+                             for row in self.rows for column in self.columns)
+
+    def apply(self, grid) -> bytes:
+        """Returns the grid (e.g. the puzzle or a solution) transformed"""
+        return bytes(grid[cell] for cell in self.__cells).translate(self.__table)
+
+    def invert(self, grid) -> bytes:
+        """Returns the transformed grid (e.g. the canonical solution) transformed back"""
+        cells = bytearray(CELLS)
+        for cell, number in zip(self.__cells, bytes(grid).translate(self.__inverse)):
+            cells[cell] = number
+        return bytes(cells)
+
+    def __repr__(self):
+        return 'Transform(transposed={}, rows={}, columns={}, numbers={})'.format(
+            self.transposed, self.rows, self.columns, list(self.numbers))
+
+
+def random_transform(generator=random) -> Transform:
+    """
+    Returns a random symmetry, e.g. to generate puzzles having the same canonical form.
+
+    Args:
+        generator: random.Random or the random module
+    """
+    rows = [row for band in generator.sample(BANDS, BOX_SIZE)
+            for row in generator.sample(band, BOX_SIZE)]
+    columns = [column for stack in generator.sample(BANDS, BOX_SIZE)
+               for column in generator.sample(stack, BOX_SIZE)]
+    numbers = [0] + generator.sample(range(1, SIZE + 1), SIZE)
+    return Transform(generator.random() < 0.5, rows, columns, numbers)
+
+
+def canonicalize(grid) -> tuple:
+    """
+    Returns the canonical form of a puzzle and the transformation into it.
+
+    Args:
+        grid: bytes-like of one number per cell row by row whereas empty cells are 0
+            (see importer.iter_puzzles)
+
+    Returns:
+        tuple of the canonical grid as bytes and the Transform
+
+    Raises:
+        ValueError: if the grid isn't a 9x9 puzzle or contains a number twice
+            in a row, column or box, i.e. can't be solved
+    """
+    grid = bytes(grid)
+    if len(grid) != CELLS:
+        raise ValueError('Expected {} cells but got {}'.format(CELLS, len(grid)))
+    if max(grid) > SIZE:
+        raise ValueError('Invalid number {}'.format(max(grid)))
+    for unit in _UNITS:
+        numbers = [grid[cell] for cell in unit if grid[cell]]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError('Contradicting numbers in the cells {}'.format(unit))
+    rows = {False: [grid[row * SIZE:row * SIZE + SIZE] for row in range(SIZE)]}
+    rows[True] = [grid[column::SIZE] for column in range(SIZE)]
+    # each state is a transposition and column order with the rows chosen so far,
+    # the translation table of the numbers assigned so far, the next number to be assigned
+    # and the rows to be tried next if restricted
+    states = [(transposed, columns, (), _UNASSIGNED_NUMBERS, 1, (row,))
+              for transposed, columns, row in _get_first_row_candidates(rows)]
+    # the rows of the grids by transposition and column order, built when needed
+    grids = {}
+    canonical = bytearray()
+    for _ in range(SIZE):
+        smallest = None
+        chosen = {}
+        for transposed, columns, taken, numbers, next_number, next_rows in states:
+            grid = grids.get((transposed, columns))
+            if grid is None:
+                get_columns = _COLUMN_GETTERS[columns]
+                grid = grids[transposed, columns] = [bytes(get_columns(values))
+                                                     for values in rows[transposed]]
+            for row in next_rows or _get_next_rows(taken):
+                values = grid[row]
+                labels = values.translate(numbers)
+                row_numbers, row_next = numbers, next_number
+                if _UNASSIGNED in labels:
+                    # the numbers assigned next are at least the next number
+                    if smallest is not None and \
+                            labels.replace(_UNASSIGNED, bytes((next_number,))) > smallest:
+                        continue
+                    row_numbers, row_next = _assign(values, numbers, next_number)
+                    labels = values.translate(row_numbers)
+                if smallest is not None and labels > smallest:
+                    continue
+                if labels != smallest:
+                    smallest = labels
+                    chosen = {}
+                state = (transposed, columns, taken + (row,), row_numbers, row_next, ())
+                chosen.setdefault(_get_remainder(taken + (row,), row_numbers, grid), state)
+        canonical += smallest
+        states = list(chosen.values())
+    transposed, columns, taken, numbers, next_number, _ = states[0]
+    return bytes(canonical), Transform(transposed, taken, _COLUMN_ORDERS[columns],
+                                       _complete(numbers, next_number))
+
+
+def _get_first_row_candidates(rows):
+    # the numbers of a row are distinct, so the first row is relabelled 1, 2, 3, ...
+    # in the order of its filled in cells and only the rows and column orders moving
+    # the most empty cells to the front can lead to the smallest first row.
+    # Those order the stacks by their filled in cells, the empty ones first within a stack.
+    patterns = {}
+    for transposed in (False, True):
+        for row, values in enumerate(rows[transposed]):
+            filled = bytes(map(bool, values))
+            counts = sorted(sum(filled[stack[0]:stack[-1] + 1]) for stack in BANDS)
+            patterns[transposed, row] = (filled, tuple(
+                int(index >= BOX_SIZE - count) for count in counts for index in range(BOX_SIZE)))
+    smallest = min(pattern for _, pattern in patterns.values())
+    return [(transposed, columns, row)
+            for (transposed, row), (filled, pattern) in patterns.items() if pattern == smallest
+            for columns, get_columns in enumerate(_COLUMN_GETTERS)
+            if get_columns(filled) == smallest]
+
+
+def _get_next_rows(taken):
+    # the rows of the current band or, at the start of a band, of all bands not taken yet
+    if len(taken) % BOX_SIZE:
+        band = BANDS[taken[-1] // BOX_SIZE]
+        return [row for row in band if row not in taken]
+    return [row for row in range(SIZE) if row not in taken]
+
+
+def _assign(values, numbers, next_number):
+    # assigns canonical numbers in the order of their first appearance
+    numbers = bytearray(numbers)
+    for value in values:
+        if numbers[value] == _UNASSIGNED[0]:
+            numbers[value] = next_number
+            next_number += 1
+    return bytes(numbers), next_number
+
+
+def _get_remainder(taken, numbers, grid):
+    # states of the same remainder lead to the same canonical form,
+    # it consists of the numbers assigned so far and the rows left to be chosen,
+    # those of the current band first and then those of the bands left
+    current = BANDS[taken[-1] // BOX_SIZE] if len(taken) % BOX_SIZE else ()
+    return numbers + b''.join([grid[row] for row in current if row not in taken] +
+                              [grid[row] for band in BANDS if band is not current
+                               for row in band if row not in taken])
+
+
+def _complete(numbers, next_number):
+    # numbers missing in the puzzle are mapped to the canonical numbers left in order
+    numbers = bytearray(numbers[:SIZE + 1])
+    for number in range(1, SIZE + 1):
+        if numbers[number] == _UNASSIGNED[0]:
+            numbers[number] = next_number
+            next_number += 1
+    return numbers
@@ -0,0 +1,324 @@
+"""
+Provides a compact binary format for large sets of sudoku puzzles and their solutions.
+
+A corpus file starts with a header of 16 bytes followed by one record of fixed size
+per puzzle. A record contains the numbers of the cells row by row whereas empty cells
+are 0, i.e. the bytes of a puzzle as accepted by solver.solve::
+
+    offset  size  content
+    0       4     magic bytes ``SDKC``
+    4       1     format version (1)
+    5       1     box size of the puzzles (see rules.for_size), e.g. 3 for 9x9 puzzles
+    6       1     1 if two cells are packed into one byte, otherwise 0
+    7       1     reserved (0)
+    8       8     amount of records (unsigned, little endian)
+    16            records, e.g. 81 bytes per 9x9 puzzle or 41 bytes if packed
+
+Packed records store the first of two cells in the high and the second one
+in the low four bits of a byte, which is supported up to 9x9 puzzles.
+
+Corpus files are opened by importer.open_corpus which maps them into memory,
+so that the puzzles can be indexed and sliced without copying them::
+
+    with importer.open_corpus('puzzles.sdk') as puzzles:
+        solution = solver.solve(puzzles[0])
+"""
+import mmap
+import struct
+from collections.abc import Sequence
+from contextlib import closing
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+
+MAGIC = b'SDKC'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBxQ')
+# the numbers must fit into four bits to be packed
+MAX_PACKED_SIZE = 15
+
+# translation tables from bytes to their high and low four bits and back
+_HIGH_BITS = bytes(value >> 4 for value in range(256))
+_LOW_BITS = bytes(value & 0xf for value in range(256))
+_TO_HIGH_BITS = bytes((value << 4) & 0xff for value in range(256))
+
+
+def get_record_size(box_size: int, packed=False) -> int:
+    """Returns the size of a record in bytes, e.g. 81 for 9x9 puzzles or 41 if packed"""
+    cells = box_size ** 4
+    return (cells + 1) // 2 if packed else cells
+
+
+class Corpus(Sequence):
+    """
+    Sequence of the puzzles of a corpus as bytes-like objects of one number per cell
+    (see solver.solve). The records are read from a buffer without copying them:
+    unpacked records are returned as memoryview and slices of the corpus are corpora
+    viewing the same buffer. Packed records are unpacked into new bytes.
+
+    Use importer.open_corpus to open a corpus file.
+
+    Args:
+        records: buffer containing the records (without the header)
+        box_size: box size of the puzzles (see rules.for_size)
+        packed: True if two cells are packed into one byte
+        source: object the buffer belongs to, closed by close()
+
+    Raises:
+        ValueError: if the buffer doesn't consist of whole records
+    """
+
+    def __init__(self, records, box_size=rules.STANDARD_BOX_SIZE, packed=False, source=None):
+        _check_format(box_size, packed)
+        self.box_size = box_size
+        self.packed = packed
+        self.record_size = get_record_size(box_size, packed)
+        self.__records = memoryview(records).cast('B')
+        self.__source = source
+        if len(self.__records) % self.record_size:
+            raise ValueError('Expected records of {} bytes but got {} bytes'.format(
+                self.record_size, len(self.__records)))
+
+    @property
+    def records(self) -> memoryview:
+        """The buffer of the records, e.g. to be passed to ``numpy.frombuffer``"""
+        return self.__records
+
+    def __len__(self):
+        return len(self.__records) // self.record_size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError('Only contiguous slices of a corpus are supported')
+            stop = max(start, stop)
+            return Corpus(self.__records[start * self.record_size:stop * self.record_size],
+                          self.box_size, self.packed)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Corpus index out of range')
+        record = self.__records[index * self.record_size:(index + 1) * self.record_size]
+        return _unpack(record, self.box_size ** 4) if self.packed else record
+
+    def close(self):
+        """
+        Releases the buffer and closes the file it has been read from.
+        Slices and records still referenced prevent the file from being closed,
+        it is closed when they are garbage collected.
+        """
+        try:
+            self.__records.release()
+            if self.__source is not None:
+                self.__source.close()
+        except BufferError:
+            # records are views of the buffer
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_corpus(path: str) -> bool:
+    """Returns True if the file starts like a corpus file"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_corpus(path: str) -> Corpus:
+    """Opens a corpus file by mapping it into memory, see importer.open_corpus"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a corpus file'.format(path))
+        magic, version, box_size, packed, count = HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError('Unsupported corpus version {}'.format(version))
+        _check_format(box_size, packed)
+        size = HEADER.size + count * get_record_size(box_size, packed)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < size:
+        mapped.close()
+        raise ValueError('Expected {} bytes of {} records but got {} bytes'.format(
+            size, count, len(mapped)))
+    return Corpus(memoryview(mapped)[HEADER.size:size], box_size, bool(packed), mapped)
+
+
+class CorpusWriter(object):
+    """
+    Writes puzzles or solutions record by record into a corpus file.
+    The amount of records is written into the header when closed.
+
+    Args:
+        path: path of the corpus file to be created
+        box_size: box size of the puzzles (see rules.for_size)
+        packed: True to pack two cells into one byte (up to 9x9 puzzles)
+
+    Raises:
+        ValueError: if the puzzles can't be packed
+    """
+
+    def __init__(self, path, box_size=rules.STANDARD_BOX_SIZE, packed=False):
+        _check_format(box_size, packed)
+        self.box_size = box_size
+        self.packed = packed
+        self.count = 0
+        self.__cells = box_size ** 4
+        self.__file = open(path, 'wb')
+        self.__file.write(self.__get_header())
+
+    def write(self, cells):
+        """
+        Appends a record.
+
+        Args:
+            cells: bytes-like of one number per cell row by row whereas empty cells are 0.
+                An empty sequence (e.g. an unsolvable puzzle) is written as empty grid.
+
+        Raises:
+            ValueError: if the cells don't describe a puzzle of the box size
+        """
+        if not len(cells):
+            cells = bytes(self.__cells)
+        elif len(cells) != self.__cells:
+            raise ValueError('Expected {} cells but got {}'.format(self.__cells, len(cells)))
+        elif max(cells) > self.box_size ** 2:
+            raise ValueError('Invalid number {}'.format(max(cells)))
+        self.__file.write(_pack(cells) if self.packed else cells)
+        self.count += 1
+
+    def close(self):
+        """Writes the header and closes the file"""
+        if self.__file.closed:
+            return
+        self.__file.seek(0)
+        self.__file.write(self.__get_header())
+        self.__file.close()
+
+    def __get_header(self):
+        return HEADER.pack(MAGIC, VERSION, self.box_size, int(self.packed), self.count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_corpus(path: str, grids, box_size=rules.STANDARD_BOX_SIZE, packed=False) -> int:
+    """
+    Writes puzzles into a corpus file.
+
+    Args:
+        path: path of the corpus file to be created
+        grids: iterable of bytes-like of one number per cell (see CorpusWriter.write)
+        box_size: box size of the puzzles (see rules.for_size)
+        packed: True to pack two cells into one byte (up to 9x9 puzzles)
+
+    Returns:
+        the amount of written puzzles
+    """
+    with CorpusWriter(path, box_size, packed) as writer:
+        for cells in grids:
+            writer.write(cells)
+    return writer.count
+
+
+def convert_lines(source_path: str, target_path: str, packed=False) -> int:
+    """
+    Converts a text file of puzzles, e.g. written one per line, into a corpus file.
+    All formats of importer.iter_puzzles are detected, also compressed.
+    The box size is taken from the first puzzle.
+
+    Returns:
+        the amount of converted puzzles
+
+    Raises:
+        ValueError: if the file doesn't contain puzzles of the same size as the first one
+    """
+    grids = importer.iter_puzzles(source_path)
+    with closing(grids):
+        first = next(grids, None)
+        box_size = importer.get_box_size(len(first)) if first else rules.STANDARD_BOX_SIZE
+        with CorpusWriter(target_path, box_size, packed) as writer:
+            if first:
+                writer.write(first)
+            for cells in grids:
+                writer.write(cells)
+    return writer.count
+
+
+def convert_csv(source_paths, target_path: str, box_size=rules.STANDARD_BOX_SIZE,
+                packed=False) -> int:
+    """
+    Converts puzzles written as CSV grid (see importer.imp_candidates)
+    into a corpus file, one puzzle per CSV file.
+
+    Returns:
+        the amount of converted puzzles
+    """
+    codec = rules.for_size(box_size)
+    grids = (codec.decode_grid(map(codec.encode, importer.imp_candidates(path)))
+             for path in source_paths)
+    return write_corpus(target_path, grids, box_size, packed)
+
+
+def solve_corpus(puzzles: Corpus, path: str, workers=1, backend='dlx', packed=None,
+                 cache=None) -> tuple:
+    """
+    Solves the puzzles of a corpus and writes their solutions into a corpus file
+    in the same order. Puzzles without solution are written as empty grid.
+
+    Args:
+        puzzles: the corpus of the puzzles
+        path: path of the corpus file of the solutions to be created
+        workers: amount of worker processes (see solver.solve_many)
+        backend: ``dlx`` or ``bitmask`` (see solver.solve)
+        packed: True to pack the solutions, by default like the puzzles
+        cache: cache.PersistentCache of the solutions of standard sudokus
+
+    Returns:
+        tuple of the amount of solved and unsolved puzzles
+    """
+    packed = puzzles.packed if packed is None else packed
+    # memoryviews can't be passed to worker processes
+    grids = puzzles if workers == 1 else map(bytes, puzzles)
+    rule_description = rules.for_size(puzzles.box_size)
+    solutions = solver.solve_many(grids, workers, rule_description=rule_description,
+                                  backend=backend, cache=cache)
+    solved = 0
+    with CorpusWriter(path, puzzles.box_size, packed) as writer:
+        for solution in solutions:
+            writer.write(solution)
+            solved += bool(solution)
+    return solved, writer.count - solved
+
+
+def _check_format(box_size, packed):
+    if not 2 <= box_size <= 5:
+        raise ValueError('Unsupported box size {}'.format(box_size))
+    if packed and box_size ** 2 > MAX_PACKED_SIZE:
+        raise ValueError('Puzzles of box size {} can not be packed'.format(box_size))
+
+
+def _pack(cells):
+    cells = bytes(cells)
+    high, low = cells[0::2], cells[1::2]
+    # the high bits of the last byte only if the amount of cells is odd
+    low += bytes(len(high) - len(low))
+    packed = int.from_bytes(high.translate(_TO_HIGH_BITS), 'big') | int.from_bytes(low, 'big')
+    return packed.to_bytes(len(high), 'big')
+
+
+def _unpack(record, cells):
+    record = bytes(record)
+    unpacked = bytearray(2 * len(record))
+    unpacked[0::2] = record.translate(_HIGH_BITS)
+    unpacked[1::2] = record.translate(_LOW_BITS)
+    return bytes(unpacked[:cells])
+
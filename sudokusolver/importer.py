@@ -14,8 +14,44 @@ text file written in following format::
     1,5,4,  _,9,6,  8,2,3
     _,3,9,  8,4,1,  5,_,_
 
+or from lines of 81 characters each describing one puzzle row by row
+whereas empty cells are written as ``.`` or ``0``::
+
+    ..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..
+
+Larger puzzles are read likewise, e.g. 16x16 puzzles from lines of 256 characters.
+The numbers above 9 are written as letters, ``A`` for 10 up to ``P`` for 25.
+The numbers in the text files may simply have several digits.
+
+Files containing many puzzles in one of these formats, or as grids of
+one row of characters per line, are streamed by iter_puzzles.
+Large sets of puzzles are read faster from the binary corpus files
+of the corpus module (see open_corpus).
 """
+import bz2
 import csv
+import gzip
+import io
+import sys
+
+from sudokusolver import rules
+
+EMPTY_CELLS = '.0_'
+SYMBOLS = '123456789ABCDEFGHIJKLMNOP'
+FORMATS = ('line', 'csv', 'grid')
+FORMS = ('bytes', 'ints', 'ids')
+
+# translation table from the symbols to the numbers (as characters) and
+# the separators of the CSV format to be deleted
+# control characters would be kept as numbers, they are translated into an invalid symbol
+_SYMBOL_NUMBERS = str.maketrans(
+    dict({chr(code): '?' for code in range(32)},
+         **{symbol: 0 for symbol in EMPTY_CELLS},
+         **{symbol: number for number, symbol in enumerate(SYMBOLS, start=1)},
+         **{symbol.lower(): number for number, symbol in enumerate(SYMBOLS[9:], start=10)}))
+_CSV_SEPARATORS = str.maketrans('', '', ', \t')
+_LINE_LENGTHS = tuple(box_size ** 4 for box_size in range(2, 6))
+_ROW_LENGTHS = tuple(box_size ** 2 for box_size in range(3, 6))
 
 
 # underscore prevents all importing modules to import this method
@@ -52,3 +88,231 @@ def imp_candidates(path: str) -> tuple:
                 candidate = 'R{}C{}#{}'.format(rownumber, columnnumber, value)
                 fix_candidates.append(candidate)
     return tuple(fix_candidates)
+
+
+def imp_line(line: str) -> tuple:
+    """Parses a sudoku puzzle written as one line of 81 characters
+    (or 256 and 625 for 16x16 and 25x25 puzzles)
+    and returns the containing numbers as strings in the form of
+    ``R{rowNumber}C{columnNumber}#{number}``.
+
+    Args:
+        line: the numbers of the puzzle row by row whereas empty cells are ``.`` or ``0``
+            and numbers above 9 are the letters starting with ``A``
+
+    Returns:
+        a tuple of strings containing the read numbers
+
+    Raises:
+        ValueError: if the line doesn't describe a sudoku puzzle
+    """
+    line = line.strip()
+    size = get_box_size(len(line)) ** 2
+    fix_candidates = []
+    for cell, value in enumerate(line):
+        if value in EMPTY_CELLS:
+            continue
+        number = SYMBOLS.find(value.upper()) + 1
+        if not 0 < number <= size:
+            raise ValueError('Invalid number {}'.format(value))
+        fix_candidates.append('R{}C{}#{}'.format(cell // size + 1, cell % size + 1, number))
+    return tuple(fix_candidates)
+
+
+def get_box_size(cells: int) -> int:
+    """Returns the box size (see rules.for_size) of sudoku puzzles
+    consisting of the given amount of cells, e.g. 3 for 81 cells.
+
+    Raises:
+        ValueError: if there is no sudoku puzzle of this amount of cells
+    """
+    box_size = round(cells ** 0.25)
+    if box_size < 2 or box_size ** 4 != cells or box_size > 5:
+        raise ValueError('Expected 81, 256 or 625 cells but got {}'.format(cells))
+    return box_size
+
+
+def imp_lines(lines):
+    """Lazily parses sudoku puzzles written one per line (see imp_line).
+    Empty lines and lines starting with ``#`` are skipped.
+
+    Args:
+        lines: iterable of lines, e.g. an opened file
+
+    Returns:
+        generator of tuples of strings containing the read numbers of each puzzle
+
+    Raises:
+        ValueError: if a line doesn't describe a sudoku puzzle
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            yield imp_line(line)
+        except ValueError as e:
+            raise ValueError('Line {}: {}'.format(number, e)) from e
+
+
+def open_corpus(path: str):
+    """Opens a binary corpus file (see the corpus module) by mapping it into memory.
+    The puzzles can be indexed and sliced without copying them::
+
+        with importer.open_corpus('puzzles.sdk') as puzzles:
+            for puzzle in puzzles[1000:2000]:
+                solution = solver.solve(puzzle)
+
+    Args:
+        path: path to the corpus file
+
+    Returns:
+        corpus.Corpus, a sequence of the puzzles as bytes of one number per cell
+        whereas empty cells are 0
+
+    Raises:
+        ValueError: if the file is not a valid corpus file
+    """
+    # imported here since the corpus module converts files by this module
+    from sudokusolver import corpus
+    return corpus.read_corpus(path)
+
+
+def iter_puzzles(source='-', form='bytes', format=None):
+    """Lazily parses the puzzles of a file one by one.
+    Gzip and bzip2 compressed files are decompressed transparently.
+
+    The format is detected by the first puzzle unless given:
+
+    - ``line``: one puzzle per line (see imp_line)
+    - ``csv``: grids of comma separated numbers (see imp_candidates)
+      following each other, empty lines are ignored
+    - ``grid``: grids of one row of characters per line, e.g. ``..71.439.``,
+      lines between the puzzles containing spaces or of another length
+      like ``Grid 01`` are skipped
+
+    Lines of 16 characters are taken as 4x4 puzzle unless the format is ``grid``.
+    Lines starting with ``#`` are skipped in all formats.
+
+    Args:
+        source: path to the file, ``-`` for the standard input
+            or an iterable of lines, e.g. an opened file
+        form: ``bytes`` for one number per cell row by row (see solver.solve),
+            ``ints`` for a list of those numbers or ``ids`` for
+            the candidate ids of the filled in cells (see rules.IntegerRules)
+        format: ``line``, ``csv``, ``grid`` or None to detect the format
+
+    Returns:
+        generator of the puzzles
+
+    Raises:
+        ValueError: if the form or format is unknown or, while parsing,
+            if the file doesn't contain puzzles of the format
+    """
+    if form not in FORMS:
+        raise ValueError('Unknown form {}'.format(form))
+    if format is not None and format not in FORMATS:
+        raise ValueError('Unknown format {}'.format(format))
+    return _iter_puzzles(source, form, format)
+
+
+def _iter_puzzles(source, form, format):
+    lines, file = _open_text(source) if isinstance(source, str) else (source, None)
+    try:
+        for cells in _parse_grids(lines, format):
+            if form == 'bytes':
+                yield cells
+            elif form == 'ints':
+                yield list(cells)
+            else:
+                yield rules.for_size(get_box_size(len(cells))).encode_grid(cells)
+    finally:
+        if lines is source:
+            pass
+        elif source == '-':
+            # the standard input stays open
+            lines.detach()
+        else:
+            # the decompressing streams don't close the file they read
+            try:
+                lines.close()
+            finally:
+                file.close()
+
+
+def _open_text(path):
+    # returns the text stream and the binary file it reads
+    file = stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    magic = stream.peek(3)[:3]
+    if magic.startswith(b'\x1f\x8b'):
+        stream = gzip.GzipFile(fileobj=stream)
+    elif magic == b'BZh':
+        stream = bz2.BZ2File(stream)
+    # all symbols are ASCII, other characters are reported as invalid numbers
+    return io.TextIOWrapper(stream, encoding='latin-1', newline=None), file
+
+
+def _parse_grids(lines, format):
+    rows = []
+    size = 0
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if format is None:
+            format = _detect_format(line)
+            if format is None:
+                continue
+        try:
+            if format == 'line':
+                yield _parse_cells(line, get_box_size(len(line)) ** 2)
+                continue
+            if format == 'csv':
+                row = line.translate(_CSV_SEPARATORS)
+                if len(row) != line.count(',') + 1:
+                    row = _parse_numbers(line)
+            elif not rows and (len(line) not in _ROW_LENGTHS or ' ' in line):
+                # headers between the puzzles
+                continue
+            else:
+                row = line
+            size = size if rows else len(row)
+            if size not in _ROW_LENGTHS or len(row) != size:
+                raise ValueError('Expected a row of {} cells but got {}'.format(
+                    size if rows else '9, 16 or 25', len(row)))
+            rows.append(row)
+            if len(rows) == size:
+                # the rows are translated at once
+                yield _parse_cells(''.join(rows), size)
+                rows = []
+        except ValueError as e:
+            raise ValueError('Line {}: {}'.format(number, e)) from e
+    if rows:
+        raise ValueError('Incomplete puzzle of {} rows at the end'.format(len(rows)))
+
+
+def _detect_format(line):
+    if ',' in line:
+        return 'csv'
+    if len(line) in _LINE_LENGTHS:
+        return 'line'
+    if len(line) in _ROW_LENGTHS:
+        return 'grid'
+    # probably a header before the first puzzle
+    return None
+
+
+def _parse_cells(text, size):
+    # translates the symbols straight into bytes without a string per cell
+    cells = text.translate(_SYMBOL_NUMBERS).encode('latin-1', 'replace')
+    if max(cells) > size:
+        raise ValueError('Invalid number in {}'.format(text))
+    return cells
+
+
+def _parse_numbers(line):
+    # a row containing numbers of several digits as their symbols
+    numbers = [0 if value.strip() in EMPTY_CELLS else int(value) for value in line.split(',')]
+    if not 0 <= min(numbers) <= max(numbers) <= len(numbers):
+        raise ValueError('Invalid number in {}'.format(line))
+    return ''.join(SYMBOLS[number - 1] if number else EMPTY_CELLS[0] for number in numbers)
@@ -0,0 +1,314 @@
+"""
+Provides an array based implementation of the ConstraintMatrix.
+
+Instead of allocating a Node object per entry, the links of the
+dancing-links structure are stored in flat lists of integers.
+Every entry of the matrix (headers included) is addressed by its index
+into those lists.
+"""
+
+
+class RowReference(object):
+    """
+    Lightweight handle of a row (candidate) of the ArrayConstraintMatrix.
+    Provides the same ``candidate`` attribute as the RowReferenceNode.
+    """
+    __slots__ = ('candidate', 'node')
+
+    def __init__(self, candidate, node):
+        self.candidate = candidate
+        self.node = node
+
+    def __repr__(self):
+        return "RowReference('{}')".format(self.candidate)
+
+
+class ArrayConstraintMatrix(object):
+    """
+    A two dimensional matrix used to solve an exact cover problem.
+    It provides the same operations as the ConstraintMatrix and
+    can therefore be used interchangeably by the solver.
+
+    The left, right, up and down neighbours as well as the column of
+    each entry are kept in lists indexed by the entry.
+    Index 0 is the root which links horizontally all column headers.
+    Column headers are followed by their entries vertically and
+    the entries of a row are linked horizontally in a circle.
+    """
+    ROOT = 0
+
+    def __init__(self):
+        self._left = [0]
+        self._right = [0]
+        self._up = [0]
+        self._down = [0]
+        self._column = [0]
+        self._size = [0]
+        # row of each entry, None for the root and the column headers
+        self._row = [None]
+        # accessible by constraint and candidate
+        self._columns = {}
+        self._candidates = {}
+        self._history = []
+
+    @classmethod
+    def from_incidence(cls, rows, constraints=()) -> 'ArrayConstraintMatrix':
+        """
+        Creates a matrix from a sequence of candidates and their constraints.
+
+        Args:
+            rows: iterable of tuples (candidate, covered_constraints)
+            constraints: constraints whose columns are created first in the given order,
+                even if no row covers them
+
+        Returns:
+            the created ArrayConstraintMatrix
+        """
+        matrix = cls()
+        for constraint in constraints:
+            matrix._get_or_create_column(constraint)
+        for candidate, covered_constraints in rows:
+            matrix.add(candidate, covered_constraints)
+        return matrix
+
+    def add(self, candidate=None, covered_constraints=[]):
+        """
+        Adds a new row to the matrix labeled with the provided candidate
+        containing an entry for each of the provided constraints.
+
+        Args:
+            candidate (str): candidate name to be attached to the row
+            covered_constraints (list): constraint names to be attached to the row
+        """
+        left, right, up, down = self._left, self._right, self._up, self._down
+        first = row_ref = None
+        for constraint in covered_constraints:
+            column = self._get_or_create_column(constraint)
+            node = len(left)
+            # append vertically to the end of the column
+            last = up[column]
+            up.append(last)
+            down.append(column)
+            down[last] = node
+            up[column] = node
+            # append horizontally to the end of the row
+            if first is None:
+                first = node
+                row_ref = RowReference(candidate, first)
+                self._candidates[candidate] = row_ref
+                left.append(node)
+                right.append(node)
+            else:
+                tail = left[first]
+                left.append(tail)
+                right.append(first)
+                right[tail] = node
+                left[first] = node
+            self._column.append(column)
+            self._row.append(row_ref)
+            self._size.append(0)
+            self._size[column] += 1
+
+    def _get_or_create_column(self, constraint):
+        column = self._columns.get(constraint)
+        if column is None:
+            column = len(self._left)
+            last = self._left[self.ROOT]
+            self._left.append(last)
+            self._right.append(self.ROOT)
+            self._right[last] = column
+            self._left[self.ROOT] = column
+            self._up.append(column)
+            self._down.append(column)
+            self._column.append(column)
+            self._size.append(0)
+            self._row.append(None)
+            self._columns[constraint] = column
+        return column
+
+    def has_satisfied_all_constraints(self) -> bool:
+        """Returns True of all contraints has been satisfied, otherwise False"""
+        return self._right[self.ROOT] == self.ROOT
+
+    def candidates_exist(self) -> bool:
+        """Returs True if any constraint is left to be satisfied by a candidate, otherwise False"""
+        return self._right[self.ROOT] != self.ROOT
+
+    def get_candidate(self, candidate):
+        """
+        Returns the RowReference of the given candidate
+        or None if the matrix doesn't contain it.
+        """
+        return self._candidates.get(candidate)
+
+    def get_constraint(self, constraint):
+        """
+        Returns the column of the given constraint
+        or None if the matrix doesn't contain it.
+        """
+        return self._columns.get(constraint)
+
+    def __get_unsatisfied_constraint_column(self):
+        right, size = self._right, self._size
+        column = right[self.ROOT]
+        best, best_size = column, size[column]
+        while column != self.ROOT:
+            if size[column] < best_size:
+                best, best_size = column, size[column]
+            column = right[column]
+        return best
+
+    def get_next_constraints_candidates(self) -> list:
+        """
+        Returns a sequence of RowReferences(candidates) fulfilling
+        the next automatically chosen constraint (the column with the fewest entries).
+
+        Returns:
+            list of RowReferences
+        """
+        return list(self.iter_candidates(self.__get_unsatisfied_constraint_column()))
+
+    def choose_constraint(self) -> int:
+        """
+        Returns the column (constraint) with the fewest candidates left
+        or None if all constraints have been satisfied.
+        """
+        if self.has_satisfied_all_constraints():
+            return None
+        return self.__get_unsatisfied_constraint_column()
+
+    def iter_candidates(self, constraint):
+        """
+        Lazily iterates through the RowReferences(candidates) fulfilling the given
+        column (constraint).
+        The iteration may be continued after covering a returned candidate
+        as long as it has been uncovered again.
+        """
+        down, rows = self._down, self._row
+        node = down[constraint]
+        while node != constraint:
+            yield rows[node]
+            node = down[node]
+
+    def iter_constraints(self):
+        """Lazily iterates through the columns (constraints) not satisfied yet"""
+        right = self._right
+        column = right[self.ROOT]
+        while column != self.ROOT:
+            yield column
+            column = right[column]
+
+    def size_of(self, constraint) -> int:
+        """Returns the amount of candidates left fulfilling the column (constraint)"""
+        return self._size[constraint]
+
+    def get_constraints(self, row_ref) -> list:
+        """Returns the columns (constraints) fulfilled by the RowReference(candidate)"""
+        columns = [self._column[row_ref.node]]
+        node = self._right[row_ref.node]
+        while node != row_ref.node:
+            columns.append(self._column[node])
+            node = self._right[node]
+        return columns
+
+    def is_satisfied(self, constraint) -> bool:
+        """Returns True if the column (constraint) has been covered, otherwise False"""
+        return self._right[self._left[constraint]] != constraint
+
+    def is_available(self, row_ref) -> bool:
+        """Returns True if the RowReference(candidate) is still part of the matrix,
+        otherwise False"""
+        node = row_ref.node
+        return self._down[self._up[node]] == node and not self.is_satisfied(self._column[node])
+
+    def eliminate(self, row_ref):
+        """Removes the candidate from the matrix without covering any constraint.
+
+        Use uncover to undo the changes made by this operation.
+        """
+        up, down, right = self._up, self._down, self._right
+        size, columns = self._size, self._column
+        node = row_ref.node
+        while True:
+            down[up[node]] = down[node]
+            up[down[node]] = up[node]
+            size[columns[node]] -= 1
+            node = right[node]
+            if node == row_ref.node:
+                break
+        self._history.append((row_ref, False))
+
+    def cover(self, row_ref):
+        """Covers the candidate itself and all satisfiying constraints
+        as well as the other candidates that would satisfy those.
+
+        Use uncover to undo the changes made by this operation.
+        """
+        self.__cover_column(self._column[row_ref.node])
+        right = self._right
+        node = right[row_ref.node]
+        while node != row_ref.node:
+            self.__cover_column(self._column[node])
+            node = right[node]
+        self._history.append((row_ref, True))
+
+    def uncover(self):
+        """Reverts the changes done by the last cover or eliminate operation"""
+        row_ref, covered = self._history.pop()
+        if not covered:
+            self.__restore(row_ref)
+            return row_ref
+        left = self._left
+        node = left[row_ref.node]
+        while node != row_ref.node:
+            self.__uncover_column(self._column[node])
+            node = left[node]
+        self.__uncover_column(self._column[row_ref.node])
+        return row_ref
+
+    def __restore(self, row_ref):
+        up, down, left = self._up, self._down, self._left
+        size, columns = self._size, self._column
+        node = row_ref.node
+        while True:
+            node = left[node]
+            size[columns[node]] += 1
+            down[up[node]] = node
+            up[down[node]] = node
+            if node == row_ref.node:
+                break
+
+    def reset(self):
+        """Reverts all cover operations restoring the initial state of the matrix"""
+        while self._history:
+            self.uncover()
+
+    def __cover_column(self, column):
+        left, right, up, down = self._left, self._right, self._up, self._down
+        size, columns = self._size, self._column
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        row = down[column]
+        while row != column:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[columns[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def __uncover_column(self, column):
+        left, right, up, down = self._left, self._right, self._up, self._down
+        size, columns = self._size, self._column
+        row = up[column]
+        while row != column:
+            node = left[row]
+            while node != row:
+                size[columns[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[column]] = column
+        left[right[column]] = column
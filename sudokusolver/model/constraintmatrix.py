@@ -1,8 +1,5 @@
 from collections import defaultdict
-from operator import attrgetter
 from .node import Node
-from .iterators import ColumnIterator
-from .iterators import RowIterator
 from .node import ColumnReferenceNode
 from .node import RowReferenceNode
 from .node import MatrixHeadReferenceNode
@@ -20,6 +17,13 @@ class ConstraintMatrix(object):
     Those ReferenceNodes can be accessed through the MatrixHeadReferenceNode
     which points on its right to the first ColumnReferenceNode
     and on its bottom to the first RowRefereneNode of the matrix.
+
+    The columns not covered yet are kept in buckets by their size, each bucket
+    being a bitset of the columns in their order. Covering and uncovering moves the
+    columns between the buckets, so that the column with the fewest candidates
+    is the lowest bit of the first non empty bucket instead of scanning all columns.
+    The buckets are filled by the first choice of a column only, so that building,
+    covering the fixed candidates and resetting the matrix don't maintain them.
     """
     def __init__(self):
         self.__history = []
@@ -27,7 +31,70 @@ class ConstraintMatrix(object):
         # accessible by candidate and constraint
         self.__col_ref_nodes = defaultdict(None)
         self.__row_ref_nodes = defaultdict(None)
-        self.__covered_constraint = []
+        # the ColumnReferenceNodes by the index of their bit and the buckets by size
+        # up to the size of the largest column
+        self.__indexed_columns = []
+        self.__buckets = None
+        self.__max_size = 0
+
+    @classmethod
+    def from_incidence(cls, rows, constraints=()) -> 'ConstraintMatrix':
+        """
+        Creates a matrix from a sequence of candidates and their constraints
+        in one linear pass.
+        In contrast to add, the last nodes of every row and column are tracked
+        while building so that no row or column has to be walked through.
+
+        Args:
+            rows: iterable of tuples (candidate, covered_constraints)
+            constraints: constraints whose columns are created first in the given order,
+                even if no row covers them
+
+        Returns:
+            the created ConstraintMatrix
+        """
+        matrix = cls()
+        col_ref_nodes = matrix.__col_ref_nodes
+        row_ref_nodes = matrix.__row_ref_nodes
+        last_column_ref_node = last_row_ref_node = matrix.__entry
+        # last node of each column accessible by constraint
+        last_column_nodes = {}
+        for constraint in constraints:
+            col_ref_node = ColumnReferenceNode(constraint)
+            col_ref_nodes[constraint] = last_column_nodes[constraint] = col_ref_node
+            matrix.__index_column(col_ref_node)
+            last_column_ref_node.right = col_ref_node
+            col_ref_node.left = last_column_ref_node
+            last_column_ref_node = col_ref_node
+        for candidate, covered_constraints in rows:
+            row_ref_node = last_row_node = None
+            for constraint in covered_constraints:
+                if row_ref_node is None:
+                    row_ref_node = last_row_node = RowReferenceNode(candidate)
+                    row_ref_nodes[candidate] = row_ref_node
+                    last_row_ref_node.bottom = row_ref_node
+                    row_ref_node.top = last_row_ref_node
+                    last_row_ref_node = row_ref_node
+                col_ref_node = col_ref_nodes.get(constraint)
+                if col_ref_node is None:
+                    col_ref_node = ColumnReferenceNode(constraint)
+                    col_ref_nodes[constraint] = col_ref_node
+                    matrix.__index_column(col_ref_node)
+                    last_column_ref_node.right = col_ref_node
+                    col_ref_node.left = last_column_ref_node
+                    last_column_ref_node = col_ref_node
+                    last_column_node = col_ref_node
+                else:
+                    last_column_node = last_column_nodes[constraint]
+                node = Node(candidate, constraint, row_ref_node, col_ref_node)
+                last_column_node.bottom = node
+                node.top = last_column_node
+                last_row_node.right = node
+                node.left = last_row_node
+                last_column_nodes[constraint] = last_row_node = node
+                col_ref_node.size += 1
+        matrix.__max_size = max((column.size for column in col_ref_nodes.values()), default=0)
+        return matrix
 
     def add(self, candidate=None, covered_constraints=[]):
         """
@@ -41,10 +108,29 @@ class ConstraintMatrix(object):
         for constraint in covered_constraints:
             self.__append(candidate, constraint)
 
+    def get_candidate(self, candidate):
+        """
+        Returns the RowReferenceNode of the given candidate
+        or None if the matrix doesn't contain it.
+        """
+        return self.__row_ref_nodes.get(candidate)
+
+    def get_constraint(self, constraint):
+        """
+        Returns the ColumnReferenceNode of the given constraint
+        or None if the matrix doesn't contain it.
+        """
+        return self.__col_ref_nodes.get(constraint)
+
     def __get_unsatisfied_constraint_column(self):
-        constraints = [column_ref_node
-                       for column_ref_node in self.__entry.get_column_ref_node_iterator()]
-        return min(constraints, key=attrgetter('size'))
+        # ties are broken by the order of the columns,
+        # an empty column is found at once letting the search fail immediately
+        if self.__buckets is None:
+            self.__fill_buckets()
+        for bucket in self.__buckets:
+            if bucket:
+                return self.__indexed_columns[(bucket & -bucket).bit_length() - 1]
+        return None
 
     def has_satisfied_all_constraints(self) -> bool:
         """Returns True of all contraints has been satisfied, otherwise False"""
@@ -66,6 +152,63 @@ class ConstraintMatrix(object):
         candidates = [node.row_ref_node for node in constraint]
         return candidates
 
+    def choose_constraint(self) -> ColumnReferenceNode:
+        """
+        Returns the ColumnReferenceNode(constraint) with the fewest candidates left
+        or None if all constraints have been satisfied.
+        """
+        if self.has_satisfied_all_constraints():
+            return None
+        return self.__get_unsatisfied_constraint_column()
+
+    @staticmethod
+    def iter_candidates(constraint):
+        """
+        Lazily iterates through the RowReferenceNodes(candidates) fulfilling the given
+        ColumnReferenceNode(constraint).
+        The iteration may be continued after covering a returned candidate
+        as long as it has been uncovered again.
+        """
+        node = constraint.bottom
+        while node:
+            yield node.row_ref_node
+            node = node.bottom
+
+    def iter_constraints(self):
+        """Lazily iterates through the ColumnReferenceNodes(constraints) not satisfied yet"""
+        node = self.__entry.right
+        while node:
+            yield node
+            node = node.right
+
+    @staticmethod
+    def size_of(constraint) -> int:
+        """Returns the amount of candidates left fulfilling the ColumnReferenceNode(constraint)"""
+        return constraint.size
+
+    @staticmethod
+    def get_constraints(candidate) -> list:
+        """Returns the ColumnReferenceNodes(constraints) fulfilled by the RowReferenceNode(candidate)"""
+        return [node.column_ref_node for node in candidate]
+
+    @staticmethod
+    def is_satisfied(constraint) -> bool:
+        """Returns True if the ColumnReferenceNode(constraint) has been covered, otherwise False"""
+        return constraint.left.right is not constraint
+
+    @staticmethod
+    def is_available(candidate) -> bool:
+        """Returns True if the RowReferenceNode(candidate) is still part of the matrix,
+        otherwise False"""
+        return candidate.top.bottom is candidate
+
+    def eliminate(self, row_ref_node):
+        """Removes the candidate from the matrix without covering any constraint.
+
+        Use uncover to undo the changes made by this operation.
+        """
+        self.__history.append(([], self.__cover_rows([row_ref_node]), []))
+
     def cover(self, row_ref_node):
         """Covers the candidate itself and all satisfiying constraints
         as well as the other candidates that would satisfy those.
@@ -88,9 +231,12 @@ class ConstraintMatrix(object):
         # disconnects also reference nodes from their neighbours
         removed_row_nodes = self.__cover_rows(row_ref_nodes)  # remove columns
         removed_column_nodes = self.__cover_columns(column_ref_nodes)
+        buckets = self.__buckets
+        if buckets is not None:
+            for column_ref_node in column_ref_nodes:
+                buckets[column_ref_node.size] ^= column_ref_node.bit
 
         self.__history.append((column_ref_nodes, removed_row_nodes, removed_column_nodes))
-        self.__covered_constraint = self.__covered_constraint + column_ref_nodes
         return row_ref_nodes, column_ref_nodes
 
     def uncover(self):
@@ -98,14 +244,20 @@ class ConstraintMatrix(object):
         column_ref_nodes, removed_row_nodes, removed_column_nodes = self.__history.pop()
 
         self.__uncover_columns(removed_column_nodes)
+        buckets = self.__buckets
+        if buckets is not None:
+            for column_ref_node in column_ref_nodes:
+                buckets[column_ref_node.size] |= column_ref_node.bit
         self.__uncover_rows(removed_row_nodes)
 
-        self.__covered_constraint = \
-            [c for c in self.__covered_constraint
-             if c not in column_ref_nodes]
-
         return removed_row_nodes, removed_column_nodes
 
+    def reset(self):
+        """Reverts all cover operations restoring the initial state of the matrix"""
+        self.__buckets = None
+        while self.__history:
+            self.uncover()
+
     @property
     def head_ref_node(self) -> MatrixHeadReferenceNode:
         """Returns the MatrixHeadReferenceNode.
@@ -114,57 +266,93 @@ class ConstraintMatrix(object):
 
     @staticmethod
     def __cover_columns(column_ref_nodes):
+        # nodes are disconnected directly instead of using Node.disconnect
+        # since this is the hot path of the search
         removed_column_nodes = []
-        for ref_node in column_ref_nodes:
-            for node in ColumnIterator(ref_node):
-                Node.disconnect(node, how='vertically')
+        for node in column_ref_nodes:
+            while node:
+                left, right = node.left, node.right
+                if left:
+                    left.right = right
+                if right:
+                    right.left = left
                 removed_column_nodes.append(node)
+                node = node.bottom
 
         return removed_column_nodes
 
     def __cover_rows(self, row_ref_nodes):
+        buckets = self.__buckets
         removed_row_nodes = []
-        for ref_node in row_ref_nodes:
-            for node in RowIterator(ref_node):
-                Node.disconnect(node, how='horizontally')
+        for node in row_ref_nodes:
+            while node:
+                top, bottom = node.top, node.bottom
+                if top:
+                    top.bottom = bottom
+                if bottom:
+                    bottom.top = top
                 removed_row_nodes.append(node)
-                self.__col_ref_nodes[node.candidate].size -= 1
+                column_ref_node = node.column_ref_node
+                if column_ref_node:
+                    size = column_ref_node.size - 1
+                    column_ref_node.size = size
+                    if buckets is not None:
+                        # moves the column into the bucket of its new size
+                        bit = column_ref_node.bit
+                        buckets[size + 1] ^= bit
+                        buckets[size] |= bit
+                node = node.right
 
         return removed_row_nodes
 
     def __uncover_rows(self, removed_row_nodes):
-        if removed_row_nodes:
-            for node in removed_row_nodes:
-                Node.connect(node.top, node, how='vertically')
-                Node.connect(node, node.bottom, how='vertically')
-                self.__col_ref_nodes[node.candidate].size += 1
+        buckets = self.__buckets
+        for node in removed_row_nodes:
+            if node.top:
+                node.top.bottom = node
+            if node.bottom:
+                node.bottom.top = node
+            column_ref_node = node.column_ref_node
+            if column_ref_node:
+                size = column_ref_node.size + 1
+                column_ref_node.size = size
+                if buckets is not None:
+                    bit = column_ref_node.bit
+                    buckets[size - 1] ^= bit
+                    buckets[size] |= bit
 
     @staticmethod
     def __uncover_columns(removed_column_nodes):
-        if removed_column_nodes:
-            for node in removed_column_nodes:
-                Node.connect(node.left, node, how='horizontally')
-                Node.connect(node, node.right, how='horizontally')
-
-    def __get_next_constraint(self):
-        for c in self.__entry.get_column_ref_node_iterator():
-            if c not in self.__covered_constraint:
-                return c
-        return None
+        for node in removed_column_nodes:
+            if node.left:
+                node.left.right = node
+            if node.right:
+                node.right.left = node
 
     @staticmethod
     def __get_covered_rows(column_ref_nodes):
-        seen = []
+        # keyed by identity since comparing nodes compares their labels
+        seen = {}
         for column_ref_node in column_ref_nodes:
             for node in column_ref_node:
-                if node.row_ref_node not in seen:
-                    seen.append(node.row_ref_node)
-        return seen
+                seen.setdefault(id(node.row_ref_node), node.row_ref_node)
+        return list(seen.values())
 
     @staticmethod
     def __get_covered_columns(row_ref_node):
         return [node.column_ref_node for node in row_ref_node]
 
+    def __index_column(self, col_ref_node):
+        col_ref_node.bit = 1 << len(self.__indexed_columns)
+        self.__indexed_columns.append(col_ref_node)
+
+    def __fill_buckets(self):
+        # sorts the columns not covered into the buckets of their sizes
+        buckets = [0] * (self.__max_size + 1)
+        for column in self.iter_constraints():
+            buckets[column.size] |= column.bit
+        self.__buckets = buckets
+
     def __append(self, candidate, covered_constraint):
         col_ref_node = self.__col_ref_nodes.get(covered_constraint)
         row_ref_node = self.__row_ref_nodes.get(candidate)
@@ -178,6 +366,7 @@ class ConstraintMatrix(object):
         # add node to the column_map if not defined yet
         if not col_ref_node:
             self.__col_ref_nodes[covered_constraint] = last_column_node
+            self.__index_column(last_column_node)
             last = self.__entry.get_last_column_ref_node()
             if last is not last_column_node:
                 Node.connect(last, last_column_node, how='horizontally')
@@ -194,7 +383,6 @@ class ConstraintMatrix(object):
                     self.__col_ref_nodes[covered_constraint])
         Node.connect(last_column_node, node, how='vertically')
         Node.connect(last_row_node, node, how='horizontally')
-        self.__col_ref_nodes[node.candidate] = node.column_ref_node
-
-        if node.column_ref_node:
-            node.column_ref_node.size += 1
+        node.column_ref_node.size += 1
+        self.__max_size = max(self.__max_size, node.column_ref_node.size)
+        self.__buckets = None
@@ -93,6 +93,8 @@ class ColumnReferenceNode(Node):
     def __init__(self, covered_constraint):
         super().__init__('_', covered_constraint, None, None)
         self.size = 0
+        # bit of the column in the size buckets of its matrix
+        self.bit = 0
 
     def __iter__(self):
         return iter(ColumnIterator(self.bottom))
@@ -0,0 +1,190 @@
+"""
+Logical constraint propagation applied to a constraint matrix
+before and during the search of the Algorithm-X.
+
+The techniques are formulated on the exact cover problem only,
+hence they work with every rule description.
+Applied to sudoku they correspond to the well known solving techniques:
+
+* ``singles``: naked and hidden singles,
+  a constraint satisfied by a single candidate only forces this candidate
+* ``locked``: locked candidates (pointing and claiming),
+  if all candidates of a constraint satisfy another constraint too,
+  the other candidates of the latter are eliminated
+* ``pairs``: naked and hidden pairs,
+  two constraints satisfied by two candidates each are examined together
+"""
+from collections import defaultdict
+
+TECHNIQUES = ('singles', 'locked', 'pairs')
+# the other techniques cost more time at each node than the search nodes they save
+DEFAULT_TECHNIQUES = ('singles', )
+
+# constraints with more candidates hardly ever share another constraint
+MAX_LOCKED_SIZE = 3
+
+
+class Propagator(object):
+    """
+    Applies the selected techniques on a matrix until none of them makes any progress.
+
+    The hits of each technique are counted in ``hits``:
+    the forced candidates by ``singles`` and the eliminated candidates by the others.
+
+    Args:
+        techniques: names of the techniques to be applied (see TECHNIQUES),
+            by default the singles only
+        at_each_node: if True the search propagates again after covering each candidate,
+            otherwise only once before the search starts
+    """
+
+    def __init__(self, techniques=DEFAULT_TECHNIQUES, at_each_node=True):
+        unknown = set(techniques) - set(TECHNIQUES)
+        if unknown:
+            raise ValueError('Unknown techniques {}'.format(', '.join(sorted(unknown))))
+        # applied in the order of their costs
+        self.techniques = tuple(technique for technique in TECHNIQUES if technique in techniques)
+        self.at_each_node = at_each_node
+        self.hits = dict.fromkeys(TECHNIQUES, 0)
+
+    def propagate(self, matrix, solution) -> tuple:
+        """
+        Covers the forced candidates and eliminates the impossible ones
+        until no technique makes any progress.
+        The labels of the forced candidates are appended to the solution.
+
+        Args:
+            matrix: ConstraintMatrix or ArrayConstraintMatrix
+            solution: list of the candidates covered so far
+
+        Returns:
+            tuple of the amount of operations done on the matrix,
+            each of them reverted by one call of its uncover method,
+            and False if a contradiction has been found, otherwise True
+        """
+        operations = 0
+        progress = True
+        while progress and not matrix.has_satisfied_all_constraints():
+            progress = False
+            for technique in self.techniques:
+                applied, consistent = getattr(self, '_apply_' + technique)(matrix, solution)
+                operations += applied
+                self.hits[technique] += applied
+                if not consistent:
+                    return operations, False
+                if applied:
+                    # the cheaper techniques are tried first again
+                    progress = True
+                    break
+        return operations, True
+
+    @staticmethod
+    def _apply_singles(matrix, solution):
+        singles = []
+        for constraint in matrix.iter_constraints():
+            size = matrix.size_of(constraint)
+            if size == 0:
+                return 0, False
+            if size == 1:
+                singles.append(constraint)
+        covered = 0
+        for constraint in singles:
+            # already satisfied by the candidate of another single
+            if matrix.is_satisfied(constraint):
+                continue
+            if matrix.size_of(constraint) == 0:
+                return covered, False
+            candidate = next(matrix.iter_candidates(constraint))
+            matrix.cover(candidate)
+            solution.append(candidate.candidate)
+            covered += 1
+        return covered, True
+
+    @staticmethod
+    def _apply_locked(matrix, solution):
+        eliminated = 0
+        for constraint in list(matrix.iter_constraints()):
+            size = matrix.size_of(constraint)
+            if size == 0:
+                return eliminated, False
+            if size == 1 or size > MAX_LOCKED_SIZE:
+                continue
+            candidates = list(matrix.iter_candidates(constraint))
+            shared = set(matrix.get_constraints(candidates[0]))
+            for candidate in candidates[1:]:
+                shared.intersection_update(matrix.get_constraints(candidate))
+            shared.discard(constraint)
+            if not shared:
+                continue
+            members = set(map(id, candidates))
+            for other in shared:
+                for candidate in list(matrix.iter_candidates(other)):
+                    if id(candidate) not in members:
+                        matrix.eliminate(candidate)
+                        eliminated += 1
+        return eliminated, True
+
+    @staticmethod
+    def _apply_pairs(matrix, solution):
+        pairs = []
+        for constraint in matrix.iter_constraints():
+            size = matrix.size_of(constraint)
+            if size == 0:
+                return 0, False
+            if size == 2:
+                pairs.append(constraint)
+        rows = {}
+        constraints_of = {}
+        by_constraint = defaultdict(list)
+        for pair in pairs:
+            rows[pair] = list(matrix.iter_candidates(pair))
+            for candidate in rows[pair]:
+                if id(candidate) not in constraints_of:
+                    constraints_of[id(candidate)] = set(matrix.get_constraints(candidate))
+                for constraint in constraints_of[id(candidate)]:
+                    by_constraint[constraint].append(pair)
+        for index, first in enumerate(pairs):
+            # only pairs whose candidates exclude each other can eliminate
+            # more candidates than the locked candidates technique
+            neighbours = {pair
+                          for candidate in rows[first]
+                          for constraint in constraints_of[id(candidate)]
+                          for pair in by_constraint[constraint]}
+            for second in pairs[index + 1:]:
+                if second not in neighbours:
+                    continue
+                combinations = [
+                    (first_candidate, second_candidate)
+                    for first_candidate in rows[first]
+                    for second_candidate in rows[second]
+                    if first_candidate is second_candidate or
+                    constraints_of[id(first_candidate)].isdisjoint(
+                        constraints_of[id(second_candidate)])]
+                if not combinations:
+                    return 0, False
+                eliminated = Propagator.__eliminate_outside(
+                    matrix, combinations, constraints_of)
+                if eliminated:
+                    # the collected candidates are outdated now
+                    return eliminated, True
+        return 0, True
+
+    @staticmethod
+    def __eliminate_outside(matrix, combinations, constraints_of):
+        # the constraints satisfied by every combination are satisfied by one of
+        # the combined candidates, hence all their other candidates are impossible
+        shared = None
+        members = set()
+        for combination in combinations:
+            satisfied = set()
+            for candidate in combination:
+                satisfied.update(constraints_of[id(candidate)])
+                members.add(id(candidate))
+            shared = satisfied if shared is None else shared & satisfied
+        eliminated = 0
+        for constraint in shared:
+            for candidate in list(matrix.iter_candidates(constraint)):
+                if id(candidate) not in members:
+                    matrix.eliminate(candidate)
+                    eliminated += 1
+        return eliminated
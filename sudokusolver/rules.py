@@ -10,64 +10,297 @@ you have to pass it a module providing following methods:
     * get_all_candidates
     * get_all_constraints
     * get_all_satisfied_constraints
-"""
-from collections import defaultdict
-from itertools import chain
 
+The functions of this module describe the standard 9x9 sudoku.
+Use ``for_size`` to retrieve the description of larger sudokus, e.g. 16x16 or 25x25.
 
-def _get_row_column_constraints():
-    for row in range(1, 10):
-        for column in range(1, 10):
-            yield 'R{}C{}'.format(row, column)
+Internally the solver identifies candidates and constraints by integers
+(see IntegerRules), the strings are only en- and decoded by Rules
+when passed to or returned by the solver.
+"""
 
+STANDARD_BOX_SIZE = 3
 
-def _get_row_number_constraints():
-    for row in range(1, 10):
-        for number in range(1, 10):
-            yield 'R{}#{}'.format(row, number)
+_CONSTRAINT_FORMATS = ('R{}C{}', 'R{}#{}', 'C{}#{}', 'B{}#{}')
 
 
-def _get_column_number_constraints():
-    for column in range(1, 10):
-        for number in range(1, 10):
-            yield 'C{}#{}'.format(column, number)
+class IntegerRules(object):
+    """
+    Rule description of sudoku puzzles (see Rules) identifying
+    candidates and constraints by integers instead of strings.
 
+    The id of a candidate is ``size ** 2 * row + size * column + number``
+    whereas row, column and number are counted from 0 and ``size`` is ``box_size ** 2``,
+    e.g. ``81 * row + 9 * column + number`` for standard sudokus.
+    The constraints are numbered from 0 in the order of Rules.get_all_constraints,
+    e.g. from 0 up to 323 for standard sudokus.
 
-def _get_block_number_constraints():
-    for block in range(1, 10):
-        for number in range(1, 10):
-            yield 'B{}#{}'.format(block, number)
+    The constraints of each candidate and the candidates of each constraint
+    are looked up in tables built on the first call.
 
+    Args:
+        box_size: the amount of rows and columns of a block
+    """
 
-def _get_satisfied_row_column_constraint(candidate):
-    return candidate[0:-2]
+    def __init__(self, box_size: int):
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self.__constraints_of = None
+        self.__candidates_of = None
+
+    def __repr__(self):
+        return 'IntegerRules({})'.format(self.box_size)
+
+    def get_all_candidates(self) -> range:
+        """Returns the ids of all candidates"""
+        return range(self.size ** 3)
+
+    def get_all_constraints(self) -> range:
+        """Returns the ids of all constraints"""
+        return range(4 * self.size ** 2)
+
+    def get_all_satisfied_constraints(self, *candidates: int) -> list:
+        """
+        Returns the ids of all constraints satisfied by the candidates:
+        the row-column, row-number, column-number and block-number constraint of each.
+
+        Args:
+            candidates: ids of the candidates
+
+        Returns:
+            list of ids of fulfilled constraints
+
+        Raises:
+            ValueError: if an id doesn't identify a candidate
+        """
+        constraints_of = self.__constraints_of or self.__build_tables()[0]
+        res = []
+        try:
+            for candidate in candidates:
+                res += constraints_of[candidate]
+        except (IndexError, TypeError):
+            raise ValueError('Invalid candidate {}'.format(candidate)) from None
+        # negative ids would be looked up from the end of the table
+        if candidates and min(candidates) < 0:
+            raise ValueError('Invalid candidate {}'.format(min(candidates)))
+        return res
+
+    def get_satisfying_candidates(self, constraint: int) -> tuple:
+        """
+        Returns the ids of all candidates satisfying the constraint.
+
+        Raises:
+            ValueError: if the id doesn't identify a constraint
+        """
+        candidates_of = self.__candidates_of or self.__build_tables()[1]
+        if not 0 <= constraint < len(candidates_of):
+            raise ValueError('Invalid constraint {}'.format(constraint))
+        return candidates_of[constraint]
+
+    def __build_tables(self):
+        box_size, size = self.box_size, self.size
+        area = size * size
+        constraints_of = []
+        candidates_of = [[] for _ in range(4 * area)]
+        for candidate in range(size * area):
+            cell, number = divmod(candidate, size)
+            row, column = divmod(cell, size)
+            block = row // box_size * box_size + column // box_size
+            constraints = (cell,
+                           area + row * size + number,
+                           2 * area + column * size + number,
+                           3 * area + block * size + number)
+            constraints_of.append(constraints)
+            for constraint in constraints:
+                candidates_of[constraint].append(candidate)
+        self.__candidates_of = tuple(map(tuple, candidates_of))
+        self.__constraints_of = tuple(constraints_of)
+        return self.__constraints_of, self.__candidates_of
+
+
+class Rules(object):
+    """
+    Rule description of sudoku puzzles made of ``box_size`` x ``box_size`` blocks,
+    each of ``box_size`` x ``box_size`` cells, e.g. the box size of
+    the standard 9x9 sudoku is 3 and the one of a 16x16 sudoku is 4.
+    Rows, columns, blocks and numbers are counted from 1 up to ``box_size ** 2``
+    and written in decimal, so candidates look like ``R12C3#16``.
 
+    Use ``for_size`` to retrieve the shared instance of a box size.
 
-def _get_satisfied_row_number_constraint(candidate):
-    return ''.join((candidate[0:2], candidate[4:]))
+    Besides, the rules en- and decode the strings from and to the integer ids
+    used by the solver (see IntegerRules).
 
+    Args:
+        box_size: the amount of rows and columns of a block
+    """
 
-def _get_satisfied_column_number_constraint(candidate):
-    return ''.join((candidate[2:4], candidate[4:]))
+    def __init__(self, box_size: int):
+        if box_size < 1:
+            raise ValueError('Invalid box size {}'.format(box_size))
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self.ids = IntegerRules(box_size)
+        self.__labels = None
+
+    def __repr__(self):
+        return 'Rules({})'.format(self.box_size)
+
+    def __reduce__(self):
+        # unpickled by for_size, e.g. in the worker processes of solver.solve_many,
+        # to share the instance and thereby the matrix template
+        return for_size, (self.box_size, )
+
+    def get_all_candidates(self) -> list:
+        """
+        Returns all possible numbers for each cell as strings in the format of
+        ``R{rowNumber}C{columnNumber}#{number}`` - also referred as candidate.
+
+        Returns:
+            list of strings of all possible candidates
+        """
+        return list(self.__get_labels()[0])
+
+    def get_all_constraints(self) -> list:
+        """
+        Returns all constraints as strings (see get_all_satisfied_constraints).
+
+        Returns:
+            list of strings of all constraints
+        """
+        return list(self.__get_labels()[1])
+
+    def get_all_satisfied_constraints(self, *candidates: str) -> list:
+        """
+        Returns all satisfied constraints by the candidates as strings in following format:
+
+        * ``R{number}C{number}`` - describes one of the row-column constraints, e.g. ``R1C1``.
+        * ``R{number}#{number}`` - describes one of the row constraints, e.g. ``R1#1``.
+        * ``C{number}#{number}`` - describes one of the column constraints, e.g. ``C1#1``.
+        * ``B{number}#{number}`` - describes one of the block constraints, e.g. ``B1#1``.
+
+        Args:
+            candidates: candidates as strings in form of ``R{rowNumber}C{columnNumber}#{number}``
+
+        Returns:
+            list of strings of fulfilled constraints
+        """
+        constraints = self.__get_labels()[1]
+        return [constraints[constraint]
+                for constraint in self.ids.get_all_satisfied_constraints(
+                    *map(self.encode, candidates))]
+
+    def get_satisfying_candidates(self, constraint: str) -> list:
+        """
+        Returns all candidates satisfying the constraint as strings.
+
+        Raises:
+            ValueError: if the string doesn't describe a constraint of these rules
+        """
+        candidates = self.__get_labels()[0]
+        return [candidates[candidate]
+                for candidate in self.ids.get_satisfying_candidates(
+                    self.encode_constraint(constraint))]
+
+    def encode(self, candidate: str) -> int:
+        """
+        Returns the id of a candidate (see IntegerRules).
+
+        Args:
+            candidate: string in form of ``R{rowNumber}C{columnNumber}#{number}``
+
+        Raises:
+            ValueError: if the string doesn't describe a candidate of these rules
+        """
+        try:
+            return self.__get_labels()[2][candidate]
+        except (KeyError, TypeError):
+            raise ValueError('Invalid candidate {}'.format(candidate)) from None
+
+    def decode(self, candidate: int) -> str:
+        """Returns the string in form of ``R{rowNumber}C{columnNumber}#{number}``
+        of a candidate id (see IntegerRules)."""
+        return self.__get_labels()[0][candidate]
+
+    def encode_constraint(self, constraint: str) -> int:
+        """
+        Returns the id of a constraint (see IntegerRules).
+
+        Raises:
+            ValueError: if the string doesn't describe a constraint of these rules
+        """
+        try:
+            return self.__get_labels()[3][constraint]
+        except (KeyError, TypeError):
+            raise ValueError('Invalid constraint {}'.format(constraint)) from None
+
+    def decode_constraint(self, constraint: int) -> str:
+        """Returns the string of a constraint id (see get_all_satisfied_constraints)"""
+        return self.__get_labels()[1][constraint]
+
+    def encode_grid(self, cells: bytes) -> list:
+        """
+        Returns the candidate ids of a puzzle given as one number per cell
+        row by row whereas empty cells are 0, e.g. 81 bytes for standard sudokus.
+
+        Raises:
+            ValueError: if the cells don't describe a puzzle of these rules
+        """
+        size = self.size
+        if len(cells) != size * size:
+            raise ValueError('Expected {} cells but got {}'.format(size * size, len(cells)))
+        if max(cells, default=0) > size:
+            raise ValueError('Invalid number {}'.format(max(cells)))
+        return [cell * size + number - 1 for cell, number in enumerate(cells) if number]
+
+    def decode_grid(self, candidates) -> bytes:
+        """Returns the numbers of the cells row by row (see encode_grid)
+        whereas the cells without candidate are 0"""
+        cells = bytearray(self.size * self.size)
+        for candidate in candidates:
+            cell, number = divmod(candidate, self.size)
+            cells[cell] = number + 1
+        return bytes(cells)
+
+    def __get_labels(self):
+        # the strings of the candidates and constraints ordered by their ids
+        # and the ids by the strings, built on the first call
+        if self.__labels is None:
+            values = [str(value) for value in range(1, self.size + 1)]
+            candidates = tuple('R{}C{}#{}'.format(row, column, number)
+                               for row in values for column in values for number in values)
+            constraints = tuple(constraint_format.format(first, second)
+                                for constraint_format in _CONSTRAINT_FORMATS
+                                for first in values for second in values)
+            self.__labels = (candidates, constraints,
+                             {candidate: i for i, candidate in enumerate(candidates)},
+                             {constraint: i for i, constraint in enumerate(constraints)})
+        return self.__labels
+
+
+_rules = {}
+
+
+def for_size(box_size: int) -> Rules:
+    """
+    Returns the rule description of sudoku puzzles with blocks of
+    ``box_size`` x ``box_size`` cells, e.g. 4 for 16x16 puzzles.
+    The description can be passed to the solver as ``rule_description``.
+    The same instance is returned for the same box size, so that the solver
+    builds its constraint matrix only once.
 
+    Args:
+        box_size: the amount of rows and columns of a block
 
-def _get_satisfied_block_number_constraint(candidate):
-    row_index = int(candidate[1:2]) - 1
-    column_index = int(candidate[3:4]) - 1
-    block_index = (3 * (row_index // 3)) + (column_index // 3)
-    block = block_index + 1
-    return 'B{}#{}'.format(block, candidate[5:])
+    Returns:
+        the Rules of the box size
+    """
+    if box_size not in _rules:
+        _rules[box_size] = Rules(box_size)
+    return _rules[box_size]
 
 
-def _get_satisfying_values(predicate, constraint=None):
-    satisfied_constraints = defaultdict(list)
-    for value in get_all_candidates():
-        satisfied_constraint = predicate(value)
-        if satisfied_constraint:
-            satisfied_constraints[satisfied_constraint].append(value)
-    if constraint:
-        return satisfied_constraints[constraint]
-    return satisfied_constraints
+_standard = for_size(STANDARD_BOX_SIZE)
 
 
 def get_all_candidates() -> str:
@@ -79,12 +312,7 @@ def get_all_candidates() -> str:
     Returns:
         list of strings of all possible candidates
     """
-    result = []
-    for row in range(1, 10):
-        for column in range(1, 10):
-            for number in range(1, 10):
-                result.append('R{}C{}#{}'.format(row, column, number))
-    return result
+    return _standard.get_all_candidates()
 
 
 def get_all_satisfied_constraints(*candidates: str) -> list:
@@ -102,13 +330,21 @@ def get_all_satisfied_constraints(*candidates: str) -> list:
     Returns:
         list of strings of fulfilled constraints
     """
-    res = []
-    for p in candidates:
-        res += [_get_satisfied_row_column_constraint(p),
-                _get_satisfied_row_number_constraint(p),
-                _get_satisfied_column_number_constraint(p),
-                _get_satisfied_block_number_constraint(p)]
-    return res
+    return _standard.get_all_satisfied_constraints(*candidates)
+
+
+def get_satisfying_candidates(constraint: str) -> list:
+    """
+    Returns all candidates satisfying a constraint as strings
+    in the format of ``R{rowNumber}C{columnNumber}#{number}``.
+
+    Args:
+        constraint: constraint as string (see get_all_satisfied_constraints)
+
+    Returns:
+        list of strings of the satisfying candidates
+    """
+    return _standard.get_satisfying_candidates(constraint)
 
 
 def get_all_constraints() -> list:
@@ -123,6 +359,4 @@ def get_all_constraints() -> list:
     Returns
         list of strings of all constraints
     """
-    return chain(_get_row_column_constraints(), _get_row_number_constraints(),
-                 _get_column_number_constraints(),
-                 _get_block_number_constraints())
+    return _standard.get_all_constraints()
@@ -0,0 +1,441 @@
+"""
+HTTP server solving sudoku puzzles, based on the standard library only::
+
+    python3 -m sudokusolver serve --port 8080 -j 4
+
+    curl -d '..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..' \\
+        localhost:8080/solve
+    curl -d '{"puzzles": ["..71.439.9.53...", [0, 0, 7, 1, ...]]}' localhost:8080/solve
+    curl localhost:8080/metrics
+
+``POST /solve`` takes 9x9 puzzles as JSON object of a ``puzzle`` or a list of ``puzzles``,
+each a string of 81 characters (see importer.imp_line) or a list of 81 numbers
+(also as 9 rows) whereas empty cells are 0. Otherwise the body is taken as
+puzzles written one per line. The answer is a JSON object of the ``solution``
+or the ``solutions`` as strings of 81 digits, null for puzzles without solution.
+
+Puzzles arriving within a short window are solved together as micro-batch
+by a pool of workers started (and having built their matrix templates) in advance.
+The puzzles waiting for a worker are queued up to a limit, requests exceeding it are
+rejected by ``429 Too Many Requests`` immediately instead of piling up.
+
+``GET /metrics`` answers the counters, the queue depth, the recent throughput
+and histograms of the latencies and batch sizes in the Prometheus text format.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sudokusolver import importer
+from sudokusolver import solver
+
+DEFAULT_PORT = 8080
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_QUEUE = 4096
+MAX_BODY_SIZE = 1 << 20
+CELLS = 81
+# upper bounds of the buckets of the latency histogram in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# seconds of the past taken into account for the throughput
+THROUGHPUT_WINDOW = 10.0
+
+_TO_DIGITS = bytes.maketrans(bytes(range(10)), b'0123456789')
+
+
+class SolverServer(ThreadingHTTPServer):
+    """
+    Server answering the requests by the pool of workers, e.g. started on a free port
+    of localhost in the background::
+
+        with SolverServer(('127.0.0.1', 0)) as server:
+            server.start()
+            host, port = server.server_address
+            ...
+
+    Args:
+        address: tuple of the host and the port to listen on, port 0 for any free port
+        workers: amount of worker processes, by default one per CPU.
+            One worker solves the puzzles by a thread of the server process.
+        backend: ``dlx`` or ``bitmask`` (see solver.solve)
+        batch_size: maximal amount of puzzles sent to a worker at once
+        batch_window: seconds a puzzle waits for further puzzles to be batched with
+        max_queue: maximal amount of puzzles waiting for a worker,
+            requests exceeding it are rejected
+    """
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', DEFAULT_PORT), workers=None, backend='bitmask',
+                 batch_size=DEFAULT_BATCH_SIZE, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_queue=DEFAULT_MAX_QUEUE):
+        if backend not in solver.BACKENDS:
+            raise ValueError('Unknown backend {}'.format(backend))
+        workers = workers if workers else os.cpu_count() or 1
+        super().__init__(address, _RequestHandler)
+        self.metrics = _Metrics(batch_size)
+        if workers == 1:
+            executor = ThreadPoolExecutor(
+                1, initializer=solver.get_template if backend == 'dlx' else None)
+            solve_chunk = functools.partial(solver._solve_puzzles, rule_description=None,
+                                            backend=backend)
+        else:
+            executor = ProcessPoolExecutor(
+                workers, initializer=solver._init_worker, initargs=(None, backend))
+            solve_chunk = solver._solve_chunk
+        # all workers are started at once and build their templates before the first request
+        wait([executor.submit(_warm_up) for _ in range(workers)])
+        self.__executor = executor
+        self.__batcher = _Batcher(executor, solve_chunk, workers, batch_size, batch_window,
+                                  max_queue, self.metrics)
+        self.__thread = None
+
+    def solve(self, grids) -> list:
+        """
+        Solves the puzzles by the workers, waiting for their solutions.
+
+        Args:
+            grids: list of puzzles as bytes of one number per cell (see solver.solve)
+
+        Returns:
+            list of the solutions as bytes, empty for puzzles without solution
+
+        Raises:
+            Overloaded: if the queue can't take the puzzles
+        """
+        return [future.result() for future in self.__batcher.submit(grids)]
+
+    def start(self):
+        """Serves the requests by a background thread until the server is closed"""
+        self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def server_close(self):
+        """Stops serving, solves the queued puzzles and shuts the workers down"""
+        if self.__thread is not None:
+            self.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        super().server_close()
+        self.__batcher.close()
+        self.__executor.shutdown()
+
+
+class Overloaded(Exception):
+    """Raised if the queue of the puzzles waiting for a worker is full"""
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, **options):
+    """
+    Serves the requests until interrupted (see SolverServer for the options).
+    """
+    with SolverServer((host, port), **options) as server:
+        print('Serving on http://{}:{}'.format(*server.server_address[:2]), flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def parse_puzzles(body: bytes, content_type='') -> tuple:
+    """
+    Parses the body of a solve request.
+
+    Returns:
+        tuple of the puzzles as bytes and True if a single puzzle has been requested by JSON
+
+    Raises:
+        ValueError: if the body doesn't contain valid 9x9 puzzles
+    """
+    text = body.decode('latin-1').strip()
+    if not content_type.startswith('application/json') and not text.startswith('{'):
+        grids = list(importer.iter_puzzles(text.splitlines(), format='line'))
+        single = False
+    else:
+        try:
+            request = json.loads(text)
+        except ValueError as e:
+            raise ValueError('Invalid JSON: {}'.format(e)) from e
+        if not isinstance(request, dict) or ('puzzle' in request) == ('puzzles' in request):
+            raise ValueError('Expected an object of either a puzzle or a list of puzzles')
+        single = 'puzzle' in request
+        puzzles = [request['puzzle']] if single else request['puzzles']
+        if not isinstance(puzzles, list):
+            raise ValueError('Expected a list of puzzles')
+        grids = [_parse_puzzle(puzzle) for puzzle in puzzles]
+    for grid in grids:
+        if len(grid) != CELLS:
+            raise ValueError('Expected puzzles of {} cells but got {}'.format(CELLS, len(grid)))
+    return grids, single
+
+
+def _parse_puzzle(puzzle):
+    if isinstance(puzzle, str):
+        return next(importer.iter_puzzles([puzzle], format='line'), b'')
+    if isinstance(puzzle, list):
+        if puzzle and all(isinstance(row, list) for row in puzzle):
+            puzzle = [number for row in puzzle for number in row]
+        # booleans are integers to python but no numbers of JSON
+        if all(isinstance(number, int) and not isinstance(number, bool) and 0 <= number <= 9
+               for number in puzzle):
+            return bytes(puzzle)
+    raise ValueError('Invalid puzzle {!r}'.format(puzzle)[:100])
+
+
+def _to_digits(solution):
+    return solution.translate(_TO_DIGITS).decode('ascii') if solution else None
+
+
+def _warm_up():
+    # the initializer of the worker has built the template already
+    pass
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = 'sudokusolver'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self.__respond(HTTPStatus.OK, self.server.metrics.render().encode(),
+                           'text/plain; version=0.0.4')
+        elif self.path == '/health':
+            self.__respond(HTTPStatus.OK, b'ok\n', 'text/plain')
+        else:
+            self.__respond_error(HTTPStatus.NOT_FOUND, 'Unknown path {}'.format(self.path))
+
+    def do_POST(self):
+        if self.path != '/solve':
+            # the body isn't read
+            self.close_connection = True
+            self.__respond_error(HTTPStatus.NOT_FOUND, 'Unknown path {}'.format(self.path))
+            return
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # the end of the body is unknown
+            self.close_connection = True
+            self.__respond_error(HTTPStatus.BAD_REQUEST,
+                                 'Expected the length of the body as Content-Length')
+            return
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self.__respond_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                 'Requests are limited to {} bytes'.format(MAX_BODY_SIZE))
+            return
+        try:
+            grids, single = parse_puzzles(self.rfile.read(length),
+                                          self.headers.get('Content-Type', ''))
+        except ValueError as e:
+            self.__respond_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        try:
+            solutions = self.server.solve(grids)
+        except Overloaded as e:
+            self.server.metrics.reject()
+            self.__respond_error(HTTPStatus.TOO_MANY_REQUESTS, str(e), {'Retry-After': '1'})
+            return
+        except Exception as e:
+            # e.g. a worker process died
+            self.log_error('Solving failed: %r', e)
+            self.__respond_error(HTTPStatus.INTERNAL_SERVER_ERROR, 'Solving failed')
+            return
+        if single:
+            answer = {'solution': _to_digits(solutions[0])}
+        else:
+            answer = {'solutions': [_to_digits(solution) for solution in solutions]}
+        self.__respond(HTTPStatus.OK, json.dumps(answer).encode(), 'application/json')
+        self.server.metrics.answer(time.perf_counter() - start)
+
+    def log_request(self, code='-', size='-'):
+        # only errors are logged
+        pass
+
+    def __respond_error(self, status, message, headers=None):
+        self.__respond(status, json.dumps({'error': message}).encode(), 'application/json',
+                       headers)
+
+    def __respond(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Batcher(object):
+    # collects the puzzles of the requests into batches sent to the workers by a thread,
+    # at most two batches per worker are dispatched ahead like in solver.solve_many
+
+    def __init__(self, executor, solve_chunk, workers, batch_size, batch_window, max_queue,
+                 metrics):
+        self.executor = executor
+        self.solve_chunk = solve_chunk
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_queue = max_queue
+        self.metrics = metrics
+        # tuples of the puzzle, its future and the time it has been queued
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.dispatched = threading.BoundedSemaphore(2 * workers)
+        self.closed = False
+        self.thread = threading.Thread(target=self.__dispatch, daemon=True)
+        self.thread.start()
+
+    def submit(self, grids):
+        futures = [Future() for _ in grids]
+        with self.condition:
+            if self.closed:
+                raise Overloaded('The server is shutting down')
+            if len(self.queue) + len(grids) > self.max_queue:
+                raise Overloaded('{} puzzles are queued already'.format(len(self.queue)))
+            now = time.perf_counter()
+            self.queue.extend(zip(grids, futures, [now] * len(grids)))
+            self.metrics.queue_depth = len(self.queue)
+            self.condition.notify()
+        return futures
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def __dispatch(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.closed:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                # waits for further puzzles until the oldest one has waited long enough
+                deadline = self.queue[0][2] + self.batch_window
+                while len(self.queue) < self.batch_size and not self.closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+            # the queue fills up while all workers are busy
+            self.dispatched.acquire()
+            with self.condition:
+                batch = [self.queue.popleft()
+                         for _ in range(min(self.batch_size, len(self.queue)))]
+                self.metrics.queue_depth = len(self.queue)
+            future = self.executor.submit(self.solve_chunk, [grid for grid, _, _ in batch])
+            future.add_done_callback(functools.partial(self.__complete, batch))
+
+    def __complete(self, batch, future):
+        self.dispatched.release()
+        self.metrics.solve_batch(len(batch))
+        if future.exception() is not None:
+            for _, puzzle_future, _ in batch:
+                puzzle_future.set_exception(future.exception())
+            return
+        for (_, puzzle_future, _), solution in zip(batch, future.result()):
+            puzzle_future.set_result(solution)
+
+
+class _Histogram(object):
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def render(self, name):
+        # the buckets of the Prometheus text format are cumulative
+        lines = []
+        cumulated = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulated += count
+            lines.append('{}_bucket{{le="{}"}} {}'.format(name, bound, cumulated))
+        lines.append('{}_bucket{{le="+Inf"}} {}'.format(name, self.count))
+        lines.append('{}_sum {}'.format(name, self.sum))
+        lines.append('{}_count {}'.format(name, self.count))
+        return lines
+
+
+class _Metrics(object):
+
+    def __init__(self, batch_size):
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.requests = 0
+        self.rejected = 0
+        self.puzzles = 0
+        self.batches = 0
+        self.queue_depth = 0
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        # powers of two up to the maximal batch size
+        self.batch_size = _Histogram(sorted(
+            {2 ** exponent for exponent in range(batch_size.bit_length())
+             if 2 ** exponent < batch_size} | {batch_size}))
+        # the times and sizes of the latest batches to calculate the throughput
+        self.recent = deque()
+
+    def answer(self, latency):
+        with self.lock:
+            self.requests += 1
+            self.latency.observe(latency)
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def solve_batch(self, size):
+        now = time.perf_counter()
+        with self.lock:
+            self.puzzles += size
+            self.batches += 1
+            self.batch_size.observe(size)
+            self.recent.append((now, size))
+            self.__forget(now)
+
+    def render(self):
+        now = time.perf_counter()
+        with self.lock:
+            self.__forget(now)
+            window = min(THROUGHPUT_WINDOW, now - self.start) or THROUGHPUT_WINDOW
+            lines = [
+                '# TYPE sudokusolver_requests_total counter',
+                'sudokusolver_requests_total {}'.format(self.requests),
+                '# TYPE sudokusolver_rejected_total counter',
+                'sudokusolver_rejected_total {}'.format(self.rejected),
+                '# TYPE sudokusolver_puzzles_total counter',
+                'sudokusolver_puzzles_total {}'.format(self.puzzles),
+                '# TYPE sudokusolver_batches_total counter',
+                'sudokusolver_batches_total {}'.format(self.batches),
+                '# TYPE sudokusolver_queue_depth gauge',
+                'sudokusolver_queue_depth {}'.format(self.queue_depth),
+                '# TYPE sudokusolver_puzzles_per_second gauge',
+                'sudokusolver_puzzles_per_second {:.1f}'.format(
+                    sum(size for _, size in self.recent) / window),
+                '# TYPE sudokusolver_request_latency_seconds histogram']
+            lines += self.latency.render('sudokusolver_request_latency_seconds')
+            lines.append('# TYPE sudokusolver_batch_size histogram')
+            lines += self.batch_size.render('sudokusolver_batch_size')
+        return '\n'.join(lines) + '\n'
+
+    def __forget(self, now):
+        while self.recent and self.recent[0][0] < now - THROUGHPUT_WINDOW:
+            self.recent.popleft()
@@ -0,0 +1,165 @@
+"""
+Provides a session to solve a sudoku puzzle changed one cell at a time,
+e.g. by an interactive application.
+
+Instead of building or covering a matrix for each change,
+the session keeps its own matrix with the filled in cells covered.
+Placing a number covers its candidate, removing a number uncovers it again.
+"""
+from contextlib import closing
+
+from sudokusolver import solver
+from .model.constraintmatrix import ConstraintMatrix
+
+
+class SolverSession(object):
+    """
+    Holds a sudoku puzzle and answers questions about its current state.
+
+    The candidates are strings of the rule description
+    (e.g. ``R1C1#1``, see solver.solve), sudoku rules also accept their integer ids
+    but answer by strings.
+
+    Args:
+        fixed_candidates: the candidates filled in initially
+        rule_description: lookup for candidates and constraints of sudoku
+        matrix_type: class of the matrix to be used, by default the ConstraintMatrix
+
+    Raises:
+        ValueError: if a fixed candidate is unknown or contradicts another one
+    """
+
+    def __init__(self, fixed_candidates=(), rule_description=None, matrix_type=None):
+        self.__codec = solver._get_codec(rule_description)
+        self.__rule_description = solver._get_search_rules(rule_description)
+        self.__matrix = solver._create_matrix(
+            (), self.__rule_description, matrix_type or ConstraintMatrix)
+        # the placed candidates in the order of their covering
+        self.__placed = []
+        for candidate in fixed_candidates:
+            self.place(candidate)
+
+    @property
+    def placed(self) -> tuple:
+        """The candidates filled in currently"""
+        return self.__decode(self.__placed)
+
+    def place(self, candidate):
+        """
+        Fills in a number.
+
+        Args:
+            candidate: the number and its cell as candidate
+
+        Raises:
+            ValueError: if the candidate is unknown or contradicts a placed one
+        """
+        label = self.__encode(candidate)
+        row = self.__matrix.get_candidate(label)
+        if row is None:
+            raise ValueError('Unknown candidate {}'.format(candidate))
+        if not self.__matrix.is_available(row):
+            raise ValueError('Candidate {} contradicts the placed candidates'.format(candidate))
+        self.__matrix.cover(row)
+        self.__placed.append(label)
+
+    def remove(self, candidate):
+        """
+        Removes a filled in number.
+        The candidates placed after it are uncovered and covered again,
+        so removing the latest placed candidates is the fastest.
+
+        Args:
+            candidate: the number and its cell as candidate
+
+        Raises:
+            ValueError: if the candidate hasn't been placed
+        """
+        label = self.__encode(candidate)
+        if label not in self.__placed:
+            raise ValueError('Candidate {} has not been placed'.format(candidate))
+        index = self.__placed.index(label)
+        for _ in range(len(self.__placed) - index):
+            self.__matrix.uncover()
+        replaced = self.__placed[index + 1:]
+        del self.__placed[index:]
+        for label in replaced:
+            self.__matrix.cover(self.__matrix.get_candidate(label))
+            self.__placed.append(label)
+
+    def solve(self) -> tuple:
+        """
+        Returns the candidates completing the placed ones
+        or an empty list if there is no solution.
+        """
+        with closing(self.__search(1)) as solutions:
+            for solution in solutions:
+                return self.__decode(solution)
+        return []
+
+    def count_solutions(self, limit=None) -> int:
+        """
+        Counts the solutions of the current state.
+
+        Args:
+            limit: maximal amount of solutions to be counted, unlimited if None
+        """
+        with closing(self.__search(limit)) as solutions:
+            return sum(1 for _ in solutions)
+
+    def is_unique(self) -> bool:
+        """Returns True if the current state has exactly one solution, otherwise False"""
+        return self.count_solutions(2) == 1
+
+    def get_candidates(self, cell) -> tuple:
+        """
+        Returns the candidates of a cell not contradicting the placed candidates,
+        the placed candidate only if the cell has been filled in.
+
+        Args:
+            cell: the row-column constraint of the cell (e.g. ``R1C1``),
+                sudoku rules also accept its integer id
+
+        Raises:
+            ValueError: if the cell is unknown
+        """
+        constraint = cell
+        if self.__codec and isinstance(cell, str):
+            constraint = self.__codec.encode_constraint(cell)
+        column = self.__matrix.get_constraint(constraint)
+        if column is None:
+            raise ValueError('Unknown cell {}'.format(cell))
+        if not self.__matrix.is_satisfied(column):
+            return self.__decode([row.candidate for row in self.__matrix.iter_candidates(column)])
+        return self.__decode([
+            label for label in self.__placed
+            if constraint in self.__rule_description.get_all_satisfied_constraints(label)])
+
+    def __search(self, limit):
+        # yields up to limit solutions and reverts the covers of the search afterwards
+        search = solver._search(self.__matrix)
+        depth = count = 0
+        try:
+            for solution in search:
+                depth = len(solution)
+                count += 1
+                yield solution
+                if count == limit:
+                    break
+            else:
+                # an exhausted search has reverted its covers itself
+                depth = 0
+        finally:
+            search.close()
+            for _ in range(depth):
+                self.__matrix.uncover()
+
+    def __encode(self, candidate):
+        if self.__codec and isinstance(candidate, str):
+            return self.__codec.encode(candidate)
+        return candidate
+
+    def __decode(self, candidates):
+        if self.__codec:
+            return tuple(map(self.__codec.decode, candidates))
+        return tuple(candidates)
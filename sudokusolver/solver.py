@@ -1,11 +1,56 @@
 """
 Module used to solve sudoku puzzles.
+
+The matrix containing all candidates and constraints of a rule description
+is built only once per process (and thread) and kept as template.
+To solve a puzzle, the rows of its fixed candidates are covered in the template
+and all changes are reverted afterwards.
 """
+import functools
+import importlib
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from types import ModuleType
+
+from sudokusolver import bitmask
 from sudokusolver import rules
+from sudokusolver import tracing
+from .propagation import Propagator
 from .model.constraintmatrix import ConstraintMatrix
 
+BACKENDS = ('dlx', 'bitmask')
+# amount of search nodes after which the clock is read again to check a timeout
+BUDGET_CHECK_INTERVAL = 64
+# puzzles given as one number per cell
+GRID_TYPES = (bytes, bytearray, memoryview)
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised if solving a puzzle exceeds its timeout or maximal amount of search nodes.
 
-def solve(fixed_candidates, rule_description=None) -> list:
+    Attributes:
+        nodes: amount of search nodes until the search has been stopped
+        elapsed: seconds spent until the search has been stopped
+    """
+
+    def __init__(self, message, nodes, elapsed):
+        super().__init__(message)
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __reduce__(self):
+        # picklable to be raised by worker processes
+        return type(self), (str(self), self.nodes, self.elapsed)
+
+
+def solve(fixed_candidates, rule_description=None, matrix_type=None, backend='dlx',
+          propagation=None, stats=None, hooks=(), timeout=None, max_nodes=None) -> list:
     """
     Solves by default a sudoku puzzle by applying the exact cover problem to it
     and using the Algorithm-X by Donald Knuth.
@@ -14,42 +59,639 @@ def solve(fixed_candidates, rule_description=None) -> list:
         R{rowNumber}C{columnNumber}#{number}
 
     The return value is also list of candidates which solve the sudoku.
+
+    Sudoku puzzles (see rules.for_size) may also be passed as sequence of
+    integer candidate ids (see rules.IntegerRules), then the solution consists of ids too.
+    Or they may be passed as bytes of one number per cell row by row (0 for empty cells),
+    then the solution are the bytes of the completed puzzle.
+    Both skip the parsing of strings.
     
     Note:
 
         The second argument can be used to solve other exact cover problems than sudoku.
         See documentation for further information.
 
+        Standard 9x9 sudokus can be solved considerably faster by the ``bitmask`` backend
+        which doesn't support other rule descriptions though.
+
     Args:
         fixed_candidates: list of strings describing the filled in cells with their numbers
         rule_description: lookup for candidates and constraints of sudoku
+        matrix_type: class of the matrix to be used, by default the ConstraintMatrix.
+            The ArrayConstraintMatrix can be used alternatively.
+        backend: ``dlx`` to use the Algorithm-X (default) or ``bitmask``
+        propagation: True or a propagation.Propagator to apply logical
+            constraint propagation before and during the search (``dlx`` backend only).
+            True applies the singles at each node, the other techniques are
+            selected by a Propagator
+        stats: a stats.SolveStats to be filled with the statistics of solving
+            (``dlx`` backend only), which slows down the search a bit
+        hooks: tracing.SearchHook instances to be notified of the events of the search
+            (``dlx`` backend only), which slow down the search depending on the events
+        timeout: seconds after which the search is stopped (``dlx`` backend only).
+            The clock is read only every BUDGET_CHECK_INTERVAL search nodes,
+            so the search may take a little longer.
+        max_nodes: amount of search nodes after which the search is stopped
+            (``dlx`` backend only)
 
     Returns:
         list of strings describing the candidates solving the sudoku puzzle
+
+    Raises:
+        BudgetExceeded: if the timeout or the maximal amount of search nodes is exceeded
+    """
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend {}'.format(backend))
+    budget = _get_budget(timeout, max_nodes)
+    if backend == 'bitmask' and (stats is not None or hooks or budget):
+        raise ValueError('The bitmask backend does not support statistics, hooks and limits')
+    if stats is not None or hooks or budget:
+        return _solve_traced(fixed_candidates, rule_description, matrix_type,
+                             propagation, stats, list(hooks) + ([budget] if budget else []))
+    if backend == 'bitmask':
+        if rule_description not in (None, rules, rules.for_size(rules.STANDARD_BOX_SIZE)):
+            raise ValueError('The bitmask backend supports only the standard sudoku rules')
+        if propagation:
+            raise ValueError('The bitmask backend does not support propagation')
+        return _solve_bitmask(fixed_candidates)
+    with _use_puzzle(fixed_candidates, rule_description, matrix_type) as (matrix, decode):
+        if matrix is None:
+            return decode(None)
+        solution = _solve(matrix, _get_search(propagation))
+        return decode(solution) if matrix.has_satisfied_all_constraints() else decode(None)
+
+
+def _solve_traced(fixed_candidates, rule_description, matrix_type, propagation, stats, hooks):
+    # same as solve but notifying the hooks and recording the statistics,
+    # kept apart to leave the search without hooks untouched
+    hooks = list(hooks) + ([stats] if stats is not None else [])
+    start = time.perf_counter()
+    with _use_puzzle(fixed_candidates, rule_description, matrix_type) as (matrix, decode):
+        build_time = time.perf_counter() - start
+        solution = None
+        if matrix is not None:
+            with tracing.trace(matrix, hooks):
+                solution = _solve(matrix, _get_search(propagation))
+            if not matrix.has_satisfied_all_constraints():
+                solution = None
+            else:
+                for hook in hooks:
+                    hook.on_solution(solution)
+        search_time = time.perf_counter() - start - build_time
+        result = decode(solution)
+    if stats is not None:
+        stats.build_time, stats.search_time = build_time, search_time
+        stats.total_time = time.perf_counter() - start
+        stats.solved = solution is not None
+    return result
+
+
+class _Budget(tracing.SearchHook):
+    # stops the search by raising BudgetExceeded from the iteration of the candidates,
+    # the matrix is restored by the reset of the template afterwards
+
+    def __init__(self, timeout, max_nodes):
+        self.start = time.perf_counter()
+        self.deadline = self.start + timeout if timeout is not None else None
+        self.max_nodes = max_nodes
+        self.nodes = 0
+
+    def on_node(self, candidate, depth):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.__stop('Exceeded {} search nodes'.format(self.max_nodes))
+        # reading the clock is amortized over many nodes
+        if self.deadline is not None and not self.nodes % BUDGET_CHECK_INTERVAL \
+                and time.perf_counter() > self.deadline:
+            self.__stop('Exceeded the timeout of {:.3f}s'.format(self.deadline - self.start))
+
+    def __stop(self, message):
+        raise BudgetExceeded(message, self.nodes - 1, time.perf_counter() - self.start)
+
+
+def _get_budget(timeout, max_nodes):
+    if timeout is None and max_nodes is None:
+        return None
+    return _Budget(timeout, max_nodes)
+
+
+def solve_iter(fixed_candidates, rule_description=None, matrix_type=None, propagation=None):
+    """
+    Lazily iterates through all solutions of a puzzle (see solve).
+
+    Args:
+        fixed_candidates: list of strings describing the filled in cells with their numbers
+        rule_description: lookup for candidates and constraints of sudoku
+        matrix_type: class of the matrix to be used, by default the ConstraintMatrix
+        propagation: True or a propagation.Propagator (see solve)
+
+    Returns:
+        generator of tuples of strings describing the candidates of each solution
+        (or of the same type as the solutions of solve)
+    """
+    with _use_puzzle(fixed_candidates, rule_description, matrix_type) as (matrix, decode):
+        if matrix is None:
+            return
+        for solution in _get_search(propagation)(matrix):
+            yield decode(solution)
+
+
+def count_solutions(fixed_candidates, rule_description=None, limit=None, matrix_type=None,
+                    propagation=None, timeout=None, max_nodes=None) -> int:
+    """
+    Counts the solutions of a puzzle (see solve).
+    The search stops as soon as the limit has been reached.
+
+    Args:
+        fixed_candidates: list of strings describing the filled in cells with their numbers
+        rule_description: lookup for candidates and constraints of sudoku
+        limit: maximal amount of solutions to be counted, unlimited if None
+        matrix_type: class of the matrix to be used, by default the ConstraintMatrix
+        propagation: True or a propagation.Propagator (see solve)
+        timeout: seconds after which the search is stopped (see solve)
+        max_nodes: amount of search nodes after which the search is stopped
+
+    Returns:
+        the amount of solutions but at most the limit
+
+    Raises:
+        BudgetExceeded: if the timeout or the maximal amount of search nodes is exceeded
+    """
+    count = 0
+    budget = _get_budget(timeout, max_nodes)
+    with _use_puzzle(fixed_candidates, rule_description, matrix_type) as (matrix, _):
+        if matrix is None:
+            return count
+        with tracing.trace(matrix, [budget] if budget else []):
+            for _ in _get_search(propagation)(matrix):
+                count += 1
+                if count == limit:
+                    break
+    return count
+
+
+def is_unique(fixed_candidates, rule_description=None, matrix_type=None,
+              propagation=None, timeout=None, max_nodes=None) -> bool:
+    """
+    Returns True if the puzzle has exactly one solution, otherwise False.
+
+    Args:
+        fixed_candidates: list of strings describing the filled in cells with their numbers
+        rule_description: lookup for candidates and constraints of sudoku
+        matrix_type: class of the matrix to be used, by default the ConstraintMatrix
+        propagation: True or a propagation.Propagator (see solve)
+        timeout: seconds after which the search is stopped (see solve)
+        max_nodes: amount of search nodes after which the search is stopped
+
+    Raises:
+        BudgetExceeded: if the timeout or the maximal amount of search nodes is exceeded
+    """
+    return count_solutions(fixed_candidates, rule_description, 2, matrix_type,
+                           propagation, timeout, max_nodes) == 1
+
+
+def solve_batch(puzzles, chunksize=10000):
+    """
+    Solves a batch of standard 9x9 sudoku puzzles at once.
+    The constraints of all puzzles are propagated by vectorized operations
+    and only the puzzles still unsolved afterwards are searched one by one.
+    Use ``batch.from_candidates`` and ``batch.to_candidates`` to convert from and
+    to the candidates used by the importer and visualizer.
+
+    Note:
+
+        Requires NumPy to be installed.
+
+    Args:
+        puzzles: integer array-like of shape (puzzles, 9, 9) whereas empty cells are 0
+        chunksize: amount of puzzles propagated at once, limits the memory usage
+
+    Returns:
+        integer array of shape (puzzles, 9, 9) containing the solutions.
+        Puzzles without solution are filled with 0.
+    """
+    # imported here since NumPy is an optional dependency
+    from sudokusolver import batch
+    return batch.solve_batch(puzzles, chunksize)
+
+
+def solve_many(puzzles, workers=None, chunksize=64, ordered=True,
+               rule_description=None, backend='dlx', cache=None):
+    """
+    Solves many puzzles in parallel by a pool of worker processes.
+    The puzzles are dispatched in chunks and each worker builds the matrix template
+    only once when started. The puzzles are consumed lazily and only a limited amount
+    of chunks is dispatched ahead, so that also endless streams of puzzles can be solved.
+
+    Args:
+        puzzles: iterable of sequences of fixed candidates (see solve).
+            None is answered by an empty solution.
+        workers: amount of worker processes, by default the amount of CPUs.
+            In case of one worker, the puzzles are solved by the calling process.
+        chunksize: amount of puzzles sent to a worker at once
+        ordered: if True the solutions are returned in the order of the puzzles,
+            otherwise in the order of their completion
+        rule_description: lookup for candidates and constraints, must be a module or picklable
+        backend: ``dlx`` or ``bitmask`` (see solve)
+        cache: cache.PersistentCache shared by the workers, each chunk of puzzles
+            is looked up and its new solutions are inserted at once
+
+    Returns:
+        iterator of the solutions if ordered otherwise of tuples
+        containing the index of the puzzle and its solution
+    """
+    if backend not in BACKENDS:
+        raise ValueError('Unknown backend {}'.format(backend))
+    if cache is not None and \
+            rule_description not in (None, rules, rules.for_size(rules.STANDARD_BOX_SIZE)):
+        raise ValueError('Only the solutions of standard sudokus can be cached')
+    workers = workers if workers else os.cpu_count() or 1
+    chunks = _get_chunks(puzzles, chunksize)
+    if workers == 1:
+        results = ((start, _solve_puzzles(chunk, rule_description, backend, cache))
+                   for start, chunk in chunks)
+        return _flatten(results, ordered)
+    initargs = (_get_picklable_rule_description(rule_description), backend, cache)
+    return _flatten(_dispatch(chunks, workers, ordered, initargs), ordered)
+
+
+def _get_chunks(puzzles, chunksize):
+    puzzles = iter(puzzles)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(puzzles, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _flatten(results, ordered):
+    for start, solutions in results:
+        if ordered:
+            yield from solutions
+        else:
+            yield from enumerate(solutions, start=start)
+
+
+def _dispatch(chunks, workers, ordered, initargs):
+    # limits the amount of pending chunks to keep the memory bounded
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        pending = deque()
+        for start, chunk in chunks:
+            pending.append((start, executor.submit(_solve_chunk, chunk)))
+            while len(pending) >= max_pending:
+                yield from _collect(pending, ordered)
+        while pending:
+            yield from _collect(pending, ordered)
+
+
+def _collect(pending, ordered):
+    if ordered:
+        start, future = pending.popleft()
+        yield start, future.result()
+        return
+    done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+    for start, future in list(pending):
+        if future in done:
+            pending.remove((start, future))
+            yield start, future.result()
+
+
+def _get_picklable_rule_description(rule_description):
+    # modules can't be pickled, hence they are passed by their name
+    if rule_description is None or rule_description is rules:
+        return None
+    if isinstance(rule_description, ModuleType):
+        return rule_description.__name__
+    return rule_description
+
+
+_worker_options = {}
+
+
+def _init_worker(rule_description, backend, cache=None):
+    if isinstance(rule_description, str):
+        rule_description = importlib.import_module(rule_description)
+    _worker_options['rule_description'] = rule_description
+    _worker_options['backend'] = backend
+    _worker_options['cache'] = cache
+    if backend == 'dlx':
+        get_template(rule_description)
+
+
+def _solve_chunk(puzzles):
+    return _solve_puzzles(puzzles, _worker_options['rule_description'],
+                          _worker_options['backend'], _worker_options['cache'])
+
+
+def _solve_puzzles(puzzles, rule_description, backend, cache=None):
+    if cache is not None:
+        return cache.solve_many(puzzles, backend)
+    return [solve(fixed_candidates, rule_description, backend=backend)
+            if fixed_candidates is not None else []
+            for fixed_candidates in puzzles]
+
+
+_templates = threading.local()
+# amount of templates and column orders kept per thread, the least recently used is dropped
+MAX_TEMPLATES = 8
+
+
+def get_template(rule_description=None, matrix_type=None):
+    """
+    Returns the matrix containing all candidates and constraints of the
+    given rule description. The matrix is built on the first call only
+    and reused for every further call of the same thread.
+    The templates of the latest MAX_TEMPLATES rule descriptions are kept per thread.
+
+    Note:
+
+        The matrix must be restored by its reset method after its usage.
+
+    Args:
+        rule_description: lookup for candidates and constraints of sudoku
+        matrix_type: class of the matrix, by default the ConstraintMatrix
+
+    Returns:
+        the cached matrix of the rule description
     """
-    rule_description = rules if not rule_description else rule_description
-    matrix = _create_matrix(fixed_candidates, rule_description)
-    solution = _solve(matrix)
-    return solution if matrix.has_satisfied_all_constraints() else []
+    rule_description = _get_search_rules(rule_description)
+    matrix_type = ConstraintMatrix if not matrix_type else matrix_type
+    return _get_cached(rule_description, matrix_type,
+                       lambda: _create_matrix((), rule_description, matrix_type))
+
+
+def _get_constraint_order(rule_description):
+    # the constraints in the order of the columns of the template, so that a matrix
+    # built without the fixed candidates chooses between equal columns like the template
+    return _get_cached(rule_description, 'constraints', lambda: tuple(dict.fromkeys(
+        constraint for candidate in rule_description.get_all_candidates()
+        for constraint in rule_description.get_all_satisfied_constraints(candidate))))
+
+
+def _get_cached(rule_description, kind, create):
+    if not hasattr(_templates, 'matrices'):
+        _templates.matrices = OrderedDict()
+    matrices = _templates.matrices
+    # keyed by id to support unhashable descriptions,
+    # the description is stored along to keep its id reserved while cached
+    key = (id(rule_description), kind)
+    entry = matrices.get(key)
+    if entry is not None and entry[0] is rule_description:
+        matrices.move_to_end(key)
+        return entry[1]
+    value = create()
+    matrices[key] = (rule_description, value)
+    matrices.move_to_end(key)
+    if len(matrices) > MAX_TEMPLATES:
+        matrices.popitem(last=False)
+    return value
+
+
+@contextmanager
+def _use_template(rule_description, matrix_type):
+    # a template still used by a paused solve_iter is replaced by a new matrix
+    matrix = get_template(rule_description, matrix_type)
+    if not hasattr(_templates, 'used'):
+        _templates.used = set()
+    if id(matrix) in _templates.used:
+        matrix = _create_matrix((), rule_description, matrix_type or ConstraintMatrix)
+    _templates.used.add(id(matrix))
+    try:
+        yield matrix
+    finally:
+        matrix.reset()
+        _templates.used.discard(id(matrix))
+
+
+@contextmanager
+def _use_puzzle(fixed_candidates, rule_description, matrix_type):
+    # provides the matrix without the fixed candidates, or None if they
+    # contradict each other, and the function converting the solutions to the type of the puzzle
+    codec = _get_codec(rule_description)
+    rule_description = codec.ids if codec else rule_description
+    if not matrix_type or matrix_type is ConstraintMatrix:
+        # covering the fixed candidates in the linked nodes of the template and restoring
+        # them afterwards costs more than building the matrix of the candidates left
+        try:
+            fixed_candidates, decode = _encode(fixed_candidates, codec)
+            matrix = _create_puzzle_matrix(fixed_candidates, rule_description, ConstraintMatrix)
+        except ValueError:
+            matrix, decode = None, _decode_labels(codec)
+        yield matrix, decode
+        return
+    with _use_template(rule_description, matrix_type) as matrix:
+        try:
+            fixed_candidates, decode = _encode(fixed_candidates, codec)
+            if not _cover_fixed_candidates(matrix, fixed_candidates, rule_description):
+                matrix = None
+        except ValueError:
+            # unknown candidates have no solution
+            matrix, decode = None, _decode_labels(codec)
+        yield matrix, decode
+
+
+def _get_codec(rule_description):
+    # the sudoku rules are solved by integer ids,
+    # other rule descriptions by their own candidates and constraints
+    if not rule_description or rule_description is rules:
+        return rules.for_size(rules.STANDARD_BOX_SIZE)
+    if isinstance(rule_description, rules.Rules):
+        return rule_description
+    return None
+
+
+def _get_search_rules(rule_description):
+    codec = _get_codec(rule_description)
+    return codec.ids if codec else rule_description
+
+
+def _encode(fixed_candidates, codec):
+    if codec is None:
+        return fixed_candidates, _decode_labels(None)
+    if isinstance(fixed_candidates, GRID_TYPES):
+        fixed_candidates = codec.encode_grid(fixed_candidates)
+        return fixed_candidates, lambda solution: \
+            codec.decode_grid(fixed_candidates + list(solution)) if solution is not None else b''
+    if _is_labels(fixed_candidates):
+        return [codec.encode(candidate) for candidate in fixed_candidates], _decode_labels(codec)
+    return [int(candidate) for candidate in fixed_candidates], \
+        lambda solution: tuple(solution) if solution is not None else []
+
+
+def _is_labels(fixed_candidates):
+    return isinstance(fixed_candidates, (list, tuple)) and \
+        (not fixed_candidates or isinstance(fixed_candidates[0], str))
 
 
-def _solve(matrix, result_set=()):
-    if matrix.candidates_exist():
-        for candidate in matrix.get_next_constraints_candidates():
-            matrix.cover(candidate)
-            solution = _solve(matrix, result_set + (candidate.candidate, ))
-            if matrix.has_satisfied_all_constraints():
-                return solution
-            matrix.uncover()
-    return result_set
+def _decode_labels(codec):
+    def decode(solution):
+        if solution is None:
+            return []
+        return tuple(map(codec.decode, solution)) if codec else tuple(solution)
+    return decode
 
 
-def _create_matrix(fixed_candidates, rule_description):
-    matrix = ConstraintMatrix()
+def _solve_bitmask(fixed_candidates):
+    # the bitmask backend works on strings and grids, other puzzles are converted.
+    # Invalid candidates have no solution like by the dlx backend
+    if _is_labels(fixed_candidates):
+        try:
+            return bitmask.solve(fixed_candidates)
+        except ValueError:
+            return []
+    if isinstance(fixed_candidates, GRID_TYPES):
+        if len(fixed_candidates) != bitmask.CELLS or max(fixed_candidates) > bitmask.SIZE:
+            return b''
+        solution = bitmask.solve_grid(fixed_candidates)
+        return bytes(solution) if solution else b''
+    codec = rules.for_size(rules.STANDARD_BOX_SIZE)
+    try:
+        fixed_candidates, decode = _encode(fixed_candidates, codec)
+    except ValueError:
+        return []
+    if not all(0 <= candidate < bitmask.CELLS * bitmask.SIZE for candidate in fixed_candidates):
+        return []
+    solution = bitmask.solve(tuple(map(codec.decode, fixed_candidates)))
+    return decode(list(map(codec.encode, solution)) if solution else None)
+
+
+def _cover_fixed_candidates(matrix, fixed_candidates, rule_description):
     fixed_constraints = rule_description.get_all_satisfied_constraints(*fixed_candidates)
+    # fixed candidates satisfying the same constraint contradict each other
+    if len(set(fixed_constraints)) != len(fixed_constraints):
+        return False
+    for candidate in fixed_candidates:
+        row_ref_node = matrix.get_candidate(candidate)
+        if row_ref_node is None:
+            return False
+        matrix.cover(row_ref_node)
+    return True
+
+
+def _get_search(propagation):
+    if not propagation:
+        return _search
+    propagator = propagation if isinstance(propagation, Propagator) else Propagator()
+    return functools.partial(_search_propagating, propagator=propagator)
+
+
+def _solve(matrix, search=None):
+    for solution in (search or _search)(matrix):
+        return tuple(solution)
+    return ()
+
+
+def _search(matrix):
+    # depth first search by an explicit stack instead of recursion,
+    # each level holds the iteration through the candidates of its chosen constraint.
+    # The yielded solution is changed by the further search and must be copied if needed.
+    cover, uncover = matrix.cover, matrix.uncover
+    candidates_exist = matrix.candidates_exist
+    has_satisfied_all_constraints = matrix.has_satisfied_all_constraints
+    choose_constraint, iter_candidates = matrix.choose_constraint, matrix.iter_candidates
+    solution = []
+    levels = []
+    if has_satisfied_all_constraints():
+        yield solution
+        return
+    if candidates_exist():
+        levels.append(iter_candidates(choose_constraint()))
+    while levels:
+        candidate = next(levels[-1], None)
+        if candidate is None:
+            levels.pop()
+            # all candidates of the level failed, so did the candidate of the parent level
+            if solution:
+                uncover()
+                solution.pop()
+            continue
+        cover(candidate)
+        solution.append(candidate.candidate)
+        if has_satisfied_all_constraints():
+            yield solution
+        elif candidates_exist():
+            levels.append(iter_candidates(choose_constraint()))
+            continue
+        uncover()
+        solution.pop()
+
+
+def _search_propagating(matrix, propagator):
+    # same search as _search but propagating before the search and after each cover.
+    # Each level records the amount of matrix operations of its candidate
+    # and the length of the solution before, to revert both when backtracking.
+    # The operations of the propagation before the search are reverted by the reset.
+    cover, uncover = matrix.cover, matrix.uncover
+    propagate = propagator.propagate
+    candidates_exist = matrix.candidates_exist
+    has_satisfied_all_constraints = matrix.has_satisfied_all_constraints
+    choose_constraint, iter_candidates = matrix.choose_constraint, matrix.iter_candidates
+    solution = []
+    levels = []
+    undo = []
+    if not propagate(matrix, solution)[1]:
+        return
+    if has_satisfied_all_constraints():
+        yield solution
+        return
+    if candidates_exist():
+        levels.append(iter_candidates(choose_constraint()))
+    while levels:
+        candidate = next(levels[-1], None)
+        if candidate is None:
+            levels.pop()
+            if undo:
+                operations, length = undo.pop()
+                for _ in range(operations):
+                    uncover()
+                del solution[length:]
+            continue
+        length = len(solution)
+        cover(candidate)
+        solution.append(candidate.candidate)
+        operations, consistent = 1, True
+        if propagator.at_each_node:
+            propagated, consistent = propagate(matrix, solution)
+            operations += propagated
+        if consistent:
+            if has_satisfied_all_constraints():
+                yield solution
+            elif candidates_exist():
+                levels.append(iter_candidates(choose_constraint()))
+                undo.append((operations, length))
+                continue
+        for _ in range(operations):
+            uncover()
+        del solution[length:]
+
+
+def _create_matrix(fixed_candidates, rule_description, matrix_type=ConstraintMatrix):
+    fixed_constraints = set(rule_description.get_all_satisfied_constraints(*fixed_candidates))
+    return matrix_type.from_incidence(
+        _get_incidence(fixed_candidates, fixed_constraints, rule_description))
+
+
+def _create_puzzle_matrix(fixed_candidates, rule_description, matrix_type):
+    # returns None if the fixed candidates contradict each other or are unknown
+    fixed_constraints = rule_description.get_all_satisfied_constraints(*fixed_candidates)
+    unique_constraints = set(fixed_constraints)
+    if len(unique_constraints) != len(fixed_constraints):
+        return None
+    fixed_candidates = set(fixed_candidates)
+    if not fixed_candidates.issubset(rule_description.get_all_candidates()):
+        return None
+    constraints = [constraint for constraint in _get_constraint_order(rule_description)
+                   if constraint not in unique_constraints]
+    return matrix_type.from_incidence(
+        _get_incidence(fixed_candidates, unique_constraints, rule_description), constraints)
+
+
+def _get_incidence(fixed_candidates, fixed_constraints, rule_description):
     for candidate in rule_description.get_all_candidates():
         satisfied_constraints = rule_description.get_all_satisfied_constraints(candidate)
         if candidate not in fixed_candidates \
-                and not (set(fixed_constraints) & set(satisfied_constraints)):
-            matrix.add(candidate, satisfied_constraints)
-    return matrix
+                and fixed_constraints.isdisjoint(satisfied_constraints):
+            yield candidate, satisfied_constraints
@@ -0,0 +1,67 @@
+"""
+Statistics of solving a puzzle, e.g. to find out why a puzzle is solved slowly::
+
+    stats = SolveStats()
+    solution = solver.solve(fixed_candidates, stats=stats)
+    print(stats.nodes, stats.backtracks, stats.search_time)
+
+The statistics are recorded only if a SolveStats is passed to solver.solve,
+otherwise the search runs without any counting.
+"""
+from sudokusolver.tracing import SearchHook
+
+
+class SolveStats(SearchHook):
+    """
+    Statistics filled in by solver.solve, counted as hook of the search (see tracing).
+
+    Attributes:
+        build_time: seconds spent building (on the first call only) or reusing
+            the matrix and covering the fixed candidates
+        search_time: seconds spent searching
+        total_time: seconds spent solving in total
+        covers: calls of the cover method during the search,
+            including the candidates forced by the propagation
+        uncovers: calls of the uncover method during the search,
+            including those reverting candidates eliminated by the propagation
+        nodes: candidates tried by the search
+        backtracks: candidates tried by the search and taken back again
+        max_depth: maximal amount of candidates tried on top of each other
+        column_sizes: for each depth the sizes of the constraints chosen there,
+            i.e. the amount of alternatives the search had
+        solved: True if a solution has been found
+    """
+
+    def __init__(self):
+        self.build_time = 0.0
+        self.search_time = 0.0
+        self.total_time = 0.0
+        self.covers = 0
+        self.uncovers = 0
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.column_sizes = []
+        self.solved = False
+
+    def as_dict(self) -> dict:
+        """Returns the statistics by their names"""
+        return dict(vars(self))
+
+    def on_choose_column(self, constraint, size, depth):
+        if len(self.column_sizes) == depth:
+            self.column_sizes.append([])
+        self.column_sizes[depth].append(size)
+
+    def on_node(self, candidate, depth):
+        self.nodes += 1
+        self.max_depth = max(self.max_depth, depth)
+
+    def on_cover(self, candidate):
+        self.covers += 1
+
+    def on_uncover(self):
+        self.uncovers += 1
+
+    def on_backtrack(self, candidate, depth):
+        self.backtracks += 1
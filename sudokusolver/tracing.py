@@ -0,0 +1,157 @@
+"""
+Hooks to follow the search of the Algorithm-X event by event,
+e.g. to profile or visualize the search tree of a puzzle::
+
+    hook = FlameGraphHook(label=rules.for_size(3).decode)
+    solver.solve(fixed_candidates, hooks=[hook])
+    with open('search.folded', 'w') as f:
+        hook.write(f)
+
+The events are raised by replacing the methods of the matrix instance used by
+the search with notifying ones while it is traced (see trace).
+Only the methods of events overridden by a hook are replaced and
+without hooks the search runs untouched.
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+EVENTS = ('on_choose_column', 'on_node', 'on_cover', 'on_uncover', 'on_backtrack',
+          'on_solution')
+
+
+class SearchHook(object):
+    """
+    Base class of the hooks, the subclasses override the events they are interested in.
+    The candidates are passed as given by the rule description, e.g. integer ids for sudokus.
+    The depth is the amount of candidates tried by the search on top of each other.
+    """
+
+    def on_choose_column(self, constraint, size, depth):
+        """The search has chosen the constraint (a column of the matrix)
+        having the given amount of candidates left to be tried next"""
+
+    def on_node(self, candidate, depth):
+        """The search tries the candidate, which is covered next"""
+
+    def on_cover(self, candidate):
+        """The candidate is covered, by the search or the propagation"""
+
+    def on_uncover(self):
+        """The latest cover or elimination is reverted"""
+
+    def on_backtrack(self, candidate, depth):
+        """The candidate tried by the search is taken back since it failed"""
+
+    def on_solution(self, solution):
+        """The search has found the solution (sequence of candidates)"""
+
+
+class FlameGraphHook(SearchHook):
+    """
+    Records the search tree as collapsed stacks, the input format of flame graph tools
+    like ``flamegraph.pl`` or speedscope. Each tried candidate is a frame on top of
+    the candidates it has been tried on, so that the width of a frame is
+    the amount of search nodes below it.
+
+    Args:
+        label: function returning the name of the frame of a candidate
+        root: name of the frame below all candidates
+    """
+
+    def __init__(self, label=str, root='search'):
+        self.label = label
+        self.stacks = Counter()
+        self.__frames = [root]
+
+    def on_node(self, candidate, depth):
+        del self.__frames[depth:]
+        self.__frames.append(self.label(candidate))
+        self.stacks[';'.join(self.__frames)] += 1
+
+    def write(self, file):
+        """Writes the collapsed stacks line by line into the opened file"""
+        for stack, count in self.stacks.items():
+            file.write('{} {}\n'.format(stack, count))
+
+
+@contextmanager
+def trace(matrix, hooks):
+    """
+    Notifies the hooks of the events of the search on the matrix until the context is left,
+    except for on_solution which is raised by the solver.
+    """
+    listeners = {event: [getattr(hook, event) for hook in hooks if _overrides(hook, event)]
+                 for event in EVENTS}
+    traced = {}
+    if listeners['on_cover']:
+        traced['cover'] = _notify_cover(matrix.cover, listeners['on_cover'])
+    if listeners['on_uncover']:
+        traced['uncover'] = _notify_uncover(matrix.uncover, listeners['on_uncover'])
+    if listeners['on_choose_column'] or listeners['on_node'] or listeners['on_backtrack']:
+        traced['choose_constraint'], traced['iter_candidates'] = _notify_search(
+            matrix, listeners['on_choose_column'], listeners['on_node'],
+            listeners['on_backtrack'])
+    for name, method in traced.items():
+        setattr(matrix, name, method)
+    try:
+        yield
+    finally:
+        for name in traced:
+            delattr(matrix, name)
+
+
+def _overrides(hook, event):
+    return getattr(type(hook), event) is not getattr(SearchHook, event)
+
+
+def _notify_cover(cover, listeners):
+    def notifying_cover(candidate):
+        for listener in listeners:
+            listener(candidate.candidate)
+        cover(candidate)
+    return notifying_cover
+
+
+def _notify_uncover(uncover, listeners):
+    def notifying_uncover():
+        for listener in listeners:
+            listener()
+        uncover()
+    return notifying_uncover
+
+
+def _notify_search(matrix, on_choose_column, on_node, on_backtrack):
+    # the depth is the amount of iterations through the candidates of chosen constraints
+    choose_constraint, iter_candidates = matrix.choose_constraint, matrix.iter_candidates
+    chosen = None
+    depth = 0
+
+    def notifying_choose_constraint():
+        nonlocal chosen
+        chosen = choose_constraint()
+        for listener in on_choose_column:
+            listener(chosen, matrix.size_of(chosen), depth)
+        return chosen
+
+    def notifying_iter_candidates(constraint):
+        nonlocal chosen
+        # the propagation iterates candidates too, those aren't tried by the search
+        if constraint is not chosen:
+            return iter_candidates(constraint)
+        chosen = None
+        return iter_tried_candidates(constraint)
+
+    def iter_tried_candidates(constraint):
+        nonlocal depth
+        depth += 1
+        try:
+            for candidate in iter_candidates(constraint):
+                for listener in on_node:
+                    listener(candidate.candidate, depth)
+                yield candidate
+                # resumed to try the next one, the candidate has been taken back
+                for listener in on_backtrack:
+                    listener(candidate.candidate, depth)
+        finally:
+            depth -= 1
+    return notifying_choose_constraint, notifying_iter_candidates
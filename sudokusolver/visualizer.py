@@ -1,32 +1,71 @@
 """Provides mechanism to visualize sudoku puzzles."""
+import math
 import re
 
 from collections import defaultdict
 
+from sudokusolver.importer import SYMBOLS
+from sudokusolver.rules import STANDARD_BOX_SIZE
 
-def visualize(candidates: str):
+_CANDIDATE_PATTERN = re.compile(r'R(\d+)C(\d+)#(\d+)')
+
+
+def visualize(candidates: str, box_size: int = None):
     """Prints the sudoku puzzle as given as a list of candidates
     (e.g. ``R1C1#1``) on the standard output.
 
     Args:
         candidates: sequence of strings representing a number in a cell
+        box_size: the box size of the puzzle (see rules.for_size),
+            derived from the largest number of the candidates by default
     """
     matrix = _map_by_label(candidates)
-    for row in matrix.keys():
-        if row != 0 and row % 3 == 0:
+    box_size = box_size or _get_box_size(matrix)
+    width = len(str(box_size * box_size))
+    for row in sorted(matrix.keys()):
+        if row != 0 and row % box_size == 0:
             print('')
-        numbers = [str(n) for n in matrix[row].values()]
+        numbers = [str(matrix[row][column]).rjust(width) for column in sorted(matrix[row])]
         for i, number in enumerate(numbers):
-            if i != 0 and i % 3 == 0:
+            if i != 0 and i % box_size == 0:
                 numbers[i] = ' |' + number
         print('|' + '|'.join(numbers) + '|')
 
 
+def to_line(candidates: str, empty: str = '.', box_size: int = None) -> str:
+    """Returns the sudoku puzzle given as a list of candidates
+    (e.g. ``R1C1#1``) as one line of 81 characters row by row.
+    Larger puzzles are written likewise (see importer.imp_line).
+
+    Args:
+        candidates: sequence of strings representing a number in a cell
+        empty: character written for empty cells
+        box_size: the box size of the puzzle (see rules.for_size),
+            derived from the largest number of the candidates by default
+
+    Returns:
+        the numbers of the puzzle in one line
+    """
+    matrix = _map_by_label(candidates)
+    size = (box_size or _get_box_size(matrix)) ** 2
+    cells = [empty] * (size * size)
+    for row, columns in matrix.items():
+        for column, number in columns.items():
+            cells[row * size + column] = SYMBOLS[number - 1]
+    return ''.join(cells)
+
+
+def _get_box_size(matrix):
+    largest = max([max(row + 1, column + 1, number)
+                   for row, columns in matrix.items()
+                   for column, number in columns.items()], default=0)
+    return max(STANDARD_BOX_SIZE, math.ceil(math.sqrt(largest)))
+
+
 def _map_by_label(candidates):
     matrix = defaultdict(dict)
     for candidate in candidates:
-        pattern = re.compile(r'R(\d)C(\d)#(\d)')
-        matches = pattern.match(candidate)
+        matches = _CANDIDATE_PATTERN.match(candidate)
         row = int(matches.group(1))
         column = int(matches.group(2))
         number = int(matches.group(3))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import asyncio
+import time
+import unittest
+
+from sudokusolver import aio
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+
+
+class AsyncSolverTest(unittest.TestCase):
+    def setUp(self):
+        self.puzzles = list(importer.iter_puzzles(bench.TIERS['examples']))
+        self.fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+
+    def test_solve_many(self):
+        async def solve_many(executor):
+            async with aio.AsyncSolver(executor, workers=2, max_concurrency=3) as async_solver:
+                solution = await async_solver.solve(self.fixed_candidates)
+                return solution, await async_solver.solve_many(self.puzzles)
+        for executor in aio.EXECUTORS:
+            solution, solutions = asyncio.run(solve_many(executor))
+            self.assertEqual(solver.solve(self.fixed_candidates), solution)
+            self.assertEqual([solver.solve(puzzle) for puzzle in self.puzzles], solutions)
+
+    def test_module_rule_description(self):
+        # modules can't be pickled but are passed to the processes by their name
+        async def solve(executor):
+            async with aio.AsyncSolver(executor, workers=1, rule_description=rules) \
+                    as async_solver:
+                return await async_solver.solve(self.fixed_candidates)
+        for executor in aio.EXECUTORS:
+            self.assertEqual(solver.solve(self.fixed_candidates), asyncio.run(solve(executor)))
+
+    def test_solve_default(self):
+        async def solve():
+            self.assertIs(aio.get_default_solver(), aio.get_default_solver())
+            return await aio.solve(self.puzzles[0]), await aio.solve_many(self.puzzles[1:3])
+        self.assertEqual((solver.solve(self.puzzles[0]),
+                          [solver.solve(puzzle) for puzzle in self.puzzles[1:3]]),
+                         asyncio.run(solve()))
+
+    def test_cancel(self):
+        # the search of the slowest hard puzzle takes seconds
+        slowest = list(importer.iter_puzzles(bench.TIERS['hard']))[-1]
+
+        async def cancel(executor):
+            async with aio.AsyncSolver(executor, workers=1) as async_solver:
+                start = time.perf_counter()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(async_solver.solve(slowest), 0.05)
+                # returns only after the worker has given up the search
+                cancelled = time.perf_counter() - start
+                return cancelled, await async_solver.solve(self.puzzles[0])
+        for executor in aio.EXECUTORS:
+            cancelled, solution = asyncio.run(cancel(executor))
+            self.assertLess(cancelled, 1)
+            self.assertEqual(solver.solve(self.puzzles[0]), solution)
+
+    def test_budget(self):
+        async def solve(executor):
+            async with aio.AsyncSolver(executor, workers=1) as async_solver:
+                await async_solver.solve(bytes(81), max_nodes=10)
+        for executor in aio.EXECUTORS:
+            with self.assertRaises(solver.BudgetExceeded) as context:
+                asyncio.run(solve(executor))
+            self.assertEqual(10, context.exception.nodes)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, aio.AsyncSolver, 'fiber')
+        self.assertRaises(ValueError, aio.AsyncSolver, backend='quantum')
+
+
+if __name__ == '__main__':
+    unittest.main()
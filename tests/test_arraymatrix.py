@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import unittest
+
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.rules import get_all_candidates, get_all_satisfied_constraints
+
+MAX_CANDIDATES = 729
+MAX_CONSTRAINTS = 324
+
+
+class ArrayConstraintMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.m = ArrayConstraintMatrix()
+
+    def test_add(self):
+        self.m.add('r1', ['c1', 'c2'])
+        self.m.add('r2', ['c2'])
+        candidates = [row.candidate for row in self.m.get_next_constraints_candidates()]
+        # c1 is the column with the fewest entries
+        self.assertEqual(['r1'], candidates)
+
+    def test_choose_constraint_and_iter_candidates(self):
+        self.m.add('r1', ['c1', 'c2'])
+        self.m.add('r2', ['c2'])
+        candidates = self.m.iter_candidates(self.m.choose_constraint())
+        candidate = next(candidates)
+        self.assertEqual('r1', candidate.candidate)
+        self.m.cover(candidate)
+        self.assertIsNone(self.m.choose_constraint())
+        self.m.uncover()
+        self.assertEqual([], list(candidates))
+
+    def test_cover_and_uncover(self):
+        matrix = self.__create_matrix()
+        candidate = matrix.get_next_constraints_candidates()[0]
+
+        matrix.cover(candidate)
+
+        count_covered_constraints = len(get_all_satisfied_constraints(candidate.candidate))
+        count_covered_candidates = 29
+        count_candidates, count_constraints = self.__calc_size(matrix)
+        self.assertEqual(MAX_CONSTRAINTS - count_covered_constraints,
+                         count_constraints)
+        self.assertEqual(MAX_CANDIDATES - count_covered_candidates,
+                         count_candidates)
+
+        matrix.uncover()
+
+        count_candidates, count_constraints = self.__calc_size(matrix)
+        self.assertEqual(MAX_CONSTRAINTS, count_constraints)
+        self.assertEqual(MAX_CANDIDATES, count_candidates)
+
+    def test_eliminate_and_uncover(self):
+        self.m = ArrayConstraintMatrix.from_incidence(
+            [('r1', ['c1', 'c2']), ('r2', ['c2']), ('r3', ['c1'])])
+        c1, c2 = list(self.m.iter_constraints())
+        r1 = self.m.get_candidate('r1')
+        self.assertEqual([c1, c2], self.m.get_constraints(r1))
+        self.m.eliminate(r1)
+        self.assertFalse(self.m.is_available(r1))
+        self.assertEqual((1, 1), (self.m.size_of(c1), self.m.size_of(c2)))
+        self.m.cover(self.m.get_candidate('r3'))
+        self.assertTrue(self.m.is_satisfied(c1))
+        self.assertFalse(self.m.is_satisfied(c2))
+        self.m.reset()
+        self.assertTrue(self.m.is_available(r1))
+        self.assertEqual((2, 2), (self.m.size_of(c1), self.m.size_of(c2)))
+        self.assertEqual(['r1', 'r3'], [row.candidate for row in self.m.iter_candidates(c1)])
+
+    def test_satisfied_all_constraints(self):
+        self.m.add('r1', ['c1'])
+        self.m.add('r2', ['c2'])
+        self.assertFalse(self.m.has_satisfied_all_constraints())
+        self.m.cover(self.m.get_next_constraints_candidates()[0])
+        self.m.cover(self.m.get_next_constraints_candidates()[0])
+        self.assertTrue(self.m.has_satisfied_all_constraints())
+        self.assertFalse(self.m.candidates_exist())
+
+    def test_solve_examples(self):
+        for example in ('example1', 'example2', 'example3', 'example-empty'):
+            fixed_candidates = importer.imp_candidates(
+                'tests/resources/{}.csv'.format(example))
+            solution = solver.solve(fixed_candidates,
+                                    matrix_type=ArrayConstraintMatrix)
+            constraints = get_all_satisfied_constraints(*(fixed_candidates + tuple(solution)))
+            self.assertEqual(MAX_CONSTRAINTS, len(constraints))
+            self.assertEqual(MAX_CONSTRAINTS, len(set(constraints)))
+
+    def test_solve_complete_example(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example-complete.csv')
+        solution = solver.solve(fixed_candidates, matrix_type=ArrayConstraintMatrix)
+        self.assertFalse(solution)
+
+    @staticmethod
+    def __create_matrix():
+        matrix = ArrayConstraintMatrix()
+        for candidate in get_all_candidates():
+            matrix.add(candidate, get_all_satisfied_constraints(candidate))
+        return matrix
+
+    @staticmethod
+    def __calc_size(matrix):
+        count_constraints = 0
+        column = matrix._right[matrix.ROOT]
+        rows = set()
+        while column != matrix.ROOT:
+            count_constraints += 1
+            node = matrix._down[column]
+            while node != column:
+                rows.add(matrix._row[node].candidate)
+                node = matrix._down[node]
+            column = matrix._right[column]
+        count_candidates = len(rows)
+        return count_candidates, count_constraints
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import glob
+import unittest
+
+from sudokusolver import batch
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+
+
+@unittest.skipIf(batch.numpy is None, 'requires NumPy')
+class BatchSolverTest(unittest.TestCase):
+    def setUp(self):
+        self.puzzles = [importer.imp_candidates(path)
+                        for path in sorted(glob.glob('tests/resources/example*.csv'))]
+
+    def test_solve_batch(self):
+        solutions = solver.solve_batch(batch.from_candidates(self.puzzles))
+        self.assertEqual((len(self.puzzles), 9, 9), solutions.shape)
+        for puzzle, solution in zip(self.puzzles, batch.to_candidates(solutions)):
+            self.assertTrue(set(puzzle) <= set(solution))
+            constraints = rules.get_all_satisfied_constraints(*solution)
+            self.assertEqual(324, len(set(constraints)))
+            self.assertEqual(324, len(constraints))
+
+    def test_solve_batch_in_chunks(self):
+        grids = batch.from_candidates(self.puzzles)
+        self.assertTrue((solver.solve_batch(grids) == solver.solve_batch(grids, chunksize=3)).all())
+
+    def test_solve_batch_flat_grids(self):
+        grids = batch.from_candidates(self.puzzles)
+        self.assertTrue((solver.solve_batch(grids) == solver.solve_batch(grids.reshape(-1, 81))).all())
+
+    def test_solve_batch_without_solution(self):
+        grids = batch.from_candidates([('R1C1#1', 'R1C2#1'),
+                                       ('R1C2#1', 'R1C3#2', 'R1C4#3', 'R1C5#4', 'R1C6#5',
+                                        'R1C7#6', 'R1C8#7', 'R1C9#8', 'R2C1#9')])
+        self.assertFalse(solver.solve_batch(grids).any())
+
+    def test_propagate_solves_easy_puzzle(self):
+        candidates, failed = batch.propagate(
+            batch.to_candidate_tensor(batch.from_candidates(self.puzzles[2:3])))
+        self.assertFalse(failed.any())
+        self.assertTrue((candidates.sum(axis=3) == 1).all())
+
+    def test_invalid_numbers(self):
+        self.assertRaises(ValueError, solver.solve_batch, [[10] * 81])
+        # numbers aren't wrapped into the range of the stored type
+        self.assertRaises(ValueError, solver.solve_batch, [[256] + [0] * 80])
+        self.assertRaises(ValueError, solver.solve_batch, batch.numpy.full((1, 81), 265))
+
+    def test_converters(self):
+        grids = batch.from_candidates(self.puzzles)
+        self.assertEqual([tuple(sorted(p)) for p in self.puzzles],
+                         [tuple(sorted(p)) for p in batch.to_candidates(grids)])
+        self.assertRaises(ValueError, batch.from_candidates, [('R1C1#1', 'R1C1#2')])
+
+
+if __name__ == '__main__':
+    unittest.main()
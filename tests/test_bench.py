@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from sudokusolver import bench
+
+
+class BenchTest(unittest.TestCase):
+    def test_run(self):
+        results = bench.run(['empty'], repeat=1)
+        self.assertEqual({'empty/ConstraintMatrix', 'empty/ArrayConstraintMatrix', 'parse'},
+                         set(results))
+        metrics = results['empty/ConstraintMatrix']
+        self.assertEqual(set(bench.METRICS) - {'parse_us'}, set(metrics))
+        # the empty grid is solved without backtracking
+        self.assertEqual(81, metrics['nodes'])
+        self.assertGreater(results['parse']['parse_us'], 0)
+        self.assertRaises(ValueError, bench.run, ['unknown'])
+
+    def test_helpers(self):
+        calls = []
+        self.assertGreaterEqual(bench.best_time(lambda: calls.append(1), repeat=2, number=3), 0)
+        self.assertEqual(6, len(calls))
+        self.assertGreaterEqual(bench.peak_memory(lambda: bytearray(10 ** 6)), 10 ** 6)
+
+    def test_compare(self):
+        baseline = {'empty/ConstraintMatrix': {'solve_ms': 10.0, 'nodes': 81}}
+        results = {'empty/ConstraintMatrix': {'solve_ms': 12.0, 'nodes': 81},
+                   'parse': {'parse_us': 5.0}}
+        self.assertEqual([('empty/ConstraintMatrix', 'solve_ms', 10.0, 12.0, 1.2)],
+                         bench.compare(results, baseline, 0.1))
+        self.assertEqual([], bench.compare(results, baseline, 0.25))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(0, bench.main(['--tiers', 'empty', '--repeat', '1',
+                                                '-o', output]))
+            with open(output) as f:
+                results = json.load(f)
+            self.assertIn('empty/ArrayConstraintMatrix', results['results'])
+            # a baseline of fewer nodes reports a regression
+            results['results']['empty/ArrayConstraintMatrix']['nodes'] = 1
+            with open(output, 'w') as f:
+                json.dump(results, f)
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(1, bench.main(['--tiers', 'empty', '--repeat', '1',
+                                                '--baseline', output, '--threshold', '10']))
+            self.assertIn('Regression of empty/ArrayConstraintMatrix nodes', stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import glob
+import unittest
+from types import SimpleNamespace
+
+from sudokusolver import bitmask
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+
+
+class BitmaskSolverTest(unittest.TestCase):
+    def test_solve_examples(self):
+        for path in glob.glob('tests/resources/example[0-9].csv'):
+            fixed_candidates = importer.imp_candidates(path)
+            solution = solver.solve(fixed_candidates, backend='bitmask')
+            self.assertCountEqual(solver.solve(fixed_candidates), solution)
+            self.__check_solution(fixed_candidates, solution)
+
+    def test_solve_empty_example(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example-empty.csv')
+        solution = solver.solve(fixed_candidates, backend='bitmask')
+        self.__check_solution(fixed_candidates, solution)
+
+    def test_solve_complete_example(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example-complete.csv')
+        self.assertFalse(solver.solve(fixed_candidates, backend='bitmask'))
+
+    def test_solve_contradicting_candidates(self):
+        self.assertEqual([], bitmask.solve(('R1C1#1', 'R1C2#1')))
+        self.assertEqual([], bitmask.solve(('R1C1#1', 'R1C1#2')))
+
+    def test_solve_grid_without_solution(self):
+        # the first cell can't be filled with any number
+        grid = [0, 1, 2, 3, 4, 5, 6, 7, 8] + [0] * 9 + [9] + [0] * 62
+        self.assertIsNone(bitmask.solve_grid(grid))
+
+    def test_invalid_candidate(self):
+        self.assertRaises(ValueError, bitmask.to_grid, ['R1C10#1'])
+        self.assertRaises(ValueError, bitmask.to_grid, ['1-1-1'])
+
+    def test_invalid_candidate_by_both_backends(self):
+        # the backend chooses the algorithm only, not the answer
+        for fixed_candidates in (['R1C1#10'], ['R1C10#1'], ['invalid'], [729], [-1]):
+            for backend in solver.BACKENDS:
+                self.assertEqual([], solver.solve(fixed_candidates, backend=backend))
+
+    def test_unsupported_arguments(self):
+        self.assertRaises(ValueError, solver.solve, (), backend='unknown')
+        self.assertRaises(ValueError, solver.solve, (), SimpleNamespace(), backend='bitmask')
+
+    def __check_solution(self, fixed_candidates, solution):
+        constraints = rules.get_all_satisfied_constraints(*(tuple(fixed_candidates) + solution))
+        self.assertEqual(324, len(constraints))
+        self.assertEqual(324, len(set(constraints)))
+
+
+if __name__ == '__main__':
+    unittest.main()
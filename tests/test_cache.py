@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import os
+import pickle
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from sudokusolver import bench
+from sudokusolver import canonical
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver import cache
+from sudokusolver.cache import PersistentCache, SolutionCache
+
+
+class SolutionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.puzzles = list(importer.iter_puzzles(bench.TIERS['examples']))
+        self.codec = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+    def test_solve_symmetric_puzzles(self):
+        cache = SolutionCache()
+        for seed, puzzle in enumerate(self.puzzles):
+            transformed = canonical.random_transform(random.Random(seed)).apply(puzzle)
+            self.assertEqual(solver.solve(puzzle), cache.solve(puzzle))
+            self.assertEqual(solver.solve(transformed), cache.solve(transformed))
+        self.assertEqual(len(self.puzzles), cache.misses)
+        self.assertEqual(len(self.puzzles), cache.hits)
+        self.assertEqual(0.5, cache.hit_rate)
+        self.assertEqual(2 * len(self.puzzles), cache.canonicalizations)
+        self.assertGreater(cache.canonicalize_time, 0)
+        # repeated puzzles skip the canonicalization
+        cache.solve(self.puzzles[0])
+        self.assertEqual(2 * len(self.puzzles), cache.canonicalizations)
+
+    def test_solve_candidates(self):
+        cache = SolutionCache(backend='bitmask')
+        fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+        expected = solver.solve(fixed_candidates)
+        self.assertCountEqual(expected, cache.solve(fixed_candidates))
+        ids = [self.codec.encode(candidate) for candidate in fixed_candidates]
+        self.assertCountEqual(map(self.codec.encode, expected), cache.solve(ids))
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual([], cache.solve(['R1C1#1', 'R1C2#1']))
+        self.assertEqual(b'', cache.solve(bytes([1, 1]) + bytes(79)))
+        self.assertEqual([], cache.solve(['R1C1#1', 'R1C1#2']))
+        self.assertEqual(3, cache.bypasses)
+
+    def test_evictions(self):
+        cache = SolutionCache(maxsize=2)
+        for puzzle in self.puzzles[:3] + self.puzzles[:1]:
+            cache.solve(puzzle)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2, cache.evictions)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(4, cache.as_dict()['misses'])
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, SolutionCache, 0)
+        self.assertRaises(ValueError, SolutionCache, rule_description=rules.for_size(4))
+
+
+class PersistentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.puzzles = list(importer.iter_puzzles(bench.TIERS['examples']))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'solutions.sqlite')
+
+    def test_solve_many(self):
+        with PersistentCache(self.path) as persistent:
+            expected = [solver.solve(puzzle) for puzzle in self.puzzles]
+            self.assertEqual(expected + expected[:1],
+                             persistent.solve_many(self.puzzles + self.puzzles[:1]))
+            self.assertEqual(len(self.puzzles), persistent.misses)
+            self.assertEqual(1, persistent.hits)
+            self.assertEqual(len(self.puzzles), len(persistent))
+            self.assertEqual([[], b''], persistent.solve_many([None, bytes([1, 1]) + bytes(79)]))
+            self.assertEqual([], persistent.solve(['R1C1#1', 'R1C1#2']))
+            self.assertEqual(1, persistent.bypasses)
+        # the solutions outlast the instance
+        with PersistentCache(self.path) as persistent:
+            self.assertEqual(expected[0], persistent.solve(self.puzzles[0], backend='bitmask'))
+            fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+            self.assertCountEqual(solver.solve(fixed_candidates),
+                                  persistent.solve(fixed_candidates))
+            self.assertEqual(2, persistent.hits)
+
+    def test_count_solutions(self):
+        with PersistentCache(self.path) as persistent:
+            self.assertEqual(cache.MANY, persistent.count_solutions(bytes(81)))
+            self.assertEqual(0, persistent.count_solutions(bytes([1, 1]) + bytes(79)))
+            # the count of solutions found by the bitmask backend is searched when asked for
+            persistent.solve(self.puzzles[0], backend='bitmask')
+            self.assertEqual([(solver.solve(self.puzzles[0]), None)],
+                             persistent.get_many(self.puzzles[:1]))
+            self.assertTrue(persistent.is_unique(self.puzzles[0]))
+            self.assertEqual((4, 0), (persistent.misses, persistent.hits))
+            self.assertTrue(persistent.is_unique(self.puzzles[0]))
+            self.assertEqual((4, 1), (persistent.misses, persistent.hits))
+
+    def test_evictions(self):
+        with PersistentCache(self.path, maxsize=2) as persistent:
+            persistent.solve_many(self.puzzles[:2])
+            # the first puzzle is used more recently than the second one
+            persistent.get_many(self.puzzles[:1])
+            persistent.solve(self.puzzles[2])
+            self.assertEqual(2, len(persistent))
+            self.assertEqual(1, persistent.evictions)
+            entries = persistent.get_many(self.puzzles[:3])
+            self.assertEqual([True, False, True], [entry is not None for entry in entries])
+            persistent.clear()
+            self.assertEqual(0, len(persistent))
+
+    def test_lookups_only_read(self):
+        with PersistentCache(self.path, timeout=0.1) as persistent:
+            persistent.solve_many(self.puzzles[:2])
+            database = sqlite3.connect(self.path, isolation_level=None)
+            database.execute('UPDATE solutions SET used = 0')
+            # another process holds the write lock
+            database.execute('BEGIN IMMEDIATE')
+            self.assertTrue(all(persistent.get_many(self.puzzles[:1])))
+            database.execute('COMMIT')
+            self.assertEqual([0, 0], [used for used, in database.execute(
+                'SELECT used FROM solutions')])
+        # the recent use is written on closing
+        self.assertEqual(1, database.execute(
+            'SELECT COUNT(*) FROM solutions WHERE used > 0').fetchone()[0])
+        database.close()
+
+    def test_worker_processes(self):
+        persistent = PersistentCache(self.path)
+        self.assertEqual(self.path, pickle.loads(pickle.dumps(persistent)).path)
+        puzzles = self.puzzles * 4
+        expected = [solver.solve(puzzle) for puzzle in puzzles]
+        for _ in range(2):
+            self.assertEqual(expected, list(solver.solve_many(puzzles, workers=2, chunksize=3,
+                                                              cache=persistent)))
+        self.assertEqual(len(self.puzzles), len(persistent))
+        self.assertEqual(0, persistent.misses)
+        persistent.close()
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, PersistentCache, self.path, 0)
+        with PersistentCache(self.path) as persistent:
+            self.assertRaises(ValueError, solver.solve_many, self.puzzles, 1,
+                              rule_description=rules.for_size(4), cache=persistent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import random
+import unittest
+
+from sudokusolver import bench
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.canonical import Transform, canonicalize, random_transform
+
+
+class CanonicalTest(unittest.TestCase):
+    def setUp(self):
+        self.puzzles = list(importer.iter_puzzles(
+            bench.TIERS['examples'] + bench.TIERS['seventeen'][:3] + bench.TIERS['hard'][:2]))
+
+    def test_canonicalize_symmetric_puzzles(self):
+        for seed, puzzle in enumerate(self.puzzles):
+            canonical_grid, transform = canonicalize(puzzle)
+            self.assertEqual(canonical_grid, transform.apply(puzzle))
+            self.assertEqual(puzzle, transform.invert(canonical_grid))
+            transformed = random_transform(random.Random(seed)).apply(puzzle)
+            self.assertNotEqual(puzzle, transformed)
+            self.assertEqual(canonical_grid, canonicalize(transformed)[0])
+        self.assertEqual(bytes(81), canonicalize(bytes(81))[0])
+
+    def test_canonicalize_distinguishes_puzzles(self):
+        forms = {canonicalize(puzzle)[0] for puzzle in self.puzzles}
+        self.assertEqual(len(self.puzzles), len(forms))
+
+    def test_canonical_solution(self):
+        # the solution of the canonical form is mapped back to the solution of the puzzle
+        puzzle = self.puzzles[1]
+        canonical_grid, transform = canonicalize(puzzle)
+        self.assertEqual(solver.solve(puzzle), transform.invert(solver.solve(canonical_grid)))
+
+    def test_transform(self):
+        transform = Transform(True, range(9), range(9), [0, 2, 1, 3, 4, 5, 6, 7, 8, 9])
+        grid = bytes([1, 2] + [0] * 79)
+        transformed = transform.apply(grid)
+        self.assertEqual((2, 0, 0, 0, 0, 0, 0, 0, 0, 1), tuple(transformed[:10]))
+        self.assertEqual(grid, transform.invert(transformed))
+
+    def test_invalid_grids(self):
+        self.assertRaises(ValueError, canonicalize, bytes(80))
+        self.assertRaises(ValueError, canonicalize, bytes([10]) + bytes(80))
+        self.assertRaises(ValueError, canonicalize, bytes([1, 1]) + bytes(79))
+        self.assertRaises(ValueError, canonicalize, bytes([1] + [0] * 9 + [1]) + bytes(70))
+
+
+if __name__ == '__main__':
+    unittest.main()
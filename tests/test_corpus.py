@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import glob
+import os
+import tempfile
+import unittest
+
+from sudokusolver import corpus
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+
+CODEC = rules.for_size(rules.STANDARD_BOX_SIZE)
+
+
+def read_grids():
+    return [CODEC.decode_grid(map(CODEC.encode, importer.imp_candidates(path)))
+            for path in sorted(glob.glob('tests/resources/example[0-9].csv'))]
+
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'puzzles.sdk')
+        self.grids = read_grids()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_read(self):
+        for packed, size in ((False, 81), (True, 41)):
+            self.assertEqual(len(self.grids), corpus.write_corpus(self.path, self.grids,
+                                                                  packed=packed))
+            self.assertEqual(corpus.HEADER.size + len(self.grids) * size,
+                             os.path.getsize(self.path))
+            with importer.open_corpus(self.path) as puzzles:
+                self.assertEqual(packed, puzzles.packed)
+                self.assertEqual(len(self.grids), len(puzzles))
+                self.assertEqual(self.grids, [bytes(puzzle) for puzzle in puzzles])
+                self.assertEqual(self.grids[-1], bytes(puzzles[-1]))
+                with self.assertRaises(IndexError):
+                    puzzles[len(self.grids)]
+
+    def test_slices(self):
+        corpus.write_corpus(self.path, self.grids)
+        puzzles = importer.open_corpus(self.path)
+        part = puzzles[1:3]
+        self.assertIsInstance(part[0], memoryview)
+        self.assertEqual(self.grids[1:3], [bytes(puzzle) for puzzle in part])
+        self.assertEqual(self.grids[2:3], [bytes(puzzle) for puzzle in part[1:]])
+        self.assertEqual(0, len(puzzles[3:1]))
+        with self.assertRaises(ValueError):
+            puzzles[::2]
+        part.close()
+        puzzles.close()
+
+    def test_close_with_records_referenced(self):
+        corpus.write_corpus(self.path, self.grids)
+        with importer.open_corpus(self.path) as puzzles:
+            for puzzle in puzzles[1:3]:
+                pass
+            first = puzzles[0]
+        # the records stay valid until they are released
+        self.assertEqual(self.grids[0], bytes(first))
+        self.assertEqual(self.grids[2], bytes(puzzle))
+
+    def test_convert(self):
+        lines = os.path.join(self.directory.name, 'puzzles.txt')
+        with open(lines, 'w') as f:
+            f.write('# comment\n\n')
+            f.writelines(''.join(map(str, grid)) + '\n' for grid in self.grids)
+        self.assertEqual(len(self.grids), corpus.convert_lines(lines, self.path, packed=True))
+        with importer.open_corpus(self.path) as puzzles:
+            self.assertEqual(self.grids, list(puzzles))
+        paths = sorted(glob.glob('tests/resources/example[0-9].csv'))
+        self.assertEqual(len(paths), corpus.convert_csv(paths, self.path))
+        with importer.open_corpus(self.path) as puzzles:
+            self.assertEqual(self.grids, [bytes(puzzle) for puzzle in puzzles])
+        with open(lines, 'a') as f:
+            f.write('x' * 81 + '\n')
+        with self.assertRaises(ValueError):
+            corpus.convert_lines(lines, self.path)
+
+    def test_solve_corpus(self):
+        # the last puzzle has no solution
+        grids = self.grids + [b'\x01\x01' + bytes(79)]
+        corpus.write_corpus(self.path, grids, packed=True)
+        solutions = os.path.join(self.directory.name, 'solutions.sdk')
+        for backend in solver.BACKENDS:
+            with importer.open_corpus(self.path) as puzzles:
+                self.assertEqual((len(self.grids), 1),
+                                 corpus.solve_corpus(puzzles, solutions, backend=backend))
+            with importer.open_corpus(solutions) as solved:
+                self.assertTrue(solved.packed)
+                for grid, solution in zip(self.grids, solved):
+                    self.assertEqual(solver.solve(grid), solution)
+                self.assertEqual(bytes(81), solved[-1])
+
+    def test_invalid_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'R1C1#1')
+        with self.assertRaises(ValueError):
+            importer.open_corpus(self.path)
+        corpus.write_corpus(self.path, self.grids)
+        with open(self.path, 'r+b') as f:
+            f.truncate(100)
+        with self.assertRaises(ValueError):
+            importer.open_corpus(self.path)
+        with self.assertRaises(ValueError):
+            corpus.CorpusWriter(self.path, box_size=4, packed=True)
+        with corpus.CorpusWriter(self.path) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(bytes(80))
+            with self.assertRaises(ValueError):
+                writer.write(bytes([10]) * 81)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import bz2
+import gzip
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from sudokusolver import importer
+from sudokusolver import rules
+
+LINE = '..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..'
+
+
+class ImporterTest(unittest.TestCase):
+    def test_imp_candidates(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+        self.assertEqual(('R1C1#8', 'R1C2#9', 'R1C4#1'), fixed_candidates[:3])
+
+    def test_imp_line(self):
+        fixed_candidates = importer.imp_line(LINE)
+        self.assertEqual(('R1C3#7', 'R1C4#1', 'R1C6#4'), fixed_candidates[:3])
+        self.assertEqual(fixed_candidates, importer.imp_line(LINE.replace('.', '0')))
+        self.assertEqual((), importer.imp_line('.' * 81))
+
+    def test_imp_invalid_line(self):
+        self.assertRaises(ValueError, importer.imp_line, LINE[:-1])
+        self.assertRaises(ValueError, importer.imp_line, 'a' + LINE[1:])
+        for control in ('\x05', '\x00', '\x09'):
+            self.assertRaises(ValueError, importer.imp_line, control + LINE[1:])
+
+    def test_imp_large_line(self):
+        fixed_candidates = importer.imp_line('G' + '.' * 254 + 'a')
+        self.assertEqual(('R1C1#16', 'R16C16#10'), fixed_candidates)
+        self.assertRaises(ValueError, importer.imp_line, 'H' + '.' * 255)
+        self.assertRaises(ValueError, importer.imp_line, '.' * 100)
+
+    def test_imp_lines(self):
+        lines = ['# comment\n', LINE + '\n', '\n', '.' * 81 + '\n']
+        puzzles = importer.imp_lines(lines)
+        self.assertEqual(importer.imp_line(LINE), next(puzzles))
+        self.assertEqual((), next(puzzles))
+        self.assertRaises(StopIteration, next, puzzles)
+        self.assertRaisesRegex(ValueError, 'Line 2', list, importer.imp_lines(['', 'abc']))
+
+
+class IterPuzzlesTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = bytes(int(number) for number in LINE.replace('.', '0'))
+        self.rows = [LINE[row * 9:row * 9 + 9] for row in range(9)]
+
+    def test_lines(self):
+        puzzles = importer.iter_puzzles(['# comment', '', LINE, '.' * 81])
+        self.assertEqual([self.grid, bytes(81)], list(puzzles))
+
+    def test_forms(self):
+        self.assertEqual([list(self.grid)], list(importer.iter_puzzles([LINE], 'ints')))
+        self.assertEqual([rules.for_size(3).encode_grid(self.grid)],
+                         list(importer.iter_puzzles([LINE], 'ids')))
+        self.assertRaises(ValueError, importer.iter_puzzles, [LINE], 'strings')
+        self.assertRaises(ValueError, importer.iter_puzzles, [LINE], format='json')
+
+    def test_csv(self):
+        # two puzzles following each other with blank lines between the blocks
+        puzzles = list(importer.iter_puzzles('tests/resources/example1.csv'))
+        self.assertEqual(1, len(puzzles))
+        self.assertEqual(bytes([8, 9, 0, 1, 0, 6]), puzzles[0][:6])
+        rows = [', '.join(row.replace('.', '_')) for row in self.rows]
+        self.assertEqual([self.grid] * 2, list(importer.iter_puzzles(rows + [''] + rows)))
+        large = ['16,' + ','.join('_' * 15)] + [','.join('_' * 16)] * 15
+        self.assertEqual([bytes([16]) + bytes(255)], list(importer.iter_puzzles(large)))
+
+    def test_grids(self):
+        lines = ['Grid 01'] + self.rows + ['Grid 02'] + self.rows
+        self.assertEqual([self.grid] * 2, list(importer.iter_puzzles(lines)))
+        self.assertEqual([self.grid], list(importer.iter_puzzles(self.rows, format='grid')))
+
+    def test_invalid_puzzles(self):
+        with self.assertRaisesRegex(ValueError, 'Line 2'):
+            list(importer.iter_puzzles([LINE, 'a' + LINE[1:]]))
+        with self.assertRaisesRegex(ValueError, 'Incomplete'):
+            list(importer.iter_puzzles(self.rows[:-1]))
+        with self.assertRaisesRegex(ValueError, 'Line 3'):
+            list(importer.iter_puzzles(self.rows[:2] + [self.rows[2][:-1]]))
+        with self.assertRaisesRegex(ValueError, 'Line 1'):
+            list(importer.iter_puzzles(['1,2,10,' + ','.join('_' * 6)]))
+
+    def test_compressed_files(self):
+        content = '\n'.join([LINE] * 3).encode()
+        opened = []
+
+        def recording_open(*args):
+            opened.append(io.open(*args))
+            return opened[-1]
+        with tempfile.TemporaryDirectory() as directory:
+            for name, compress in (('puzzles.txt', bytes), ('puzzles.gz', gzip.compress),
+                                   ('puzzles.bz2', bz2.compress)):
+                path = os.path.join(directory, name)
+                with open(path, 'wb') as f:
+                    f.write(compress(content))
+                self.assertEqual([self.grid] * 3, list(importer.iter_puzzles(path)))
+                # closing the puzzles early closes the file too
+                with mock.patch('builtins.open', recording_open):
+                    puzzles = importer.iter_puzzles(path)
+                    next(puzzles)
+                    puzzles.close()
+                self.assertTrue(opened.pop().closed)
+
+    def test_stdin(self):
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(LINE.encode()))))
+        with mock.patch.object(sys, 'stdin', stdin):
+            self.assertEqual([self.grid], list(importer.iter_puzzles()))
+        self.assertFalse(stdin.buffer.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from sudokusolver import corpus, importer, visualizer
+from sudokusolver.__main__ import main, UNSOLVABLE_MARKER
+
+PUZZLE = '..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..'
+SOLUTION = '827154396965327148341689752593468271472513689618972435786235914154796823239841567'
+
+
+class BatchCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'puzzles.txt')
+        self.output = os.path.join(self.directory.name, 'solutions.txt')
+        with open(self.input, 'w') as f:
+            f.write('\n'.join([PUZZLE, '11' + '.' * 79, 'invalid', SOLUTION]))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_batch_to_file(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            main(['sudokusolver', 'batch', self.input, '-o', self.output])
+        with open(self.output) as f:
+            self.assertEqual([SOLUTION, UNSOLVABLE_MARKER, UNSOLVABLE_MARKER, SOLUTION],
+                             f.read().splitlines())
+        self.assertIn('Solved 2 of 4 puzzles', stderr.getvalue())
+
+    def test_batch_corpus(self):
+        puzzles = os.path.join(self.directory.name, 'puzzles.sdk')
+        grid = bytes(int(number) for number in PUZZLE.replace('.', '0'))
+        corpus.write_corpus(puzzles, [grid, b'\x01\x01' + bytes(79)])
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            main(['sudokusolver', 'batch', puzzles, '-o', self.output])
+        with importer.open_corpus(self.output) as solutions:
+            self.assertEqual([SOLUTION, '0' * 81],
+                             [''.join(map(str, solution)) for solution in solutions])
+        self.assertIn('Solved 1 of 2 puzzles', stderr.getvalue())
+
+    def test_batch_to_stdout(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            main(['sudokusolver', 'batch', self.input, '--backend', 'dlx', '--marker', '-'])
+        self.assertEqual([SOLUTION, '-', '-', SOLUTION], stdout.getvalue().splitlines())
+
+    def test_batch_with_jobs(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            main(['sudokusolver', 'batch', self.input, '--jobs', '2'])
+        self.assertEqual([SOLUTION, UNSOLVABLE_MARKER, UNSOLVABLE_MARKER, SOLUTION],
+                         stdout.getvalue().splitlines())
+
+    def test_batch_larger_puzzles(self):
+        # only standard sudokus are solved, other lines get the marker
+        with open(self.input, 'w') as f:
+            f.write('\n'.join(['1' + '.' * 255, 'G' + '.' * 255, PUZZLE]))
+        for backend in ('dlx', 'bitmask'):
+            stdout = io.StringIO()
+            with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+                main(['sudokusolver', 'batch', self.input, '--backend', backend])
+            self.assertEqual([UNSOLVABLE_MARKER, UNSOLVABLE_MARKER, SOLUTION],
+                             stdout.getvalue().splitlines())
+
+    def test_batch_invalid_number(self):
+        with open(self.input, 'w') as f:
+            f.write('\n'.join(['G' + PUZZLE[1:], PUZZLE]))
+        for backend in ('dlx', 'bitmask'):
+            stdout = io.StringIO()
+            with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+                main(['sudokusolver', 'batch', self.input, '--backend', backend])
+            self.assertEqual([UNSOLVABLE_MARKER, SOLUTION], stdout.getvalue().splitlines())
+
+    def test_batch_missing_file(self):
+        missing = os.path.join(self.directory.name, 'missing.txt')
+        for args in ([missing], [self.input, '-o', os.path.join(missing, 'solutions.txt')]):
+            stderr = io.StringIO()
+            with redirect_stderr(stderr), self.assertRaises(SystemExit) as context:
+                main(['sudokusolver', 'batch'] + args)
+            self.assertEqual(2, context.exception.code)
+            self.assertIn("can't open", stderr.getvalue())
+
+    def test_stats(self):
+        stderr = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+            main(['sudokusolver', 'tests/resources/example2.csv', '--stats'])
+        self.assertIn('backtracks', stderr.getvalue())
+
+    def test_to_line(self):
+        self.assertEqual(PUZZLE, visualizer.to_line(importer.imp_line(PUZZLE)))
+        self.assertEqual('0' * 81, visualizer.to_line([], empty='0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # encoding: utf-8
+import random
 import unittest
 
 from sudokusolver.model.constraintmatrix import ConstraintMatrix
@@ -57,6 +58,97 @@ class ConstraintMatrixTest(unittest.TestCase):
         count_candidates, count_constraints = self.__calc_size(matrix)
         self.__check_size(count_candidates, count_constraints)
 
+    def test_from_incidence(self):
+        self.m = ConstraintMatrix.from_incidence([('r1', ['c1', 'c2']), ('r2', ['c2'])])
+        self.__check_integrity()
+
+    def test_from_incidence_equals_add(self):
+        expected = self.__create_matrix()
+        matrix = ConstraintMatrix.from_incidence(
+            (candidate, get_all_satisfied_constraints(candidate))
+            for candidate in get_all_candidates())
+        self.assertEqual(self.__get_columns(expected), self.__get_columns(matrix))
+
+    def test_from_incidence_with_constraints(self):
+        matrix = ConstraintMatrix.from_incidence([('r1', ['c2'])], ['c3', 'c2'])
+        self.assertEqual([('c3', 0, []), ('c2', 1, ['r1'])], self.__get_columns(matrix))
+        self.assertEqual('c3', matrix.choose_constraint().covered_constraint)
+
+    def test_column_sizes_after_cover_and_uncover(self):
+        matrix = self.__create_matrix()
+        matrix.cover(matrix.head_ref_node.bottom)
+        for column_ref_node in RowIterator(matrix.head_ref_node.right):
+            self.assertEqual(len(list(column_ref_node)), column_ref_node.size)
+        matrix.uncover()
+        for column_ref_node in RowIterator(matrix.head_ref_node.right):
+            self.assertEqual(9, column_ref_node.size)
+
+    def test_choose_constraint_and_iter_candidates(self):
+        self.m.add('r1', ['c1', 'c2'])
+        self.m.add('r2', ['c2'])
+        constraint = self.m.choose_constraint()
+        self.assertEqual('c1', constraint.covered_constraint)
+        candidates = self.m.iter_candidates(self.m.head_ref_node.right.right)
+        candidate = next(candidates)
+        self.assertEqual('r1', candidate.candidate)
+        self.m.cover(candidate)
+        self.assertIsNone(self.m.choose_constraint())
+        self.m.uncover()
+        self.assertEqual(['r2'], [c.candidate for c in candidates])
+
+    def test_choose_constraint_of_fewest_candidates(self):
+        matrix = ConstraintMatrix.from_incidence(
+            (candidate, get_all_satisfied_constraints(candidate))
+            for candidate in get_all_candidates())
+        first = matrix.head_ref_node.right
+        generator = random.Random(0)
+        for _ in range(3):
+            while not matrix.has_satisfied_all_constraints():
+                # the first of the columns with the fewest candidates, like a linear scan
+                expected = min(matrix.iter_constraints(), key=matrix.size_of)
+                self.assertIs(expected, matrix.choose_constraint())
+                if matrix.size_of(expected) == 0:
+                    break
+                candidates = list(matrix.iter_candidates(expected))
+                if len(candidates) > 1 and generator.random() < 0.3:
+                    matrix.eliminate(generator.choice(candidates))
+                else:
+                    matrix.cover(generator.choice(candidates))
+            matrix.reset()
+            self.assertIs(first, matrix.choose_constraint())
+
+    def test_choose_constraint_after_uncover(self):
+        self.m = ConstraintMatrix.from_incidence([('r1', ['c1']), ('r2', ['c1']), ('r3', ['c2'])])
+        c1, c2 = list(self.m.iter_constraints())
+        self.m.eliminate(self.m.get_candidate('r2'))
+        self.m.eliminate(self.m.get_candidate('r3'))
+        self.assertIs(c2, self.m.choose_constraint())
+        # the columns grow beyond their sizes at the first choice
+        self.m.uncover()
+        self.m.uncover()
+        self.assertEqual((2, 1), (self.m.size_of(c1), self.m.size_of(c2)))
+        self.assertIs(c2, self.m.choose_constraint())
+        self.m.eliminate(self.m.get_candidate('r1'))
+        self.m.eliminate(self.m.get_candidate('r2'))
+        self.assertIs(c1, self.m.choose_constraint())
+
+    def test_eliminate_and_uncover(self):
+        self.m = ConstraintMatrix.from_incidence(
+            [('r1', ['c1', 'c2']), ('r2', ['c2']), ('r3', ['c1'])])
+        c1, c2 = list(self.m.iter_constraints())
+        r1 = self.m.get_candidate('r1')
+        self.assertEqual([c1, c2], self.m.get_constraints(r1))
+        self.m.eliminate(r1)
+        self.assertFalse(self.m.is_available(r1))
+        self.assertEqual((1, 1), (self.m.size_of(c1), self.m.size_of(c2)))
+        self.assertFalse(self.m.is_satisfied(c1))
+        self.m.cover(self.m.get_candidate('r3'))
+        self.assertTrue(self.m.is_satisfied(c1))
+        self.m.reset()
+        self.assertTrue(self.m.is_available(r1))
+        self.assertEqual((2, 2), (self.m.size_of(c1), self.m.size_of(c2)))
+        self.assertEqual(['r1', 'r3'], [row.candidate for row in self.m.iter_candidates(c1)])
+
     def test_matrix_full_size(self):
         matrix = self.__create_matrix()
         count_candidates, count_constraints = self.__calc_size(matrix)
@@ -69,6 +161,12 @@ class ConstraintMatrixTest(unittest.TestCase):
             matrix.add(candidate, satisfied_constraints)
         return matrix
 
+    @staticmethod
+    def __get_columns(matrix):
+        return [(column_ref_node.covered_constraint, column_ref_node.size,
+                 [node.candidate for node in column_ref_node])
+                for column_ref_node in RowIterator(matrix.head_ref_node.right)]
+
     def __check_integrity(self):
         # row checks
         nodes = [(node.candidate, node.covered_constraint)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import unittest
+
+from sudokusolver import importer
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+from sudokusolver.propagation import Propagator, TECHNIQUES
+from sudokusolver.rules import get_all_satisfied_constraints
+
+MATRIX_TYPES = (ConstraintMatrix, ArrayConstraintMatrix)
+
+
+class PropagatorTest(unittest.TestCase):
+    def test_singles(self):
+        for matrix_type in MATRIX_TYPES:
+            # r2 is the only candidate of c2, r1 contradicts it
+            matrix = matrix_type.from_incidence(
+                [('r1', ['c1', 'c2']), ('r2', ['c2', 'c3']), ('r3', ['c1'])])
+            matrix.eliminate(matrix.get_candidate('r1'))
+            propagator = Propagator(('singles', ))
+            solution = []
+            self.assertEqual((2, True), propagator.propagate(matrix, solution))
+            self.assertCountEqual(['r2', 'r3'], solution)
+            self.assertTrue(matrix.has_satisfied_all_constraints())
+            self.assertEqual(2, propagator.hits['singles'])
+
+    def test_locked(self):
+        for matrix_type in MATRIX_TYPES:
+            # all candidates of c1 satisfy c2, hence r3 is eliminated
+            matrix = matrix_type.from_incidence(
+                [('r1', ['c1', 'c2']), ('r2', ['c1', 'c2']), ('r3', ['c2', 'c3']),
+                 ('r4', ['c3'])])
+            propagator = Propagator(('locked', ))
+            self.assertEqual((1, True), propagator.propagate(matrix, []))
+            self.assertFalse(matrix.is_available(matrix.get_candidate('r3')))
+            self.assertTrue(matrix.is_available(matrix.get_candidate('r4')))
+            self.assertEqual(1, propagator.hits['locked'])
+            matrix.uncover()
+            self.assertTrue(matrix.is_available(matrix.get_candidate('r3')))
+
+    def test_pairs(self):
+        for matrix_type in MATRIX_TYPES:
+            # either p1 and q1 or p2 and q2 satisfy x and y, hence r is eliminated
+            matrix = matrix_type.from_incidence(
+                [('p1', ['p', 'x']), ('p2', ['p', 'y']), ('q1', ['q', 'y']), ('q2', ['q', 'x']),
+                 ('r', ['x', 'z']), ('s', ['z'])])
+            propagator = Propagator(('pairs', ))
+            self.assertEqual((1, True), propagator.propagate(matrix, []))
+            self.assertFalse(matrix.is_available(matrix.get_candidate('r')))
+            self.assertEqual(1, propagator.hits['pairs'])
+
+    def test_contradiction(self):
+        for matrix_type in MATRIX_TYPES:
+            matrix = matrix_type.from_incidence([('r1', ['c1', 'c2']), ('r2', ['c2'])])
+            matrix.eliminate(matrix.get_candidate('r1'))
+            for technique in TECHNIQUES:
+                self.assertFalse(Propagator((technique, )).propagate(matrix, [])[1])
+
+    def test_default_techniques(self):
+        self.assertEqual(('singles', ), Propagator().techniques)
+        self.assertTrue(Propagator().at_each_node)
+
+    def test_unknown_technique(self):
+        self.assertRaises(ValueError, Propagator, ('singles', 'swordfish'))
+
+
+class PropagatingSolverTest(unittest.TestCase):
+    def test_solve_examples(self):
+        for example in ('example1', 'example3', 'example6', 'example-empty'):
+            fixed_candidates = importer.imp_candidates(
+                'tests/resources/{}.csv'.format(example))
+            for matrix_type in MATRIX_TYPES:
+                for at_each_node in (True, False):
+                    propagator = Propagator(at_each_node=at_each_node)
+                    solution = solver.solve(fixed_candidates, matrix_type=matrix_type,
+                                            propagation=propagator)
+                    constraints = set(get_all_satisfied_constraints(
+                        *(fixed_candidates + tuple(solution))))
+                    self.assertEqual(324, len(constraints))
+                    self.assertEqual(81, len(fixed_candidates) + len(solution))
+
+    def test_solve_by_singles_only(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+        propagator = Propagator(('singles', ))
+        solution = solver.solve(fixed_candidates, propagation=propagator)
+        self.assertEqual(81 - len(fixed_candidates), propagator.hits['singles'])
+        self.assertCountEqual(solver.solve(fixed_candidates), solution)
+
+    def test_count_solutions(self):
+        # removes a rectangle of cells whose numbers can be swapped
+        fixed_candidates = [c for c in importer.imp_candidates(
+            'tests/resources/example-complete.csv') if c[:4] not in ('R1C4', 'R1C7', 'R2C4', 'R2C7')]
+        solutions = list(solver.solve_iter(fixed_candidates, propagation=True))
+        self.assertCountEqual(list(map(sorted, solver.solve_iter(fixed_candidates))),
+                              list(map(sorted, solutions)))
+        self.assertFalse(solver.is_unique(fixed_candidates, propagation=True))
+        self.assertEqual(0, solver.count_solutions(('R1C1#1', 'R1C2#1'), propagation=True))
+        self.assertEqual(3, solver.count_solutions((), limit=3, propagation=True))
+
+    def test_template_is_restored(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example2.csv')
+        solver.solve(fixed_candidates, propagation=True)
+        template = solver.get_template()
+        self.assertEqual(729, len(list(template.head_ref_node.get_row_ref_node_iterator())))
+        self.assertEqual(324, len(list(template.iter_constraints())))
+
+    def test_bitmask_backend(self):
+        self.assertRaises(ValueError, solver.solve, (), backend='bitmask', propagation=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import pickle
+import unittest
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver import visualizer
+
+
+def create_grid(box_size):
+    size = box_size * box_size
+    return [[(box_size * (row % box_size) + row // box_size + column) % size + 1
+             for column in range(size)] for row in range(size)]
+
+
+class RulesTest(unittest.TestCase):
+    def test_standard_rules(self):
+        standard = rules.for_size(3)
+        self.assertEqual(rules.get_all_candidates(), standard.get_all_candidates())
+        self.assertEqual(list(rules.get_all_constraints()), standard.get_all_constraints())
+        self.assertEqual(['R9C8', 'R9#7', 'C8#7', 'B9#7'],
+                         rules.get_all_satisfied_constraints('R9C8#7'))
+
+    def test_sizes(self):
+        for box_size, candidates, constraints in ((4, 4096, 1024), (5, 15625, 2500)):
+            rule_description = rules.for_size(box_size)
+            self.assertEqual(candidates, len(set(rule_description.get_all_candidates())))
+            self.assertEqual(constraints, len(set(rule_description.get_all_constraints())))
+
+    def test_multi_digit_candidates(self):
+        rule_description = rules.for_size(4)
+        self.assertEqual(['R12C3', 'R12#16', 'C3#16', 'B9#16'],
+                         rule_description.get_all_satisfied_constraints('R12C3#16'))
+        self.assertEqual(['R1C12', 'R1#1', 'C12#1', 'B3#1'],
+                         rule_description.get_all_satisfied_constraints('R1C12#1'))
+
+    def test_integer_rules(self):
+        ids = rules.for_size(3).ids
+        self.assertEqual(729, len(ids.get_all_candidates()))
+        self.assertEqual(324, len(ids.get_all_constraints()))
+        # R9C8#7
+        self.assertEqual([79, 81 + 78, 162 + 69, 243 + 78],
+                         ids.get_all_satisfied_constraints(81 * 8 + 9 * 7 + 6))
+
+    def test_satisfying_candidates(self):
+        self.assertEqual(['R1C1#{}'.format(number) for number in range(1, 10)],
+                         rules.get_satisfying_candidates('R1C1'))
+        self.assertEqual(['R9C7#5', 'R9C8#5', 'R9C9#5'],
+                         rules.get_satisfying_candidates('B9#5')[-3:])
+        self.assertRaises(ValueError, rules.get_satisfying_candidates, 'B10#1')
+        ids = rules.for_size(5).ids
+        for constraint in (0, 1000, 2499):
+            candidates = ids.get_satisfying_candidates(constraint)
+            self.assertEqual(25, len(candidates))
+            for candidate in candidates:
+                self.assertIn(constraint, ids.get_all_satisfied_constraints(candidate))
+        self.assertRaises(ValueError, ids.get_satisfying_candidates, 2500)
+        self.assertRaises(ValueError, ids.get_all_satisfied_constraints, -1)
+
+    def test_codec(self):
+        for box_size in (3, 4):
+            rule_description = rules.for_size(box_size)
+            candidates = rule_description.get_all_candidates()
+            self.assertEqual(list(rule_description.ids.get_all_candidates()),
+                             [rule_description.encode(candidate) for candidate in candidates])
+            self.assertEqual(candidates, [rule_description.decode(candidate)
+                                          for candidate in range(len(candidates))])
+        standard = rules.for_size(3)
+        self.assertEqual(728, standard.encode('R9C9#9'))
+        self.assertEqual(['R1C1', 'R1#1', 'C1#1', 'B1#1'],
+                         list(map(standard.decode_constraint, (0, 81, 162, 243))))
+        for candidate in ('R0C1#1', 'R1C1#10', 'C1R1#1', 'R1C1', 1):
+            self.assertRaises(ValueError, standard.encode, candidate)
+
+    def test_grid_codec(self):
+        standard = rules.for_size(3)
+        cells = bytes([9] + [0] * 79 + [1])
+        self.assertEqual([8, 720], standard.encode_grid(cells))
+        self.assertEqual(cells, standard.decode_grid([8, 720]))
+        self.assertRaises(ValueError, standard.encode_grid, bytes(80))
+        self.assertRaises(ValueError, standard.encode_grid, bytes([10] * 81))
+
+    def test_shared_instance(self):
+        self.assertIs(rules.for_size(4), rules.for_size(4))
+        self.assertIs(rules.for_size(4), pickle.loads(pickle.dumps(rules.for_size(4))))
+
+    def test_solve_16x16(self):
+        grid = create_grid(4)
+        line = ''.join(importer.SYMBOLS[number - 1] for row in grid for number in row)
+        # empties the cells of the diagonal
+        puzzle = ''.join('.' if cell % 17 == 0 else symbol for cell, symbol in enumerate(line))
+        fixed_candidates = importer.imp_line(puzzle)
+        self.assertEqual(240, len(fixed_candidates))
+        solution = solver.solve(fixed_candidates, rules.for_size(4))
+        self.assertEqual(line, visualizer.to_line(fixed_candidates + solution))
+        self.assertEqual(puzzle, visualizer.to_line(fixed_candidates, box_size=4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import http.client
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from sudokusolver import server
+from sudokusolver import solver
+from sudokusolver.server import SolverServer
+
+PUZZLE = '..71.439.9.5327148341689.52593.682.1.72.13..961.972.35.8623.914154.96823.398415..'
+SOLUTION = '827154396965327148341689752593468271472513689618972435786235914154796823239841567'
+UNSOLVABLE = '11' + '.' * 79
+
+
+class SolverServerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = SolverServer(('127.0.0.1', 0), workers=1, max_queue=4)
+        self.server.start()
+        self.url = 'http://{}:{}'.format(*self.server.server_address[:2])
+
+    def tearDown(self):
+        self.server.server_close()
+
+    def request(self, path, body=None, content_type='application/json'):
+        data = None
+        if body is not None:
+            data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        request = urllib.request.Request(self.url + path, data,
+                                         {'Content-Type': content_type} if data else {})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode()
+
+    def test_solve_json(self):
+        status, body = self.request('/solve', {'puzzle': PUZZLE})
+        self.assertEqual(200, status)
+        self.assertEqual({'solution': SOLUTION}, json.loads(body))
+        numbers = [int(number) for number in PUZZLE.replace('.', '0')]
+        rows = [numbers[row * 9:row * 9 + 9] for row in range(9)]
+        status, body = self.request('/solve', {'puzzles': [numbers, rows, UNSOLVABLE]})
+        self.assertEqual({'solutions': [SOLUTION, SOLUTION, None]}, json.loads(body))
+
+    def test_solve_lines(self):
+        status, body = self.request('/solve', '\n'.join([PUZZLE, UNSOLVABLE]), 'text/plain')
+        self.assertEqual(200, status)
+        self.assertEqual({'solutions': [SOLUTION, None]}, json.loads(body))
+
+    def test_invalid_requests(self):
+        for body in ({'puzzle': PUZZLE[:80]}, {'puzzle': [10] * 81}, {'puzzle': [True] * 81},
+                     {'puzzles': PUZZLE}, {'puzzle': PUZZLE, 'puzzles': []}, '{"puzzle": '):
+            status, body = self.request('/solve', body)
+            self.assertEqual(400, status)
+            self.assertIn('error', json.loads(body))
+        self.assertEqual(404, self.request('/unknown')[0])
+        self.assertEqual(404, self.request('/unknown', {'puzzle': PUZZLE})[0])
+
+    def test_invalid_content_length(self):
+        # the body isn't sent since the server answers by the headers
+        for length, status in (('-1', 400), ('ten', 400), (None, 400),
+                               (str(server.MAX_BODY_SIZE + 1), 413)):
+            connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+            connection.putrequest('POST', '/solve')
+            connection.putheader('Content-Type', 'application/json')
+            if length is not None:
+                connection.putheader('Content-Length', length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(status, response.status)
+            self.assertIn('error', json.loads(response.read()))
+            connection.close()
+
+    def test_failing_worker(self):
+        self.server.server_close()
+        with mock.patch.object(solver, '_solve_puzzles', side_effect=RuntimeError('failed')):
+            self.setUp()
+        with mock.patch.object(server._RequestHandler, 'log_error') as log_error:
+            status, body = self.request('/solve', {'puzzle': PUZZLE})
+        self.assertEqual(500, status)
+        self.assertIn('error', json.loads(body))
+        self.assertTrue(log_error.called)
+
+    def test_backpressure(self):
+        # more puzzles than the queue can take
+        status, body = self.request('/solve', {'puzzles': [PUZZLE] * 5})
+        self.assertEqual(429, status)
+        self.assertRaises(server.Overloaded, self.server.solve, [b'\0' * 81] * 5)
+        self.assertEqual(200, self.request('/solve', {'puzzles': [PUZZLE] * 4})[0])
+
+    def test_metrics(self):
+        self.request('/solve', {'puzzles': [PUZZLE] * 3})
+        self.request('/solve', {'puzzles': [PUZZLE] * 5})
+        status, body = self.request('/metrics')
+        self.assertEqual(200, status)
+        metrics = dict(line.rsplit(' ', 1) for line in body.splitlines()
+                       if not line.startswith('#'))
+        self.assertEqual('1', metrics['sudokusolver_requests_total'])
+        self.assertEqual('1', metrics['sudokusolver_rejected_total'])
+        self.assertEqual('3', metrics['sudokusolver_puzzles_total'])
+        self.assertEqual('0', metrics['sudokusolver_queue_depth'])
+        self.assertGreater(float(metrics['sudokusolver_puzzles_per_second']), 0)
+        self.assertEqual('1', metrics['sudokusolver_request_latency_seconds_count'])
+        self.assertEqual('1', metrics['sudokusolver_request_latency_seconds_bucket{le="+Inf"}'])
+        self.assertEqual('1', metrics['sudokusolver_batch_size_bucket{le="4"}'])
+        self.assertEqual('0', metrics['sudokusolver_batch_size_bucket{le="2"}'])
+
+    def test_worker_processes(self):
+        with SolverServer(('127.0.0.1', 0), workers=2, backend='dlx') as process_server:
+            grids, _ = server.parse_puzzles('\n'.join([PUZZLE, UNSOLVABLE]).encode())
+            solutions = process_server.solve(grids)
+            self.assertEqual(SOLUTION, server._to_digits(solutions[0]))
+            self.assertEqual(b'', solutions[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
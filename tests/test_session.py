@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import unittest
+from types import SimpleNamespace
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.model.constraintmatrix import ConstraintMatrix
+from sudokusolver.session import SolverSession
+
+
+class SolverSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+
+    def test_solve(self):
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            session = SolverSession(self.fixed_candidates, matrix_type=matrix_type)
+            expected = solver.solve(self.fixed_candidates, matrix_type=matrix_type)
+            self.assertCountEqual(expected, session.solve())
+            self.assertTrue(session.is_unique())
+            # the search leaves the matrix as it was
+            self.assertCountEqual(expected, session.solve())
+            self.assertEqual(1, session.count_solutions())
+
+    def test_place_and_remove(self):
+        for matrix_type in (ConstraintMatrix, ArrayConstraintMatrix):
+            session = SolverSession(self.fixed_candidates, matrix_type=matrix_type)
+            solution = session.solve()
+            first = self.fixed_candidates[0]
+            session.remove(first)
+            self.assertNotIn(first, session.placed)
+            self.assertEqual(solver.count_solutions(self.fixed_candidates[1:], limit=2),
+                             session.count_solutions(2))
+            session.place(first)
+            self.assertCountEqual(self.fixed_candidates, session.placed)
+            self.assertCountEqual(solution, session.solve())
+            session.place(solution[0])
+            self.assertCountEqual(solution[1:], session.solve())
+
+    def test_invalid_candidates(self):
+        session = SolverSession(self.fixed_candidates)
+        with self.assertRaises(ValueError):
+            session.place('R1C1#0')
+        with self.assertRaises(ValueError):
+            session.place('R1C2#1')  # R1C1#8 is placed already
+        with self.assertRaises(ValueError):
+            session.remove('R1C3#1')
+        self.assertCountEqual(self.fixed_candidates, session.placed)
+        with self.assertRaises(ValueError):
+            SolverSession(['R1C1#1', 'R1C2#1'])
+
+    def test_get_candidates(self):
+        session = SolverSession(self.fixed_candidates)
+        self.assertEqual(('R1C1#8', ), session.get_candidates('R1C1'))
+        candidates = session.get_candidates('R1C3')
+        self.assertTrue(candidates)
+        self.assertNotIn('R1C3#8', candidates)
+        with self.assertRaises(ValueError):
+            session.get_candidates('R0C0')
+
+    def test_ids(self):
+        codec = rules.for_size(3)
+        fixed_candidates = [codec.encode(candidate) for candidate in self.fixed_candidates]
+        session = SolverSession(fixed_candidates)
+        self.assertEqual(tuple(self.fixed_candidates), session.placed)
+        self.assertCountEqual(solver.solve(self.fixed_candidates), session.solve())
+        self.assertEqual(('R1C1#8', ), session.get_candidates(0))
+        session.remove(fixed_candidates[0])
+        self.assertNotIn('R1C1#8', session.placed)
+
+    def test_custom_rule_description(self):
+        # exact cover of {1, 2, 3} by A = {1, 2}, B = {3}, C = {2, 3} or D = {1}
+        sets = {'A': ['1', '2'], 'B': ['3'], 'C': ['2', '3'], 'D': ['1']}
+        rule_description = SimpleNamespace(
+            get_all_candidates=lambda: sorted(sets),
+            get_all_constraints=lambda: ['1', '2', '3'],
+            get_all_satisfied_constraints=lambda *candidates: [
+                constraint for candidate in candidates for constraint in sets[candidate]])
+        session = SolverSession(rule_description=rule_description)
+        self.assertEqual(2, session.count_solutions())
+        session.place('D')
+        self.assertEqual(('C', ), session.solve())
+        self.assertEqual(('C', ), session.get_candidates('2'))
+        self.assertEqual(('D', ), session.get_candidates('1'))
+        session.remove('D')
+        self.assertEqual(('A', 'D'), session.get_candidates('1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 import unittest
+from array import array
+from types import SimpleNamespace
 
 from sudokusolver import importer
+from sudokusolver import rules
 from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.stats import SolveStats
 
 
 class SudokuSolverTest(unittest.TestCase):
@@ -55,6 +60,175 @@ class SudokuSolverTest(unittest.TestCase):
         solution = solver.solve(fixed_candidates)
         self.assertTrue(solution)
 
+    def test_template_is_restored(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example1.csv')
+        solution = solver.solve(fixed_candidates)
+        template = solver.get_template()
+        self.assertTrue(template.candidates_exist())
+        self.assertEqual(324, len(list(template.head_ref_node.get_column_ref_node_iterator())))
+        self.assertEqual(729, len(list(template.head_ref_node.get_row_ref_node_iterator())))
+        self.assertEqual(solution, solver.solve(fixed_candidates))
+
+    def test_templates_are_limited(self):
+        def create_rules():
+            return SimpleNamespace(get_all_candidates=lambda: ['A', 'B'],
+                                   get_all_constraints=lambda: ['1'],
+                                   get_all_satisfied_constraints=lambda *candidates: ['1'])
+        first = create_rules()
+        template = solver.get_template(first)
+        self.assertIs(template, solver.get_template(first))
+        descriptions = [create_rules() for _ in range(solver.MAX_TEMPLATES)]
+        for rule_description in descriptions:
+            solver.get_template(rule_description)
+        # the least recently used template has been dropped
+        self.assertIsNot(template, solver.get_template(first))
+        self.assertIs(solver.get_template(descriptions[-1]),
+                      solver.get_template(descriptions[-1]))
+
+    def test_solve_encoded_puzzles(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+        solution = solver.solve(fixed_candidates)
+        codec = rules.for_size(3)
+        ids = [codec.encode(candidate) for candidate in fixed_candidates]
+        self.assertEqual(tuple(map(codec.encode, solution)), solver.solve(ids))
+        self.assertEqual(tuple(map(codec.encode, solution)), solver.solve(array('h', ids)))
+        grid = codec.decode_grid(ids + [codec.encode(candidate) for candidate in solution])
+        for backend in solver.BACKENDS:
+            self.assertEqual(grid, solver.solve(codec.decode_grid(ids), backend=backend))
+        self.assertEqual(b'', solver.solve(codec.decode_grid([0, 9])))
+        self.assertEqual([], solver.solve([0, 1]))
+        self.assertEqual(1, solver.count_solutions(codec.decode_grid(ids)))
+
+    def test_solve_invalid_candidates(self):
+        self.assertEqual([], solver.solve(('R1C1#10', )))
+        self.assertEqual([], solver.solve([729]))
+
+    def test_solve_contradicting_candidates(self):
+        self.assertFalse(solver.solve(('R1C1#1', 'R1C2#1')))
+
+    def test_solve_cell_without_candidates(self):
+        # R1C1 can hold none of the numbers
+        fixed_candidates = ['R1C{}#{}'.format(column, column - 1) for column in range(2, 10)]
+        fixed_candidates.append('R2C2#9')
+        for matrix_type in (None, ArrayConstraintMatrix):
+            self.assertFalse(solver.solve(fixed_candidates, matrix_type=matrix_type))
+            self.assertEqual(0, solver.count_solutions(fixed_candidates, matrix_type=matrix_type))
+
+    def test_solve_stats(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example2.csv')
+        for matrix_type in (None, ArrayConstraintMatrix):
+            stats = SolveStats()
+            solution = solver.solve(fixed_candidates, matrix_type=matrix_type, stats=stats)
+            self.assertEqual(solver.solve(fixed_candidates), solution)
+            self.assertTrue(stats.solved)
+            # the search tries each candidate of the solution and takes back the others
+            self.assertEqual(len(solution), stats.nodes - stats.backtracks)
+            self.assertEqual(stats.nodes, stats.covers)
+            self.assertEqual(stats.backtracks, stats.uncovers)
+            self.assertEqual(stats.max_depth, len(stats.column_sizes))
+            self.assertGreater(stats.total_time, stats.search_time)
+            # the matrix isn't counting any longer
+            self.assertNotIn('cover', vars(solver.get_template(None, matrix_type)))
+        stats = SolveStats()
+        self.assertFalse(solver.solve(('R1C1#1', 'R1C2#1'), stats=stats))
+        self.assertFalse(stats.solved)
+        self.assertRaises(ValueError, solver.solve, fixed_candidates,
+                          backend='bitmask', stats=SolveStats())
+
+    def test_solve_budget(self):
+        fixed_candidates = importer.imp_candidates('tests/resources/example1.csv')
+        for matrix_type in (None, ArrayConstraintMatrix):
+            with self.assertRaises(solver.BudgetExceeded) as context:
+                solver.solve((), matrix_type=matrix_type, max_nodes=10)
+            self.assertEqual(10, context.exception.nodes)
+            # the template is left consistent
+            self.assertEqual(solver.solve(fixed_candidates, matrix_type=matrix_type),
+                             solver.solve(fixed_candidates, matrix_type=matrix_type,
+                                          timeout=60, max_nodes=10 ** 6))
+            self.assertEqual(81, len(solver.solve((), matrix_type=matrix_type, max_nodes=81)))
+        # the clock is read after the first interval of nodes
+        with self.assertRaises(solver.BudgetExceeded):
+            solver.count_solutions((), timeout=0)
+        self.assertRaises(solver.BudgetExceeded, solver.is_unique, (), max_nodes=50)
+        self.assertRaises(ValueError, solver.solve, (), backend='bitmask', timeout=1)
+
+    def test_solve_custom_rule_description(self):
+        # exact cover problem: {1, 4, 7}, {1, 4}, {4, 5, 7}, {3, 5, 6}, {2, 3, 6, 7}, {2, 7}
+        subsets = {'A': ['1', '4', '7'], 'B': ['1', '4'], 'C': ['4', '5', '7'],
+                   'D': ['3', '5', '6'], 'E': ['2', '3', '6', '7'], 'F': ['2', '7']}
+        rule_description = SimpleNamespace(
+            get_all_candidates=lambda: sorted(subsets),
+            get_all_constraints=lambda: [str(i) for i in range(1, 8)],
+            get_all_satisfied_constraints=lambda *candidates: [
+                constraint for candidate in candidates for constraint in subsets[candidate]])
+        solution = solver.solve((), rule_description)
+        self.assertCountEqual(['B', 'D', 'F'], solution)
+        self.assertCountEqual(['D', 'F'], solver.solve(('B', ), rule_description))
+        self.assertFalse(solver.solve(('A', ), rule_description))
+
+    def test_count_solutions(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example1.csv')
+        self.assertEqual(1, solver.count_solutions(fixed_candidates))
+        self.assertTrue(solver.is_unique(fixed_candidates))
+        self.assertEqual(0, solver.count_solutions(('R1C1#1', 'R1C2#1')))
+        self.assertFalse(solver.is_unique(('R1C1#1', 'R1C2#1')))
+        self.assertEqual(5, solver.count_solutions((), limit=5))
+        self.assertFalse(solver.is_unique(()))
+
+    def test_count_solutions_of_complete_puzzle(self):
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example-complete.csv')
+        self.assertEqual(1, solver.count_solutions(fixed_candidates))
+        self.assertEqual([()], list(solver.solve_iter(fixed_candidates)))
+
+    def test_solve_iter(self):
+        # removes a rectangle of cells whose numbers can be swapped
+        fixed_candidates = [c for c in importer.imp_candidates(
+            'tests/resources/example-complete.csv') if c[:4] not in ('R1C4', 'R1C7', 'R2C4', 'R2C7')]
+        solutions = list(solver.solve_iter(fixed_candidates))
+        self.assertEqual(2, len(solutions))
+        self.assertCountEqual(['R1C4#1', 'R1C7#3', 'R2C4#3', 'R2C7#1'], solutions[0])
+        self.assertCountEqual(['R1C4#3', 'R1C7#1', 'R2C4#1', 'R2C7#3'], solutions[1])
+        self.assertEqual(2, solver.count_solutions(fixed_candidates))
+        self.assertFalse(solver.is_unique(fixed_candidates))
+
+    def test_solve_while_iterating(self):
+        solutions = solver.solve_iter(())
+        first = next(solutions)
+        # the paused iteration must not be affected by solving another puzzle
+        fixed_candidates = importer.imp_candidates(
+            'tests/resources/example1.csv')
+        self.assertTrue(solver.is_unique(fixed_candidates))
+        self.assertNotEqual(first, next(solutions))
+        solutions.close()
+        self.assertEqual(729, len(list(solver.get_template().head_ref_node.get_row_ref_node_iterator())))
+
+    def test_solve_deep_search(self):
+        # every candidate satisfies its own constraint,
+        # so that the search has to go deeper than the recursion limit
+        depth = 1500
+        rule_description = SimpleNamespace(
+            get_all_candidates=lambda: range(depth),
+            get_all_constraints=lambda: range(depth),
+            get_all_satisfied_constraints=lambda *candidates: list(candidates))
+        self.assertCountEqual(range(depth), solver.solve((), rule_description))
+
+    def test_solve_many(self):
+        puzzles = [importer.imp_candidates('tests/resources/example{}.csv'.format(i))
+                   for i in range(1, 7)]
+        expected = [solver.solve(fixed_candidates) for fixed_candidates in puzzles]
+        self.assertEqual(expected, list(solver.solve_many(puzzles, workers=1, chunksize=4)))
+        self.assertEqual(expected, list(solver.solve_many(iter(puzzles), workers=2, chunksize=2)))
+        unordered = solver.solve_many(puzzles, workers=2, chunksize=1, ordered=False)
+        self.assertEqual(expected, [solution for _, solution in sorted(unordered)])
+
+    def test_solve_many_invalid_puzzles(self):
+        solutions = solver.solve_many([None, ('R1C1#1', 'R1C2#1')], workers=1)
+        self.assertEqual([[], []], list(solutions))
+        self.assertRaises(ValueError, solver.solve_many, [], backend='unknown')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+import io
+import unittest
+from types import SimpleNamespace
+
+from sudokusolver import importer
+from sudokusolver import rules
+from sudokusolver import solver
+from sudokusolver.model.arraymatrix import ArrayConstraintMatrix
+from sudokusolver.tracing import FlameGraphHook, SearchHook
+
+
+class RecordingHook(SearchHook):
+    def __init__(self):
+        self.events = []
+
+    def on_choose_column(self, constraint, size, depth):
+        self.events.append(('choose', size, depth))
+
+    def on_node(self, candidate, depth):
+        self.events.append(('node', candidate, depth))
+
+    def on_cover(self, candidate):
+        self.events.append(('cover', candidate))
+
+    def on_uncover(self):
+        self.events.append(('uncover', ))
+
+    def on_backtrack(self, candidate, depth):
+        self.events.append(('backtrack', candidate, depth))
+
+    def on_solution(self, solution):
+        self.events.append(('solution', tuple(solution)))
+
+
+class TracingTest(unittest.TestCase):
+    def setUp(self):
+        # exact cover of {1, 2, 3} by A = {1}, B = {1, 2}, C = {3}, D = {2}
+        sets = {'A': ['1'], 'B': ['1', '2'], 'C': ['3'], 'D': ['2']}
+        self.rule_description = SimpleNamespace(
+            get_all_candidates=lambda: sorted(sets),
+            get_all_constraints=lambda: ['1', '2', '3'],
+            get_all_satisfied_constraints=lambda *candidates: [
+                constraint for candidate in candidates for constraint in sets[candidate]])
+
+    def test_events(self):
+        for matrix_type in (None, ArrayConstraintMatrix):
+            hook = RecordingHook()
+            solution = solver.solve([], self.rule_description, matrix_type, hooks=[hook])
+            self.assertEqual(solver.solve([], self.rule_description, matrix_type), solution)
+            # constraint 3 is chosen first having only candidate C,
+            # then constraint 1 whose first candidate A leaves D for constraint 2
+            self.assertEqual([
+                ('choose', 1, 0), ('node', 'C', 1), ('cover', 'C'),
+                ('choose', 2, 1), ('node', 'A', 2), ('cover', 'A'),
+                ('choose', 1, 2), ('node', 'D', 3), ('cover', 'D'),
+                ('solution', ('C', 'A', 'D'))], hook.events)
+            self.assertNotIn('cover', vars(solver.get_template(self.rule_description,
+                                                                matrix_type)))
+
+    def test_backtracking(self):
+        hook = RecordingHook()
+        fixed_candidates = importer.imp_candidates('tests/resources/example2.csv')
+        self.assertTrue(solver.solve(fixed_candidates, hooks=[hook]))
+        backtracks = [event for event in hook.events if event[0] == 'backtrack']
+        self.assertTrue(backtracks)
+        # each candidate taken back has been tried and covered before
+        self.assertEqual(len(backtracks), hook.events.count(('uncover', )))
+        for _, candidate, depth in backtracks:
+            self.assertIn(('node', candidate, depth), hook.events)
+
+    def test_flame_graph(self):
+        codec = rules.for_size(3)
+        hook = FlameGraphHook(label=codec.decode)
+        fixed_candidates = importer.imp_candidates('tests/resources/example2.csv')
+        solution = solver.solve(fixed_candidates, hooks=[hook])
+        output = io.StringIO()
+        hook.write(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(sum(hook.stacks.values()), len(lines))
+        # the stack of the solution consists of all its candidates
+        deepest = max(lines, key=len).rsplit(' ', 1)[0].split(';')
+        self.assertEqual('search', deepest[0])
+        self.assertCountEqual(solution, deepest[1:])
+
+    def test_bitmask(self):
+        self.assertRaises(ValueError, solver.solve, [], backend='bitmask',
+                          hooks=[SearchHook()])
+
+
+if __name__ == '__main__':
+    unittest.main()